@@ -0,0 +1,82 @@
+"""Filter-toggle latency with and without the in-memory mirror
+
+    python -m benchmarks.bench_memory_mirror [--sessions N] [--repeat N]
+
+Builds a synthetic database, then times the Sessions tab's page query
+(filters, running balance window and totals) for a sequence of filter
+toggles, reading from disk and from the mirror. Also times a small write
+commit, which the mirror replays instead of copying the database again.
+"""
+import argparse
+import itertools
+from datetime import datetime
+from sqlalchemy import func
+from src.config import Config
+from src.database.database import Database
+from src.database.models import Session
+from src.database.session_importer import SessionImporter
+from tests.synthetic import synthetic_sessions
+from .common import temp_app_dir, timed
+
+FILTERS = [
+    {},
+    {'stakes': '0.5 SC / 1 SC'},
+    {'game_format': 'PL Omaha'},
+    {'stakes': '0.1 SC / 0.2 SC', 'start': datetime(2020, 1, 1), 'end': datetime(2022, 1, 1)},
+]
+
+def page_query(session, filters):
+    """The Sessions tab's page query for one filter state"""
+    query = session.query(Session)
+    if 'stakes' in filters:
+        query = query.filter(Session.stakes == filters['stakes'])
+    if 'game_format' in filters:
+        query = query.filter(Session.game_format == filters['game_format'])
+    if 'start' in filters:
+        query = query.filter(Session.start_time >= filters['start'], Session.start_time <= filters['end'])
+    chronological = (Session.start_time, Session.id)
+    query = query.order_by(Session.start_time.desc()).add_columns(
+        func.sum(Session.result).over(order_by=chronological).label('running_balance'),
+        func.count().over().label('filtered_count'),
+        func.sum(Session.hands_played).over().label('filtered_hands'),
+        func.sum(Session.result).over().label('filtered_profit'),
+        func.sum(func.duration_hours(Session.duration)).over().label('filtered_hours')
+    )
+    return query.limit(100).all()
+
+def toggle_all(db):
+    for filters in FILTERS:
+        session = db.get_session()
+        try:
+            page_query(session, filters)
+        finally:
+            session.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--sessions', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    seeds = itertools.count(1)
+    with temp_app_dir():
+        SessionImporter().import_sessions(synthetic_sessions(args.sessions))
+        for mirrored in (False, True):
+            Config.set_setting('memory_mirror', mirrored)
+            Database.set_memory_mirror(mirrored)
+            db = Database()
+            toggle_all(db)  # Warm the page cache or build the mirror
+            seconds = timed(lambda: toggle_all(db), args.repeat)
+            write = timed(lambda: SessionImporter().import_sessions(
+                synthetic_sessions(10, seed=next(seeds), newest=datetime(2030, 1, 1))
+            ), 3)
+            label = "mirror" if mirrored else "disk"
+            line = f"{label:<7} {len(FILTERS)} filter toggles {seconds * 1000:8.1f} ms   10-row import {write * 1000:7.1f} ms"
+            if mirrored:
+                line += f"   full copy {timed(Database.mirror.refresh, 3) * 1000:7.1f} ms"
+            print(line)
+        Database.set_memory_mirror(False)
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
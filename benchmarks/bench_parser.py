@@ -0,0 +1,64 @@
+"""Throughput and peak memory of the streaming session parser
+
+    python -m benchmarks.bench_parser [--sessions N]
+
+Writes a synthetic page dump and parses it three ways: reading the whole
+file into one string and running the regex (the old parsers), streaming it
+through iter_sessions, and parse_large_file (parallel above
+PARALLEL_MIN_BYTES). Peak memory is measured with tracemalloc, which slows
+every run down equally; throughput is timed without it.
+"""
+import os
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime
+from src.scraping.session_parser import SESSION_RE, iter_sessions, decode_match
+from src.scraping.parallel_parser import parse_large_file
+from src.utils.time_utils import StartTimeDecoder
+from tests.synthetic import synthetic_sessions, dump_text
+from .common import timed
+
+REFERENCE = datetime(2025, 1, 1)
+
+def read_whole(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    decoder = StartTimeDecoder(REFERENCE)
+    return [decode_match(match, decoder) for match in SESSION_RE.finditer(text)]
+
+def stream(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in iter_sessions(f, reference=REFERENCE))
+
+def parallel(path):
+    return parse_large_file(path, reference=REFERENCE)
+
+def peak_mib(function, path):
+    tracemalloc.start()
+    try:
+        function(path)
+        return tracemalloc.get_traced_memory()[1] / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--sessions', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'dump.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(dump_text(synthetic_sessions(args.sessions, newest=REFERENCE)))
+        size = os.path.getsize(path) / 2 ** 20
+        print(f"Dump: {args.sessions} sessions, {size:.1f} MiB")
+        for name, function in (('read whole', read_whole), ('iter_sessions', stream), ('parse_large_file', parallel)):
+            seconds = timed(lambda: function(path), args.repeat)
+            print(f"{name:<17} {seconds:6.2f}s  {size / seconds:6.1f} MiB/s  "
+                  f"{args.sessions / seconds:>10,.0f} rows/s  peak {peak_mib(function, path):7.1f} MiB")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,45 @@
+"""Decoding extracted history rows: straight from cells against the text round trip
+
+    python -m benchmarks.bench_row_cells [--rows N]
+
+The history loaders get each table row as a list of cells. This times
+decoding them with decode_cells against joining them into page text and
+running session_re over it, as the loaders used to, checking both agree.
+"""
+import argparse
+from datetime import datetime
+from src.scraping.site_adapters import get_adapter
+from tests.synthetic import synthetic_sessions, dump_text
+from .common import timed
+
+REFERENCE = datetime(2025, 1, 1)
+
+def from_cells(adapter, rows):
+    return list(adapter.decode_cells(rows, adapter.decoder(REFERENCE)))
+
+def through_text(adapter, rows):
+    decoder = adapter.decoder(REFERENCE)
+    text = adapter.rows_to_text(rows)
+    return [adapter.decode_match(match, decoder) for match in adapter.session_re.finditer(text)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--rows', type=int, default=500000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    adapter = get_adapter()
+    sessions = synthetic_sessions(args.rows, newest=REFERENCE)
+    lines = dump_text(sessions).splitlines()
+    rows = [lines[i:i + 6] for i in range(0, len(lines), 6)]
+    assert from_cells(adapter, rows) == sessions == through_text(adapter, rows)
+
+    cells = timed(lambda: from_cells(adapter, rows), args.repeat)
+    text = timed(lambda: through_text(adapter, rows), args.repeat)
+    for name, seconds in (('decode_cells', cells), ('text + session_re', text)):
+        print(f"{name:<18} {seconds:6.2f}s  {args.rows / seconds:>12,.0f} rows/s")
+    print(f"speedup {text / cells:.1f}x")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
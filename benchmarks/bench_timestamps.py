@@ -0,0 +1,47 @@
+"""Start time decoding: StartTimeDecoder against datetime.strptime
+
+    python -m benchmarks.bench_timestamps [--rows N]
+
+Decodes the start times of a synthetic newest-first history with the
+decoder the parsers use, and with strptime on the same text plus the year
+(which strptime cannot infer), checking both agree.
+"""
+import argparse
+from datetime import datetime
+from src.utils.time_utils import StartTimeDecoder
+from tests.synthetic import synthetic_sessions
+from .common import timed
+
+REFERENCE = datetime(2025, 1, 1)
+
+def start_text(start):
+    hour = start.hour % 12 or 12
+    return f"{start:%b} {start.day}, {hour}:{start.minute:02d} {'PM' if start.hour >= 12 else 'AM'}"
+
+def with_decoder(texts):
+    decoder = StartTimeDecoder(REFERENCE)
+    return [decoder.decode(text) for text in texts]
+
+def with_strptime(texts, years):
+    return [datetime.strptime(f"{text} {year:04d}", '%b %d, %I:%M %p %Y') for text, year in zip(texts, years)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    starts = [session.start_time for session in synthetic_sessions(args.rows, newest=REFERENCE)]
+    texts = [start_text(start) for start in starts]
+    years = [start.year for start in starts]
+    assert with_decoder(texts) == starts == with_strptime(texts, years)
+
+    decoder = timed(lambda: with_decoder(texts), args.repeat)
+    strptime = timed(lambda: with_strptime(texts, years), args.repeat)
+    for name, seconds in (('StartTimeDecoder', decoder), ('strptime', strptime)):
+        print(f"{name:<17} {seconds:6.2f}s  {args.rows / seconds:>12,.0f} rows/s")
+    print(f"speedup {strptime / decoder:.1f}x")
+    return 0
+
+if __name__ == '__main__':
+    raise SystemExit(main())
@@ -0,0 +1,35 @@
+"""Helpers shared by the benchmark scripts"""
+import os
+import time
+import tempfile
+import contextlib
+from src.config import Config
+
+@contextlib.contextmanager
+def temp_app_dir(**settings):
+    """Point Config (database, logs, archive, settings) at a scratch directory"""
+    saved = {name: getattr(Config, name) for name in
+             ('APP_DIR', 'LOG_DIR', 'IMPORT_DIR', 'BACKUP_DIR', 'CONFIG_FILE', '_settings')}
+    with tempfile.TemporaryDirectory() as app_dir:
+        Config.APP_DIR = app_dir
+        Config.LOG_DIR = os.path.join(app_dir, 'logs')
+        Config.IMPORT_DIR = os.path.join(app_dir, 'DB_Import_Files')
+        Config.BACKUP_DIR = os.path.join(app_dir, 'backups')
+        Config.CONFIG_FILE = os.path.join(app_dir, 'config.json')
+        Config._settings = dict(settings)
+        Config.ensure_directories()
+        try:
+            yield app_dir
+        finally:
+            for name, value in saved.items():
+                setattr(Config, name, value)
+
+def timed(function, repeat):
+    """Median seconds of `repeat` calls"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+    times.sort()
+    return times[len(times) // 2]
@@ -1,17 +1,22 @@
 #!/usr/bin/env python3
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 from src.gui.main_window import MainWindow
+from src.utils.logging_setup import setup_logging
 
 os.environ['NSSupportsAutomaticGraphicsSwitching'] = 'True'
 
 def main():
+    setup_logging()
     app = MainWindow()
     app.mainloop()
 
 if __name__ == "__main__":
+    # Needed for the import process pool in frozen builds
+    multiprocessing.freeze_support()
     try:
         main()
     except KeyboardInterrupt:
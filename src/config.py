@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 import json
 import platform
+import threading
 from tkinter import messagebox, Tk, simpledialog
 import time
 
@@ -13,6 +14,68 @@ class Config:
     BACKUP_DIR = os.path.join(APP_DIR, 'backups')
     CONFIG_FILE = os.path.join(APP_DIR, 'config.json')
     
+    # How often the GUI checks the database for external changes
+    CHANGE_POLL_INTERVAL_MS = 1000
+    
+    # Background database maintenance: run once idle and enough rows changed
+    MAINTENANCE_CHECK_INTERVAL_S = 60
+    MAINTENANCE_IDLE_S = 30
+    MAINTENANCE_MIN_CHANGES = 100
+    MAINTENANCE_CHANGE_RATIO = 0.1
+    MAINTENANCE_MAX_AGE_S = 7 * 24 * 3600
+    
+    # Automatic history loading: wait this long for the page to change after
+    # asking for more rows, and stop after this many rounds without new rows
+    HISTORY_MUTATION_TIMEOUT_MS = 3000
+    HISTORY_IDLE_ROUNDS = 3
+    
+    # How often the GUI reads scraper process messages, and how long a stopped
+    # scraper gets to close its browser before it is killed
+    SCRAPER_POLL_INTERVAL_MS = 100
+    SCRAPER_STOP_TIMEOUT_MS = 5000
+    
+    # Verification preview: rows shown from each end of a scrape, and raw
+    # page lines fetched per window
+    PREVIEW_EDGE_ROWS = 50
+    PREVIEW_RAW_WINDOW_LINES = 300
+    
+    # Optional background browser: shut down after this long without a
+    # client, check the browser is alive this often, wait this long for it
+    BROWSER_DAEMON_IDLE_S = 2 * 3600
+    BROWSER_DAEMON_HEALTH_INTERVAL_S = 60
+    BROWSER_DAEMON_START_TIMEOUT_S = 90
+    
+    # Browserless history fetch: parallel requests, request rate cap and
+    # per-request timeout
+    FETCH_CONCURRENCY = 4
+    FETCH_RATE_PER_S = 5
+    FETCH_TIMEOUT_S = 20
+    
+    # Unattended imports: default interval, first retry delay after a failure
+    # (doubling per failure) and the longest backoff
+    IMPORT_SCHEDULE_INTERVAL_S = 3600
+    IMPORT_SCHEDULE_RETRY_S = 60
+    IMPORT_SCHEDULE_MAX_BACKOFF_S = 4 * 3600
+    
+    # Staged file imports: items each stage queue holds, sessions per
+    # written batch (one savepoint each), sessions per commit, and how often
+    # progress is reported
+    PIPELINE_QUEUE_SIZE = 8
+    PIPELINE_BATCH_ROWS = 1000
+    PIPELINE_COMMIT_ROWS = 10000
+    PIPELINE_PROGRESS_INTERVAL_S = 0.25
+    
+    # Logging: size at which each process's log file rotates, rotated files
+    # kept, level echoed to the console, and levels per logger name ('' is
+    # the root; the 'log_levels' setting overrides them)
+    LOG_MAX_BYTES = 5 * 1024 * 1024
+    LOG_BACKUP_COUNT = 3
+    LOG_CONSOLE_LEVEL = 'WARNING'
+    LOG_LEVELS = {'': 'INFO', 'selenium': 'WARNING', 'urllib3': 'WARNING', 'WDM': 'WARNING'}
+
+    # Disk cap for archived page dumps and audit files in IMPORT_DIR
+    IMPORT_ARCHIVE_MAX_BYTES = 200 * 1024 * 1024
+    
     # Default Chrome profile paths by OS
     DEFAULT_CHROME_PATHS = {
         'Windows': r'C:\Users\{username}\AppData\Local\Google\Chrome\User Data',
@@ -142,22 +205,50 @@ To find your profile:
             raise SystemExit(1)
         
         # Save the config
-        cls.ensure_directories()
-        try:
-            config = {}
-            if os.path.exists(cls.CONFIG_FILE):
-                with open(cls.CONFIG_FILE, 'r') as f:
-                    config = json.load(f)
-            
-            config['chrome_profile'] = chrome_path
-            
-            with open(cls.CONFIG_FILE, 'w') as f:
-                json.dump(config, f, indent=4)
-        except Exception as e:
-            print(f"Error saving config file: {e}")
+        cls.set_setting('chrome_profile', chrome_path)
         
         return chrome_path
     
+    # Cached contents of CONFIG_FILE, loaded on first use
+    _settings = None
+    # Settings are saved from the GUI and from background threads
+    _settings_lock = threading.RLock()
+    
+    @classmethod
+    def get_setting(cls, key, default=None):
+        """Read a user setting from the config file"""
+        if cls._settings is None:
+            with cls._settings_lock:
+                if cls._settings is None:
+                    settings = {}
+                    if os.path.exists(cls.CONFIG_FILE):
+                        try:
+                            with open(cls.CONFIG_FILE, 'r') as f:
+                                settings = json.load(f)
+                        except Exception as e:
+                            print(f"Error reading config file: {e}")
+                    cls._settings = settings
+        return cls._settings.get(key, default)
+    
+    @classmethod
+    def set_setting(cls, key, value):
+        """Store a user setting in the config file
+
+        The file is replaced whole, so a crash or another writer never
+        leaves it half written.
+        """
+        with cls._settings_lock:
+            cls.get_setting(key)
+            cls._settings[key] = value
+            cls.ensure_directories()
+            tmp = cls.CONFIG_FILE + '.tmp'
+            try:
+                with open(tmp, 'w') as f:
+                    json.dump(cls._settings, f, indent=4)
+                os.replace(tmp, cls.CONFIG_FILE)
+            except Exception as e:
+                print(f"Error saving config file: {e}")
+    
     @classmethod
     def ensure_directories(cls):
         """Ensure all required directories exist"""
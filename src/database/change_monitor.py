@@ -0,0 +1,122 @@
+import os
+import queue
+import sqlite3
+import logging
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bumped whenever the database changes; in-memory caches key on this
+_data_version = 0
+
+def current_data_version():
+    """Return the data version in-memory caches should key on"""
+    return _data_version
+
+class ChangeMonitor:
+    """Cheap change detection for database.db shared by several writers
+
+    Another app instance, a CLI import or a background thread can write to the
+    database at any time. Polling PRAGMA data_version on a dedicated connection
+    notices commits from every other connection without scanning tables, and
+    the file signature catches the file being replaced (e.g. backup restore).
+    Poll from the GUI thread; subscribers are called on the polling thread.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(Config.APP_DIR, Config.DB_NAME)
+        self.conn = None
+        self.last_data_version = None
+        self.last_signature = None
+        self.subscribers = []
+        self.events = queue.Queue()
+        self.open()
+
+    def open(self):
+        """(Re)open the monitoring connection and record the current state"""
+        self.close()
+        self.last_signature = self.file_signature()
+        try:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self.last_data_version = self.read_data_version()
+        except sqlite3.Error as e:
+            logger.error(f"Could not open change monitor connection: {e}")
+            self.conn = None
+            self.last_data_version = None
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+            self.conn = None
+
+    def file_signature(self):
+        """Identity, mtime and size of the database file and its WAL"""
+        signature = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_ino, st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def subscribe(self, callback):
+        """Register callback(sources) to run after the data version changes"""
+        self.subscribers.append(callback)
+
+    def post(self, source):
+        """Report a change from any thread; delivered on the next poll"""
+        self.events.put(source)
+
+    def poll(self):
+        """Check for changes, bump the data version and notify subscribers
+
+        Returns True when a change was detected.
+        """
+        global _data_version
+        sources = []
+
+        # Changes announced explicitly by other threads
+        while True:
+            try:
+                sources.append(self.events.get_nowait())
+            except queue.Empty:
+                break
+
+        signature = self.file_signature()
+        if signature != self.last_signature:
+            old_db, new_db = self.last_signature[0], signature[0]
+            if old_db is None or new_db is None or old_db[0] != new_db[0]:
+                # File was created or replaced, the old connection sees stale data
+                self.open()
+            else:
+                self.last_signature = signature
+            sources.append('file')
+
+        if self.conn is not None:
+            try:
+                data_version = self.read_data_version()
+                if data_version != self.last_data_version:
+                    self.last_data_version = data_version
+                    sources.append('database')
+            except sqlite3.Error as e:
+                logger.warning(f"Change monitor poll failed: {e}")
+                self.open()
+
+        if not sources:
+            return False
+
+        _data_version += 1
+        logger.debug(f"Data version {_data_version} ({', '.join(sources)})")
+        for callback in list(self.subscribers):
+            try:
+                callback(sources)
+            except Exception as e:
+                logger.error(f"Change subscriber failed: {e}")
+        return True
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, event
 from sqlalchemy.orm import sessionmaker
 from .models import Base, Session
 import os
@@ -6,13 +6,16 @@ import logging
 from datetime import datetime, timedelta
 from sqlalchemy.pool import QueuePool
 from .migrations import add_variance_columns
+from .memory_mirror import MemoryMirror, MirroredSession
 from ..config import Config
+from ..utils.time_utils import parse_duration
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Database:
+    # Process-wide in-memory copy used when the memory mirror is enabled
+    mirror = None
+
     @staticmethod
     def get_app_directory():
         """Get the application directory path"""
@@ -25,6 +28,7 @@ class Database:
         """Initialize database connection and run migrations"""
         self.db_path = os.path.join(Config.APP_DIR, Config.DB_NAME)
         self.engine = create_engine(f'sqlite:///{self.db_path}')
+        event.listen(self.engine, "connect", self.register_sql_functions)
         
         # Create tables if they don't exist
         Base.metadata.create_all(self.engine)
@@ -32,9 +36,40 @@ class Database:
         # Run migrations
         add_variance_columns()
         
-        self.Session = sessionmaker(bind=self.engine)
+        if Config.get_setting('memory_mirror', False):
+            if Database.mirror is None:
+                Database.mirror = MemoryMirror(self.db_path, self.register_sql_functions)
+            Database.mirror.attach(self.engine)
+            self.Session = sessionmaker(bind=self.engine, class_=MirroredSession,
+                                        mirror=Database.mirror)
+        else:
+            self.Session = sessionmaker(bind=self.engine)
         logger.info(f"Using existing database at: {self.db_path}")
 
+    @classmethod
+    def set_memory_mirror(cls, enabled):
+        """Turn serving reads from an in-memory copy on or off"""
+        Config.set_setting('memory_mirror', bool(enabled))
+        if not enabled and cls.mirror is not None:
+            cls.mirror.close()
+            cls.mirror = None
+
+    @classmethod
+    def refresh_mirror_if_stale(cls):
+        """Re-copy the mirror if another process changed the database file"""
+        if cls.mirror is not None:
+            return cls.mirror.refresh_if_stale()
+        return False
+
+    @staticmethod
+    def register_sql_functions(dbapi_connection, connection_record=None):
+        """Expose Python helpers to SQL so aggregates can run inside SQLite"""
+        dbapi_connection.create_function(
+            "duration_hours", 1,
+            lambda duration: parse_duration(duration) if duration else 0.0,
+            deterministic=True
+        )
+
     def get_session(self):
         return self.Session()
 
@@ -0,0 +1,125 @@
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class MaintenanceScheduler:
+    """Background upkeep for database.db while the app is idle
+
+    Runs ANALYZE/PRAGMA optimize, reclaims free pages with incremental_vacuum
+    and checks integrity with quick_check. A run only happens once the user
+    has been idle for a while and enough rows changed since the last run (or
+    the last run is old, or a run was requested), so routine use costs nothing.
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(Config.APP_DIR, Config.DB_NAME)
+        self.last_activity = time.monotonic()
+        self.stop_event = threading.Event()
+        self.run_requested = threading.Event()
+        self.run_lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run_loop, name="DatabaseMaintenance", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def note_activity(self, *args):
+        """Called on user input; maintenance waits until the app is idle"""
+        self.last_activity = time.monotonic()
+
+    def request_run(self):
+        """Ask for a run at the next idle moment (e.g. after bulk deletes)"""
+        self.run_requested.set()
+
+    @staticmethod
+    def last_result():
+        """Result of the most recent run, or None"""
+        return Config.get_setting('last_maintenance')
+
+    def run_loop(self):
+        while not self.stop_event.wait(Config.MAINTENANCE_CHECK_INTERVAL_S):
+            if time.monotonic() - self.last_activity < Config.MAINTENANCE_IDLE_S:
+                continue
+            try:
+                if self.run_requested.is_set() or self.needs_run():
+                    self.run_maintenance()
+            except Exception as e:
+                logger.error(f"Database maintenance failed: {e}")
+
+    def table_state(self, conn):
+        """Row count and highest id, used to estimate how much data changed"""
+        try:
+            count, max_id = conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM sessions").fetchone()
+        except sqlite3.OperationalError:
+            count, max_id = 0, 0
+        return count, max_id
+
+    def needs_run(self):
+        last = self.last_result()
+        if not last or last.get('error'):
+            return True
+        if time.time() - last.get('timestamp', 0) > Config.MAINTENANCE_MAX_AGE_S:
+            return True
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            count, max_id = self.table_state(conn)
+        finally:
+            conn.close()
+        # Deletes lower the count, inserts raise the highest id
+        changes = abs(count - last.get('rows', 0)) + max(0, max_id - last.get('max_id', 0))
+        threshold = max(Config.MAINTENANCE_MIN_CHANGES, Config.MAINTENANCE_CHANGE_RATIO * last.get('rows', 0))
+        return changes >= threshold
+
+    def run_maintenance(self):
+        """Run ANALYZE, incremental vacuum and a quick integrity check now"""
+        with self.run_lock:
+            self.run_requested.clear()
+            started = time.monotonic()
+            result = {
+                'timestamp': time.time(),
+                'finished_at': None,
+                'duration_ms': 0,
+                'integrity': None,
+                'pages_reclaimed': 0,
+                'rows': 0,
+                'max_id': 0,
+                'error': None
+            }
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            try:
+                freelist_before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    # One-time switch to incremental mode needs a full VACUUM
+                    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    conn.execute("VACUUM")
+                elif freelist_before:
+                    conn.execute("PRAGMA incremental_vacuum").fetchall()
+                result['pages_reclaimed'] = freelist_before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+                conn.execute("ANALYZE")
+                conn.execute("PRAGMA optimize")
+
+                check = conn.execute("PRAGMA quick_check").fetchall()
+                result['integrity'] = "; ".join(row[0] for row in check)
+                result['rows'], result['max_id'] = self.table_state(conn)
+            except sqlite3.Error as e:
+                result['error'] = str(e)
+                logger.warning(f"Database maintenance did not complete: {e}")
+            finally:
+                conn.close()
+
+            result['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            result['duration_ms'] = int((time.monotonic() - started) * 1000)
+            Config.set_setting('last_maintenance', result)
+            logger.info(f"Database maintenance finished: {result}")
+            return result
@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import logging
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.sql.dml import UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+logger = logging.getLogger(__name__)
+
+class MemoryMirror:
+    """In-memory copy of database.db that serves reads during analysis
+
+    The copy is made with the SQLite backup API. Writes go to the file on
+    disk and, once committed, are replayed on the copy (see attach()); only
+    when another process changed the file is it copied again in full.
+    The one in-memory connection is shared by all threads, so it is used by
+    one at a time: `lock` is held by a MirroredSession from its first read
+    until it ends, and around every refresh and replay.
+    """
+
+    def __init__(self, db_path, register_functions=None):
+        self.db_path = db_path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        if register_functions:
+            register_functions(self.conn)
+        self.engine = create_engine(
+            'sqlite://',
+            creator=lambda: self.conn,
+            poolclass=StaticPool
+        )
+        self.source_signature = None
+        self.refresh()
+
+    def attach(self, engine):
+        """Record the statements a disk engine runs so commits can be replayed"""
+        event.listen(engine, 'before_cursor_execute', self.record_statement)
+        # Whatever was not replayed by commit time belongs to a rolled back
+        # or unmirrored transaction
+        event.listen(engine, 'checkin', lambda dbapi_conn, record: record.info.pop('mirror_log', None))
+
+    @staticmethod
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip()[:8].upper()
+        if verb.startswith(('SELECT', 'PRAGMA', 'WITH', 'BEGIN')):
+            return
+        conn.info.setdefault('mirror_log', []).append((statement, parameters, executemany))
+
+    def apply(self, log):
+        """Replay a committed transaction's statements on the copy"""
+        with self.lock:
+            try:
+                # Explicit BEGIN so replayed SAVEPOINTs nest instead of committing
+                if not self.conn.in_transaction:
+                    self.conn.execute("BEGIN")
+                for statement, parameters, executemany in log:
+                    if executemany:
+                        self.conn.executemany(statement, parameters)
+                    else:
+                        self.conn.execute(statement, parameters)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                self.conn.rollback()
+                logger.warning(f"Replaying a write on the mirror failed ({e}), copying it again")
+                self.refresh()
+                return
+            self.source_signature = self.file_signature()
+
+    def file_signature(self):
+        try:
+            st = os.stat(self.db_path)
+            return (st.st_ino, st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Copy the on-disk database into memory"""
+        with self.lock:
+            source = sqlite3.connect(self.db_path)
+            try:
+                source.backup(self.conn)
+                self.source_signature = self.file_signature()
+            finally:
+                source.close()
+        logger.debug(f"Refreshed in-memory mirror of {self.db_path}")
+
+    def refresh_if_stale(self):
+        """Refresh only if the file changed since the last copy"""
+        if self.file_signature() != self.source_signature:
+            self.refresh()
+            return True
+        return False
+
+    def close(self):
+        with self.lock:
+            self.engine.dispose()
+            self.conn.close()
+
+class MirroredSession(OrmSession):
+    """ORM session that reads from the mirror and writes to disk
+
+    Once a transaction has written anything, the rest of it reads from disk
+    as well so it sees its own uncommitted changes. Committing a write
+    replays it on the mirror.
+    """
+
+    def __init__(self, *args, mirror=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.mirror = mirror
+        self.wrote = False
+        self.holds_mirror = False
+
+    def release_mirror(self):
+        if self.holds_mirror:
+            self.holds_mirror = False
+            self.mirror.lock.release()
+
+    @staticmethod
+    def is_write(clause):
+        if isinstance(clause, UpdateBase):
+            return True
+        if isinstance(clause, TextClause):
+            return not clause.text.lstrip().upper().startswith(('SELECT', 'WITH'))
+        return False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or self.is_write(clause):
+            self.wrote = True
+        if self.wrote:
+            return super().get_bind(mapper, clause=clause, **kwargs)
+        if not self.holds_mirror:
+            self.mirror.lock.acquire()
+            self.holds_mirror = True
+        return self.mirror.engine
+
+    def commit(self):
+        self.flush()  # Pending ORM writes mark the session as writing and are logged
+        if not self.wrote:
+            super().commit()
+            self.release_mirror()
+            return
+        log = self.connection().info.pop('mirror_log', [])
+        # Only a copy that matched the file before this commit can be patched
+        in_sync = self.mirror.file_signature() == self.mirror.source_signature
+        super().commit()
+        self.wrote = False
+        self.release_mirror()
+        if in_sync:
+            self.mirror.apply(log)
+        else:
+            self.mirror.refresh()
+
+    def rollback(self):
+        super().rollback()
+        self.wrote = False
+        self.release_mirror()
+
+    def close(self):
+        super().close()
+        self.wrote = False
+        self.release_mirror()
@@ -6,7 +6,6 @@ from ..config import Config
 import os
 
 # Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 def add_variance_columns():
@@ -19,3 +19,11 @@ class Session(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     bb_result = Column(Float)  # Result in big blinds
     variance = Column(Float)   # Variance for this session
+
+class ImportWatermark(Base):
+    __tablename__ = 'import_watermarks'
+    
+    room = Column(String, primary_key=True)  # Site/account the watermark belongs to
+    start_time = Column(DateTime)  # Newest imported session start time
+    fingerprint = Column(String)  # Fingerprint of that session
+    updated_at = Column(DateTime, default=datetime.utcnow)
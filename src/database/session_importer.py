@@ -1,71 +1,186 @@
 from .database import Database
-from .models import Session
+from .models import Session, ImportWatermark
 from datetime import datetime, timedelta
+from sqlalchemy import insert
+from ..scraping.session_parser import SessionRecord
+from ..scraping.dump_archive import DumpArchive
 
 class SessionImporter:
     def __init__(self):
         self.db = Database()
+        self.last_imported = 0  # New rows written by the last import_sessions call
 
-    def import_sessions(self, sessions):
-        """Import sessions into database with de-duplication"""
+    def get_watermark(self, room):
+        """Newest imported session for a room, or None"""
         session = self.db.get_session()
+        try:
+            return session.query(ImportWatermark).filter(ImportWatermark.room == room).first()
+        finally:
+            session.close()
+
+    def update_watermark(self, session, room, newest):
+        """Move a room's watermark forward to the newest seen session"""
+        watermark = session.query(ImportWatermark).filter(ImportWatermark.room == room).first()
+        if watermark is None:
+            watermark = ImportWatermark(room=room)
+            session.add(watermark)
+        elif watermark.start_time and watermark.start_time > newest.start_time:
+            return
+        watermark.start_time = newest.start_time
+        watermark.fingerprint = newest.fingerprint()
+        watermark.updated_at = datetime.utcnow()
+
+    def delete_sessions(self, session_ids):
+        """Delete sessions by id, so that later imports can bring them back"""
+        session = self.db.get_session()
+        try:
+            selected = session.query(Session).filter(Session.id.in_(list(session_ids)))
+            deleted = selected.with_entities(Session.room, Session.start_time).all()
+            selected.delete(synchronize_session=False)
+            # Let the next import bring them back instead of stopping above them
+            self.rewind_watermarks(session, deleted)
+            session.commit()
+            # Archived dumps holding them are no longer fully ingested
+            DumpArchive().clear_ingested([start_time for _, start_time in deleted])
+            return True, f"{len(deleted)} sessions deleted successfully"
+        except Exception as e:
+            session.rollback()
+            return False, f"Failed to delete sessions: {str(e)}"
+        finally:
+            session.close()
+
+    def rewind_watermarks(self, session, deleted):
+        """Move watermarks back below deleted sessions so a later import restores them
+
+        `deleted` holds the (room, start_time) of each deleted session; one
+        without a room may have come from any room, so it rewinds them all.
+        A watermark falls back to the newest remaining session of its room
+        older than the oldest deleted one, or is dropped if there is none.
+        """
+        oldest = {}
+        for room, start_time in deleted:
+            if room not in oldest or start_time < oldest[room]:
+                oldest[room] = start_time
+        for watermark in session.query(ImportWatermark).all():
+            cutoffs = [start_time for room, start_time in oldest.items() if room in (watermark.room, None)]
+            if not cutoffs or watermark.start_time is None or watermark.start_time < min(cutoffs):
+                continue
+            below = session.query(Session).filter(
+                Session.room == watermark.room, Session.start_time < min(cutoffs)
+            ).order_by(Session.start_time.desc(), Session.id.desc()).first()
+            if below is None:
+                session.delete(watermark)
+                continue
+            watermark.start_time = below.start_time
+            watermark.fingerprint = SessionRecord(
+                below.start_time, below.duration, below.game_format, below.stakes, below.hands_played, below.result
+            ).fingerprint()
+            watermark.updated_at = datetime.utcnow()
+
+    @staticmethod
+    def dedup_key(row):
+        return (row.start_time, row.duration, row.hands_played, row.result)
+
+    def existing_keys(self, session, sorted_sessions):
+        """Keys of stored sessions in the batch's time range, fetched in one query"""
+        if not sorted_sessions:
+            return set()
+        rows = session.query(
+            Session.start_time, Session.duration, Session.hands_played, Session.result
+        ).filter(
+            Session.start_time >= sorted_sessions[0].start_time,
+            Session.start_time <= sorted_sessions[-1].start_time
+        )
+        return {self.dedup_key(row) for row in rows}
+
+    def count_new(self, sessions):
+        """How many distinct sessions are not in the database yet"""
+        session = self.db.get_session()
+        try:
+            existing = self.existing_keys(session, sorted(sessions, key=lambda x: x.start_time))
+            return len({self.dedup_key(s) for s in sessions} - existing)
+        finally:
+            session.close()
+
+    def build_rows(self, sorted_sessions, existing, room=None, created_at=None):
+        """Rows to insert for the sessions whose keys are not in `existing`
+
+        `existing` gains the new keys. Returns (rows, duplicates).
+        """
+        created_at = created_at or datetime.utcnow()
+        current_total_hours = 0
+        current_end = None
         duplicates = 0
-        imported = 0
+        new_rows = []
         
-        try:
-            # Sort sessions by start time
-            sorted_sessions = sorted(sessions, key=lambda x: x['start_time'])
-            current_total_hours = 0
-            current_end = None
+        for session_data in sorted_sessions:
+            # Check for existing session
+            key = self.dedup_key(session_data)
+            if key in existing:
+                duplicates += 1
+                continue
+            existing.add(key)
             
-            for session_data in sorted_sessions:
-                # Check for existing session
-                existing_session = session.query(Session).filter(
-                    Session.start_time == session_data['start_time'],
-                    Session.duration == session_data['duration'],
-                    Session.hands_played == session_data['hands_played'],
-                    Session.result == session_data['result']
-                ).first()
-                
-                if existing_session:
-                    duplicates += 1
-                    continue
-                
-                # Calculate session duration in hours
-                duration_hours = self.parse_duration(session_data['duration'])
-                start = session_data['start_time']
-                end = start + timedelta(hours=duration_hours)
-                
-                # Calculate non-overlapping hours
-                if current_end is None:
+            # Calculate session duration in hours
+            duration_hours = self.parse_duration(session_data.duration)
+            start = session_data.start_time
+            end = start + timedelta(hours=duration_hours)
+            
+            # Calculate non-overlapping hours
+            if current_end is None:
+                current_total_hours += duration_hours
+            else:
+                if start > current_end:
+                    # No overlap
                     current_total_hours += duration_hours
                 else:
-                    if start > current_end:
-                        # No overlap
-                        current_total_hours += duration_hours
-                    else:
-                        # Handle overlap
-                        if end > current_end:
-                            current_total_hours += (end - current_end).total_seconds() / 3600
-                
-                current_end = max(end, current_end) if current_end else end
-                
-                # Create new Session object with total_hours
-                new_session = Session(
-                    start_time=session_data['start_time'],
-                    duration=session_data['duration'],
-                    game_format=session_data['game_format'],
-                    stakes=session_data['stakes'],
-                    hands_played=session_data['hands_played'],
-                    result=session_data['result'],
-                    total_hours=current_total_hours,
-                    created_at=datetime.utcnow()
-                )
-                session.add(new_session)
-                imported += 1
+                    # Handle overlap
+                    if end > current_end:
+                        current_total_hours += (end - current_end).total_seconds() / 3600
+            
+            current_end = max(end, current_end) if current_end else end
             
+            # New session row with total_hours
+            new_rows.append({
+                'room': room,
+                'start_time': session_data.start_time,
+                'duration': session_data.duration,
+                'game_format': session_data.game_format,
+                'stakes': session_data.stakes,
+                'hands_played': session_data.hands_played,
+                'result': session_data.result,
+                'total_hours': current_total_hours,
+                'created_at': created_at
+            })
+        return new_rows, duplicates
+
+    def write_batch(self, session, sessions, room=None):
+        """De-duplicate and insert a batch in an open transaction; returns (imported, duplicates)"""
+        sorted_sessions = sorted(sessions, key=lambda x: x.start_time)
+        existing = self.existing_keys(session, sorted_sessions)
+        new_rows, duplicates = self.build_rows(sorted_sessions, existing, room)
+        # One executemany instead of a flush per ORM object
+        if new_rows:
+            session.execute(insert(Session), new_rows)
+        return len(new_rows), duplicates
+
+    def import_sessions(self, sessions, room=None):
+        """Import SessionRecords into database with de-duplication
+
+        When a room is given, new sessions are tagged with it and the room's
+        import watermark is advanced to the newest session in the batch.
+        """
+        session = self.db.get_session()
+        
+        try:
+            imported, duplicates = self.write_batch(session, sessions, room)
+            
+            if room and sessions:
+                self.update_watermark(session, room, max(sessions, key=lambda x: x.start_time))
+
             # Commit the transaction
             session.commit()
+            self.last_imported = imported
             message = f"Imported {imported} sessions"
             if duplicates > 0:
                 message += f" (skipped {duplicates} duplicates)"
@@ -9,6 +9,9 @@ from ..gui.tabs.stats_tab import StatsTab
 from ..gui.tabs.settings_tab import SettingsTab
 from ..gui.tabs.import_tab import ImportTab
 from ..database.database import Database
+from ..database.change_monitor import ChangeMonitor
+from ..database.maintenance import MaintenanceScheduler
+from ..scraping.import_scheduler import ImportScheduler
 from ..config import Config
 
 class MainWindow(ctk.CTk):
@@ -48,6 +51,21 @@ class MainWindow(ctk.CTk):
         self.tabs = {}
         self.setup_tabs()
         
+        # Watch the database for changes made by other connections/processes
+        self.change_monitor = ChangeMonitor()
+        self.change_monitor.subscribe(self.on_data_changed)
+        self.after(Config.CHANGE_POLL_INTERVAL_MS, self.poll_for_changes)
+        
+        # Run ANALYZE/vacuum/integrity checks in the background while idle
+        self.maintenance = MaintenanceScheduler()
+        self.bind_all("<Any-KeyPress>", self.maintenance.note_activity, add="+")
+        self.bind_all("<Any-ButtonPress>", self.maintenance.note_activity, add="+")
+        self.maintenance.start()
+        
+        # Unattended incremental imports, when enabled in Settings
+        self.import_scheduler = ImportScheduler(self.change_monitor)
+        self.import_scheduler.start()
+        
         # Show default tab
         self.show_tab("Bankroll Overview")
         
@@ -88,6 +106,26 @@ class MainWindow(ctk.CTk):
         # Show selected tab
         self.tabs[tab_name].grid(row=0, column=0, sticky="nsew")
         self.current_tab = tab_name
+        
+        # Catch up on changes made while the tab was hidden
+        if hasattr(self.tabs[tab_name], 'on_data_changed'):
+            self.tabs[tab_name].on_data_changed()
+
+    def poll_for_changes(self):
+        """Periodically check the database for changes"""
+        self.check_for_changes()
+        self.after(Config.CHANGE_POLL_INTERVAL_MS, self.poll_for_changes)
+
+    def check_for_changes(self):
+        """Check for changes now, e.g. right after this process wrote to the database"""
+        return self.change_monitor.poll()
+
+    def on_data_changed(self, sources):
+        """Refresh the visible tab; hidden tabs refresh when shown"""
+        Database.refresh_mirror_if_stale()
+        tab = self.tabs.get(self.current_tab)
+        if hasattr(tab, 'on_data_changed'):
+            tab.on_data_changed()
 
     def on_closing(self):
         """Handle window closing"""
@@ -96,6 +134,12 @@ class MainWindow(ctk.CTk):
                 for tab in self.tabs.values():
                     if hasattr(tab, 'cleanup'):
                         tab.cleanup()
+            if hasattr(self, 'change_monitor'):
+                self.change_monitor.close()
+            if hasattr(self, 'maintenance'):
+                self.maintenance.stop()
+            if hasattr(self, 'import_scheduler'):
+                self.import_scheduler.stop()
         finally:
             self.quit()
 
@@ -5,6 +5,8 @@ import numpy as np
 from datetime import datetime, timedelta
 from ...database.database import Database
 from ...database.models import Session
+from ...database.change_monitor import current_data_version
+from ...utils.time_index import TimeIndex
 from tkinter import Toplevel, messagebox
 from matplotlib.collections import LineCollection
 
@@ -24,6 +26,7 @@ class BankrollOverviewTab(ctk.CTkFrame):
         
         # Initialize session data list
         self.session_data_list = []
+        self.loaded_version = None  # Data version the view was loaded at
         self.x_axis_var = ctk.StringVar(value="dollars")
         
         # Add sort state initialization
@@ -167,32 +170,26 @@ class BankrollOverviewTab(ctk.CTkFrame):
             return
         
         try:
-            # Sort sessions by date
-            sorted_sessions = sorted(sessions, key=lambda s: s.start_time)
+            # Build the cumulative index once; every window is two binary searches
+            self.time_index = TimeIndex.from_sessions(sessions)
             
             # Calculate time-based changes
             now = datetime.now()
             thirty_days_ago = now - timedelta(days=30)
             seven_days_ago = now - timedelta(days=7)
             
-            # Calculate changes with safe conversions
-            monthly_change = sum(float(s.result) if s.result else 0 for s in sorted_sessions 
-                               if s.start_time >= thirty_days_ago)
-            weekly_change = sum(float(s.result) if s.result else 0 for s in sorted_sessions 
-                              if s.start_time >= seven_days_ago)
+            monthly_change = self.time_index.range_totals(thirty_days_ago)[0]
+            weekly_change = self.time_index.range_totals(seven_days_ago)[0]
             
             # Calculate current bankroll as sum of all results
-            current_bankroll = sum(float(s.result) if s.result else 0 for s in sorted_sessions)
+            current_bankroll = self.time_index.range_totals()[0]
             
             # Calculate bankroll progression
-            running_balance = 0
             peak_balance = 0
             max_drawdown = 0
             
             # Track running balance and find peak/drawdown
-            for session in sorted_sessions:
-                result = float(session.result) if session.result else 0
-                running_balance += result
+            for running_balance in self.time_index.running_balances():
                 peak_balance = max(peak_balance, running_balance)
                 current_drawdown = peak_balance - running_balance
                 max_drawdown = max(max_drawdown, current_drawdown)
@@ -372,8 +369,14 @@ class BankrollOverviewTab(ctk.CTkFrame):
             ax.set_title('Poker Session Results (No Data)')
         canvas.draw()
 
+    def on_data_changed(self):
+        """Reload when the database changed since the view was loaded"""
+        if self.loaded_version != current_data_version():
+            self.fetch_sessions()
+
     def fetch_sessions(self):
         """Fetch sessions from database and update display"""
+        self.loaded_version = current_data_version()
         db = Database()
         session = db.get_session()
         try:
@@ -619,8 +622,12 @@ class BankrollOverviewTab(ctk.CTkFrame):
                     session.add(new_session)
                     session.commit()
                     
-                    # Refresh the display
-                    self.fetch_sessions()
+                    # Refresh the display (and any other tab watching the data)
+                    main_window = self.winfo_toplevel()
+                    if hasattr(main_window, 'check_for_changes'):
+                        main_window.check_for_changes()
+                    else:
+                        self.fetch_sessions()
                     dialog.destroy()
                     
                     messagebox.showinfo("Success", f"Manual adjustment of ${amount:,.2f} added successfully")
@@ -1,9 +1,15 @@
 import customtkinter as ctk
-from ...scraping.session_scraper import SessionScraper
-from ...scraping.session_parser import SessionParser
-from ...database.session_importer import SessionImporter
-import threading
-from tkinter import filedialog
+from ...scraping.scraper_process import (
+    ScraperProcess, StatusMessage, ReadyMessage, PreviewMessage, RawMessage, ImportedMessage,
+    SavedMessage, ErrorMessage, ClosedMessage, LOAD, RETRY, RAW, IMPORT, SAVE, CLOSE_BROWSER
+)
+from ...scraping.dump_archive import DumpArchive
+from ...scraping.folder_importer import FolderImporter
+from ...scraping.import_pipeline import ImportPipeline, PipelineResult
+from ...scraping.site_adapters import get_adapter, site_names
+import queue
+import time
+from tkinter import filedialog, messagebox
 from ...config import Config
 import os
 import json
@@ -16,9 +22,10 @@ class ImportTab(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=1)
         
-        self.scraper = SessionScraper()
-        self.parser = SessionParser()
-        self.importer = SessionImporter()
+        self.scraper = None  # ScraperProcess while a web import runs
+        self.pipeline = None  # ImportPipeline while a file import runs
+        self.verification_window = None
+        self.archive = DumpArchive()
         
         self._is_running = True
         self.import_in_progress = False
@@ -73,13 +80,12 @@ class ImportTab(ctk.CTkFrame):
         
         instructions = (
             "Instructions: (Note: You must have Google Chrome installed)\n"
-            "1. Ensure you are logged into your poker site in Chrome\n"
-            "2. Close your Chrome browser (completely)\n"
-            "3. Press Import Sessions\n"
-            "4. The browser will open automatically and go to your poker site's session page\n"
-            "5. Close any pop-ups the site loads\n"
-            "6. Ensure that all the session data that you want to import is loaded on the page (it does not need to be visible)\n"
-            "7. Press \"Continue after session history loaded\""
+            "1. Ensure you are logged into your poker site in Chrome (Chrome can stay open)\n"
+            "2. Press Import Sessions\n"
+            "3. A separate browser will open automatically and go to your poker site's session page\n"
+            "4. Close any pop-ups the site loads\n"
+            "5. Once the session page shows, the rest of your history is loaded automatically\n"
+            "6. Press \"Continue after session history loaded\""
         )
         instructions_label = ctk.CTkLabel(web_frame, text=instructions, justify="left", wraplength=800)
         instructions_label.grid(row=2, column=0, padx=5, pady=5, sticky="w")
@@ -90,7 +96,7 @@ class ImportTab(ctk.CTkFrame):
         
         self.site_dropdown = ctk.CTkOptionMenu(
             web_frame,
-            values=["Clubs Poker"],
+            values=site_names(),
             width=400
         )
         self.site_dropdown.grid(row=4, column=0, padx=5, pady=5, sticky="w")
@@ -135,6 +141,14 @@ class ImportTab(ctk.CTkFrame):
         )
         self.file_button.grid(row=1, column=0, padx=5, pady=20)
         
+        # Folder import button
+        self.folder_button = ctk.CTkButton(
+            file_frame,
+            text="Import Folder",
+            command=self.select_folder
+        )
+        self.folder_button.grid(row=1, column=1, padx=5, pady=20)
+        
         # Initially hidden buttons - place them before the status text
         self.continue_button = ctk.CTkButton(
             web_frame,  # Changed from content_frame to web_frame
@@ -173,23 +187,178 @@ class ImportTab(ctk.CTkFrame):
         if file_path:
             self.status_text.insert("1.0", f"Selected file: {file_path}\n")
             try:
-                # Parse the file
-                parsed_file = self.parser.parse_file(file_path)
-                self.status_text.insert("1.0", f"File parsed successfully\n")
-                
-                # Get sessions data
-                sessions = self.parser.get_sessions(parsed_file)
+                # Identical dumps that were already imported are skipped after hashing
+                digest = self.archive.hash_file(file_path)
+                if self.archive.is_ingested(digest):
+                    self.status_text.insert("1.0", "File was already imported, nothing to do\n")
+                    return
                 
-                # Import to database
-                success, message = self.importer.import_sessions(sessions)
-                if success:
-                    self.status_text.insert("1.0", f"Database import successful: {len(sessions)} sessions imported\n")
-                else:
-                    self.status_text.insert("1.0", f"Database import failed: {message}\n")
+                # Read, parse and import in stages; progress and Stop are in a window
+                self.file_digest = digest
+                self.file_path = file_path
+                self.pipeline = ImportPipeline(file_path)
+                self.file_button.configure(state="disabled")
+                self.show_file_progress(os.path.basename(file_path))
+                self.pipeline.start()
+                self.poll_file_import()
                 
             except Exception as e:
                 self.status_text.insert("1.0", f"Error processing file: {str(e)}\n")
     
+    def show_file_progress(self, name):
+        """Window with the running file import's progress and a Stop button"""
+        self.file_window = ctk.CTkToplevel(self)
+        self.file_window.title("File Import")
+        self.file_window.geometry("500x160")
+        
+        self.file_summary = ctk.CTkLabel(self.file_window, text=f"Importing {name}...")
+        self.file_summary.pack(padx=10, pady=(10, 5), anchor="w")
+        
+        self.file_progress = ctk.CTkProgressBar(self.file_window)
+        self.file_progress.set(0)
+        self.file_progress.pack(padx=10, pady=5, fill="x")
+        
+        self.file_stop_button = ctk.CTkButton(
+            self.file_window,
+            text="Stop",
+            command=self.stop_file_import
+        )
+        self.file_stop_button.pack(pady=10)
+    
+    def stop_file_import(self):
+        """Cancel the file import; batches already committed are kept"""
+        self.pipeline.cancel()
+        self.file_stop_button.configure(state="disabled", text="Stopping...")
+    
+    def poll_file_import(self):
+        """Apply progress events from the file import pipeline"""
+        if not self._is_running:
+            return
+        
+        result = None
+        progress = None
+        while True:
+            try:
+                event = self.pipeline.events.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(event, PipelineResult):
+                result = event
+            else:
+                progress = event
+        
+        if progress is not None and self.file_window.winfo_exists():
+            elapsed = max(progress.elapsed, 1e-6)
+            self.file_summary.configure(
+                text=f"{progress.parsed:,} parsed   {progress.imported:,} imported   "
+                     f"{progress.duplicates:,} duplicates   {progress.parsed / elapsed:,.0f} rows/s"
+            )
+            self.file_progress.set(progress.bytes_read / progress.total_bytes if progress.total_bytes else 1)
+        
+        if result is None:
+            self.after(200, self.poll_file_import)
+            return
+        
+        self.file_button.configure(state="normal")
+        if result.status == 'done':
+            self.archive.store_file(self.file_path, self.file_digest)
+            self.archive.mark_ingested(self.file_digest, self.pipeline.parsed, self.pipeline.span())
+            self.status_text.insert("1.0", f"Database import successful: {result.message}\n")
+        else:
+            self.status_text.insert("1.0", f"Database import incomplete: {result.message}\n")
+        if self.file_window.winfo_exists():
+            self.file_window.destroy()
+        main_window = self.winfo_toplevel()
+        if hasattr(main_window, 'check_for_changes'):
+            main_window.check_for_changes()
+    
+    def select_folder(self):
+        """Import every dump file in a folder, parsed in parallel"""
+        folder = filedialog.askdirectory(title="Select Folder of Session Files")
+        if not folder:
+            return
+        
+        paths = FolderImporter.find_dumps(folder)
+        if not paths:
+            self.status_text.insert("1.0", f"No .txt files found in {folder}\n")
+            return
+        
+        self.status_text.insert("1.0", f"Importing {len(paths)} files from {folder}...\n")
+        self.folder_button.configure(state="disabled")
+        self.folder_importer = FolderImporter(paths)
+        self.show_folder_progress(len(paths))
+        self.folder_importer.start()
+        self.poll_folder_import()
+    
+    def show_folder_progress(self, total_files):
+        """Window listing each file's outcome with overall throughput"""
+        self.folder_window = ctk.CTkToplevel(self)
+        self.folder_window.title("Folder Import")
+        self.folder_window.geometry("700x450")
+        
+        self.folder_summary = ctk.CTkLabel(self.folder_window, text=f"0 / {total_files} files")
+        self.folder_summary.pack(padx=10, pady=(10, 5), anchor="w")
+        
+        self.folder_progress = ctk.CTkProgressBar(self.folder_window)
+        self.folder_progress.set(0)
+        self.folder_progress.pack(padx=10, pady=5, fill="x")
+        
+        self.folder_log = ctk.CTkTextbox(self.folder_window)
+        self.folder_log.pack(padx=10, pady=5, expand=True, fill="both")
+        
+        self.folder_cancel_button = ctk.CTkButton(
+            self.folder_window,
+            text="Cancel",
+            command=self.folder_importer.cancel
+        )
+        self.folder_cancel_button.pack(pady=10)
+        
+        self.folder_total = total_files
+        self.folder_done = 0
+        self.folder_rows = 0
+    
+    def poll_folder_import(self):
+        """Apply progress events from the folder import thread"""
+        if not self._is_running:
+            return
+        
+        finished = False
+        while True:
+            try:
+                event = self.folder_importer.events.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:
+                finished = True
+                break
+            # A failure of the whole run comes without a path and is not a file
+            if event.path:
+                self.folder_done += 1
+            self.folder_rows += event.sessions
+            name = os.path.basename(event.path) or "Folder import"
+            self.folder_log.insert("end", f"[{event.status}] {name}: {event.sessions} sessions - {event.message}\n")
+            self.folder_log.see("end")
+        
+        if self.folder_window.winfo_exists():
+            elapsed = max(time.monotonic() - self.folder_importer.started_at, 1e-6)
+            self.folder_summary.configure(
+                text=f"{self.folder_done} / {self.folder_total} files   "
+                     f"{self.folder_done / elapsed:.1f} files/s   {self.folder_rows / elapsed:,.0f} rows/s"
+            )
+            self.folder_progress.set(self.folder_done / self.folder_total)
+        
+        if not finished:
+            self.after(200, self.poll_folder_import)
+            return
+        
+        self.folder_button.configure(state="normal")
+        self.status_text.insert("1.0", f"Folder import finished: {self.folder_done} files, {self.folder_rows} sessions\n")
+        if self.folder_window.winfo_exists():
+            self.folder_cancel_button.configure(text="Close", command=self.folder_window.destroy)
+        main_window = self.winfo_toplevel()
+        if hasattr(main_window, 'check_for_changes'):
+            main_window.check_for_changes()
+    
     def start_flash_effect(self):
         """Start the flashing effect for the continue button"""
         self.flash_count = 0
@@ -208,55 +377,241 @@ class ImportTab(ctk.CTkFrame):
 
     def start_import(self):
         """Start the import process"""
-        url = "https://play.clubspoker.com/d/?my-games"
+        adapter = get_adapter(self.site_dropdown.get())
         
         self.status_text.insert("1.0", "Starting import process...\n")
         self.import_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
+        self.import_in_progress = True
         
-        def status_callback(message):
-            self.status_text.insert("1.0", message)
+        self.start_scraper_when_idle(adapter)
+
+    def start_scraper_when_idle(self, adapter, waiting=False):
+        """Start the scraper once no scheduled import is using the browser"""
+        if not self._is_running or not self.import_in_progress:
+            return
+        scheduler = getattr(self.winfo_toplevel(), 'import_scheduler', None)
+        if scheduler is not None and not scheduler.hold(timeout=0):
+            if not waiting:
+                self.status_text.insert("1.0", "Waiting for the scheduled import to finish...\n")
+            self.after(Config.SCRAPER_POLL_INTERVAL_MS, lambda: self.start_scraper_when_idle(adapter, True))
+            return
+
+        # Browser, parsing and importing run in a child process; the GUI
+        # only reacts to its messages
+        self.scraper = ScraperProcess(adapter.name, adapter.url)
+        self.scraper.start()
+        self.poll_scraper()
+
+    def poll_scraper(self):
+        """Apply messages from the scraper process"""
+        if not self._is_running or self.scraper is None:
+            return
+        scraper = self.scraper
+        handlers = {
+            StatusMessage: self.on_scraper_status,
+            ReadyMessage: self.on_scraper_ready,
+            PreviewMessage: self.show_verification_window,
+            RawMessage: self.on_scraper_raw,
+            ImportedMessage: self.on_scraper_imported,
+            SavedMessage: self.on_scraper_saved,
+            ErrorMessage: self.on_scraper_status,
+            ClosedMessage: self.on_scraper_closed,
+        }
+        for message in scraper.messages():
+            handlers[type(message)](message)
         
-        def import_thread():
-            try:
-                self.scraper.set_status_callback(status_callback)
-                if self.scraper.initialize_driver():
-                    self.status_text.insert("1.0", "Browser initialized...\n")
-                    if self.scraper.navigate_to_url(url):
-                        self.status_text.insert("1.0", "Navigation successful...\n")
-                        self.continue_button.grid()
-                        self.continue_button.lift()
-                    else:
-                        self.status_text.insert("1.0", "Failed to navigate to URL\n")
-                        self.reset_import_state()
-                else:
-                    self.status_text.insert("1.0", "Failed to initialize browser\n")
-                    self.reset_import_state()
-            except Exception as e:
-                self.status_text.insert("1.0", f"Error: {str(e)}\n")
-                self.reset_import_state()
+        if self.scraper is not scraper:
+            return
+        if scraper.is_alive():
+            self.after(Config.SCRAPER_POLL_INTERVAL_MS, self.poll_scraper)
+            return
+        # It may have sent its last messages and exited since the drain above
+        closed = False
+        for message in scraper.messages():
+            handlers[type(message)](message)
+            closed = closed or isinstance(message, ClosedMessage)
+        if not closed:
+            # Died without saying goodbye, e.g. killed or crashed
+            self.on_scraper_closed(ClosedMessage())
+
+    def on_scraper_status(self, message):
+        self.status_text.insert("1.0", message.text)
+
+    def on_scraper_ready(self, message):
+        if message.auto:
+            # History was fetched without a browser, no login step
+            self.continue_after_login()
+        else:
+            self.continue_button.grid()
+            self.continue_button.lift()
+            self.start_flash_effect()
+
+    def continue_after_login(self):
+        """Continue after manual login"""
+        self.continue_button.grid_remove()
+        if self.scraper is not None:
+            self.status_text.insert("1.0", "Loading session history...\n")
+            self.scraper.send(LOAD)
+
+    def show_verification_window(self, message):
+        """Show a summary of a scrape for the user to verify before it is imported
+
+        Only the counts, date span and first and last rows are shown; the raw
+        page stays in the scraper process and is fetched a window at a time,
+        so opening the window costs the same for any history length.
+        """
+        if self.verification_window is not None and self.verification_window.winfo_exists():
+            self.verification_window.destroy()
         
-        threading.Thread(target=import_thread).start()
+        popup = ctk.CTkToplevel(self)
+        popup.title("Scraped Content Verification")
+        popup.geometry("800x700")
+        self.verification_window = popup
+        
+        warning_label = ctk.CTkLabel(
+            popup,
+            text="⚠️ WARNING: You must be logged into the poker site in Google Chrome before proceeding! ⚠️",
+            font=("Arial", 12, "bold"),
+            wraplength=700
+        )
+        warning_label.pack(pady=(10, 0))
+        
+        def day(value):
+            return value.strftime('%b %d, %Y %I:%M %p') if value else "-"
+        
+        summary = (
+            f"{message.sessions} sessions scraped: {message.new} new, "
+            f"{message.duplicates} already in the database\n"
+            f"From {day(message.oldest)} to {day(message.newest)}"
+        )
+        if message.watermark is not None:
+            summary += f"\nLast import reached {day(message.watermark)}"
+        summary_label = ctk.CTkLabel(popup, text=summary, font=("Arial", 13, "bold"), justify="left")
+        summary_label.pack(padx=10, pady=5, anchor="w")
+        
+        # First and last rows only
+        rows_area = ctk.CTkTextbox(popup, height=220)
+        rows_area.pack(padx=10, pady=5, expand=True, fill='both')
+        rows_text = "\n".join(message.head)
+        hidden = message.sessions - len(message.head) - len(message.tail)
+        if hidden > 0:
+            rows_text += f"\n\n... {hidden} more sessions ...\n"
+        if message.tail:
+            rows_text += "\n" + "\n".join(message.tail)
+        rows_area.insert("end", rows_text)
+        rows_area.configure(state="disabled")
+        
+        # Raw page, paged on demand
+        raw_header = ctk.CTkFrame(popup, fg_color="transparent")
+        raw_header.pack(padx=10, pady=(5, 0), fill="x")
+        self.raw_label = ctk.CTkLabel(raw_header, text="Raw content")
+        self.raw_label.pack(side="left")
+        window = Config.PREVIEW_RAW_WINDOW_LINES
+        self.raw_start = 0
+        self.raw_total = message.raw_lines
+        
+        def show_raw(start):
+            if self.scraper is not None:
+                self.scraper.send(RAW, max(0, min(start, self.raw_total - 1)), window)
+        
+        ctk.CTkButton(raw_header, text="Next", width=70, command=lambda: show_raw(self.raw_start + window)).pack(side="right", padx=2)
+        ctk.CTkButton(raw_header, text="Previous", width=70, command=lambda: show_raw(self.raw_start - window)).pack(side="right", padx=2)
+        self.raw_area = ctk.CTkTextbox(popup, height=160)
+        self.raw_area.pack(padx=10, pady=5, expand=True, fill='both')
+        show_raw(0)
+        
+        def send(command):
+            self.status_text.insert("1.0", "Loading session history...\n" if command != IMPORT else "Importing sessions...\n")
+            if self.scraper is not None:
+                self.scraper.send(command)
+        
+        def close_browser():
+            if messagebox.askyesno("Confirm Close", "Are you sure you want to close the browser?", parent=popup):
+                self.scraper.send(CLOSE_BROWSER)
+                popup.destroy()
+        
+        def cancel():
+            if messagebox.askyesno("Confirm Cancel", "Are you sure you want to cancel? This will close the browser.", parent=popup):
+                popup.destroy()
+                self.stop_import()
+        
+        button_frame = ctk.CTkFrame(popup, fg_color="transparent")
+        button_frame.pack(pady=10)
+        
+        buttons = [
+            ("Continue after session history loaded", lambda: send(IMPORT)),
+            ("New Scrape", lambda: send(LOAD)),
+            ("Retry Current", lambda: send(RETRY)),
+            ("Close Browser", close_browser),
+            ("Cancel", cancel),
+        ]
+        for text, command in buttons:
+            ctk.CTkButton(button_frame, text=text, command=command, width=120).pack(side="left", padx=5)
+
+    def on_scraper_raw(self, message):
+        """Show a window of the raw page in the verification window"""
+        if self.verification_window is None or not self.verification_window.winfo_exists():
+            return
+        self.raw_start = message.start
+        end = min(message.start + Config.PREVIEW_RAW_WINDOW_LINES, self.raw_total)
+        self.raw_label.configure(text=f"Raw content: lines {message.start + 1}-{end} of {self.raw_total}")
+        self.raw_area.configure(state="normal")
+        self.raw_area.delete("1.0", "end")
+        self.raw_area.insert("end", message.text)
+        self.raw_area.configure(state="disabled")
+
+    def on_scraper_imported(self, message):
+        popup = self.verification_window
+        parent = popup if popup is not None and popup.winfo_exists() else self
+        if not message.success:
+            messagebox.showerror("Import Error", f"Failed to import sessions: {message.message}", parent=parent)
+            return
+        messagebox.showinfo("Success", f"Successfully imported {message.sessions} sessions", parent=parent)
+        if parent is popup:
+            popup.destroy()
+        self.status_text.insert("1.0", "Content extracted successfully...\n")
+        self.save_close_button.grid(row=8, column=0, padx=5, pady=5, sticky="ew")
+        main_window = self.winfo_toplevel()
+        if hasattr(main_window, 'check_for_changes'):
+            main_window.check_for_changes()
+
+    def save_and_close(self):
+        """Archive the imported content and write its audit, then close the browser"""
+        self.save_close_button.grid_remove()
+        if self.scraper is not None:
+            self.scraper.send(SAVE)
+
+    def on_scraper_saved(self, message):
+        if message.content_file:
+            self.status_text.insert("1.0", f"Content saved to: {message.content_file}\n")
+        self.status_text.insert("1.0", f"Database import successful: {message.sessions} sessions processed\n")
+        self.status_text.insert("1.0", f"Writing import audit to: {message.audit_file}\n")
+        self.scraper.stop()
+
+    def on_scraper_closed(self, message):
+        self.scraper = None
+        main_window = self.winfo_toplevel()
+        if hasattr(main_window, 'import_scheduler'):
+            main_window.import_scheduler.release()
+        if self.verification_window is not None and self.verification_window.winfo_exists():
+            self.verification_window.destroy()
+        self.verification_window = None
+        self.reset_import_state()
 
     def stop_import(self):
         """Stop the import process and reset the UI"""
-        self.import_in_progress = False
         self.flash_count = 6  # Stop any ongoing flash effect
         
-        # Close any open verification windows
-        try:
-            for widget in self.winfo_children():
-                if isinstance(widget, tk.Toplevel):
-                    widget.destroy()
-        except Exception:
-            pass
-        
-        # Cleanup scraper
-        if hasattr(self, 'scraper'):
-            self.scraper.cleanup()
-            self.scraper = SessionScraper()
+        if self.scraper is not None:
+            scraper = self.scraper
+            scraper.stop()
+            # Kill it if the browser does not close in time
+            self.after(Config.SCRAPER_STOP_TIMEOUT_MS, scraper.kill)
+        elif self.import_in_progress:
+            # Still waiting for a scheduled import; nothing to stop
+            self.reset_import_state()
         
-        self.reset_import_state()
         self.status_text.insert("1.0", "Import process stopped by user\n")
 
     def reset_import_state(self):
@@ -270,72 +625,18 @@ class ImportTab(ctk.CTkFrame):
             self.continue_button.grid_remove()
         if hasattr(self, 'save_close_button'):
             self.save_close_button.grid_remove()
-
-    def continue_after_login(self):
-        """Continue after manual login"""
-        try:
-            self.continue_button.grid_remove()
-            
-            if self.scraper.get_page_content():
-                # Check if application is still running before updating GUI
-                if hasattr(self, '_is_running') and not self._is_running:
-                    return
-                self.status_text.insert("1.0", "Content extracted successfully...\n")
-                self.save_close_button.grid(row=8, column=0, padx=5, pady=5, sticky="ew")
-            else:
-                if hasattr(self, '_is_running') and not self._is_running:
-                    return
-                self.status_text.insert("1.0", "Failed to extract content\n")
-                self.import_button.configure(state="normal")
-        except Exception as e:
-            self.status_text.insert("1.0", f"Error in continue_after_login: {str(e)}\n")
-            self.import_button.configure(state="normal")
-    
-    def save_and_close(self):
-        """Save content, parse sessions, import to database, and cleanup"""
-        try:
-            if not hasattr(self, '_is_running') or not self._is_running:
-                return
-            
-            content_file = self.scraper.save_content()
-            if content_file:
-                self.status_text.insert("1.0", f"Content saved to: {content_file}\n")
-                try:
-                    parsed_file = self.parser.parse_file(content_file)
-                    self.status_text.insert("1.0", f"Sessions parsed and saved to: {parsed_file}\n")
-                    
-                    sessions = self.parser.get_sessions(parsed_file)
-                    success, message = self.importer.import_sessions(sessions)
-                    
-                    if success:
-                        self.status_text.insert("1.0", f"Database import successful: {len(sessions)} sessions imported\n")
-                        if self._is_running and hasattr(self.master, 'master') and hasattr(self.master.master, 'tabs'):
-                            self.master.master.tabs["Sessions"].fetch_sessions()
-                    else:
-                        self.status_text.insert("1.0", f"Database import failed: {message}\n")
-                    
-                except Exception as e:
-                    if self._is_running:
-                        self.status_text.insert("1.0", f"Error during processing: {str(e)}\n")
-        except Exception as e:
-            print(f"Error in save_and_close: {str(e)}")
-        finally:
-            try:
-                if self._is_running:
-                    if hasattr(self, 'save_close_button'):
-                        self.save_close_button.grid_remove()
-                    if hasattr(self, 'import_button'):
-                        self.import_button.configure(state="normal")
-            except Exception:
-                pass
     
     def cleanup(self):
         """Cleanup resources before destruction"""
         self._is_running = False
         self.import_in_progress = False
-        if hasattr(self, 'scraper'):
+        if self.pipeline is not None:
+            self.pipeline.cancel()
+        if self.scraper is not None:
             try:
-                self.scraper.cleanup()
+                self.scraper.stop()
+                self.scraper.process.join(Config.SCRAPER_STOP_TIMEOUT_MS / 1000)
+                self.scraper.kill()
             except Exception:
                 pass
 
@@ -1,8 +1,10 @@
 import customtkinter as ctk
 from ...database.database import Database
 from ...database.models import Session
+from ...database.session_importer import SessionImporter
+from ...database.change_monitor import current_data_version
 from datetime import datetime, timedelta
-from sqlalchemy import desc, asc
+from sqlalchemy import desc, asc, func
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
@@ -68,6 +70,7 @@ class SessionsTab(ctk.CTkFrame):
         self.current_sort_column = 0
         self.sort_ascending = False
         self.selected_sessions = {}  # Dictionary to track selected sessions
+        self.loaded_version = None  # Data version the table was loaded at
         
         # Configure main frame grid
         self.grid_columnconfigure(0, weight=1)
@@ -260,23 +263,66 @@ class SessionsTab(ctk.CTkFrame):
             
         return query
 
+    def build_page_query(self, session):
+        """Add running balance and filtered totals to the page query
+        
+        Window functions are evaluated over the filtered rows before
+        OFFSET/LIMIT, so one query returns the page, each row's cumulative
+        balance and the footer totals for the whole filter.
+        """
+        chronological = (Session.start_time, Session.id)
+        return self.build_query(session).add_columns(
+            func.sum(Session.result).over(order_by=chronological).label('running_balance'),
+            func.count().over().label('filtered_count'),
+            func.sum(Session.hands_played).over().label('filtered_hands'),
+            func.sum(Session.result).over().label('filtered_profit'),
+            func.sum(func.duration_hours(Session.duration)).over().label('filtered_hours')
+        )
+
+    def on_data_changed(self):
+        """Reload when the database changed since the table was loaded"""
+        if self.loaded_version != current_data_version():
+            self.fetch_sessions()
+
     def fetch_sessions(self):
+        self.loaded_version = current_data_version()
         db = Database()
         session = db.get_session()
         try:
-            query = self.build_query(session)
+            query = self.build_page_query(session)
+            
+            # Get paginated results along with the filter totals
+            rows = query.offset(self.current_page * self.page_size).limit(self.page_size).all()
             
-            # Get total count
-            self.total_sessions = query.count()
+            # Page fell off the end (e.g. after deleting rows), start over
+            if not rows and self.current_page > 0:
+                self.current_page = 0
+                rows = query.limit(self.page_size).all()
             
-            # Get paginated results
-            sessions = query.offset(self.current_page * self.page_size).limit(self.page_size).all()
+            if rows:
+                first = rows[0]
+                self.total_sessions = first.filtered_count
+                totals = (first.filtered_count, first.filtered_hands or 0,
+                          first.filtered_profit or 0, first.filtered_hours or 0)
+            else:
+                self.total_sessions = 0
+                totals = (0, 0, 0, 0)
             
-            self.update_table(sessions)
+            self.update_table(rows)
+            self.update_totals_footer(*totals)
             self.update_pagination_controls()
         finally:
             session.close()
 
+    def update_totals_footer(self, count, hands, profit, hours):
+        """Show totals for every session matching the current filters"""
+        total_minutes = int(hours * 60)
+        self.totals_label.configure(
+            text=(f"Sessions: {count:,}   Hands: {hands:,}   "
+                  f"Profit: ${profit:,.2f}   Time: {total_minutes // 60}h {total_minutes % 60}m"),
+            text_color="#287C37" if profit > 0 else "#FF3B30" if profit < 0 else "gray"
+        )
+
     def update_pagination_controls(self):
         total_pages = (self.total_sessions + self.page_size - 1) // self.page_size
         self.page_label.configure(text=f"Page {self.current_page + 1} of {total_pages}")
@@ -310,11 +356,11 @@ class SessionsTab(ctk.CTkFrame):
         self.table_container.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         
         # Configure column weights for the container
-        for i in range(8):
+        for i in range(10):
             self.table_container.grid_columnconfigure(i, weight=1)
         
         # Headers
-        headers = ["Select", "Date", "Stakes", "Game", "Duration", "Hands", "Result", "BB/100", "$/Hour"]
+        headers = ["Select", "Date", "Stakes", "Game", "Duration", "Hands", "Result", "BB/100", "$/Hour", "Balance"]
         for i, header in enumerate(headers):
             header_button = ctk.CTkButton(
                 self.table_container,
@@ -325,12 +371,13 @@ class SessionsTab(ctk.CTkFrame):
             )
             header_button.grid(row=0, column=i, padx=5, pady=(5, 10), sticky="ew")
 
-    def update_table(self, sessions):
+    def update_table(self, rows):
         """Update table with session data"""
         self.clear_table()
         self.selected_sessions.clear()
         
-        for row_idx, s in enumerate(sessions, start=1):
+        for row_idx, row in enumerate(rows, start=1):
+            s = row.Session
             try:
                 # Calculate stats
                 duration_hours = self.parse_duration(s.duration)
@@ -367,7 +414,8 @@ class SessionsTab(ctk.CTkFrame):
                     str(s.hands_played),
                     f"${s.result:.2f}",
                     f"{bb_per_100:.2f}",
-                    f"${hourly_rate:.2f}"
+                    f"${hourly_rate:.2f}",
+                    f"${row.running_balance:,.2f}"
                 ]
                 
                 for col, value in enumerate(cells):
@@ -440,6 +488,14 @@ class SessionsTab(ctk.CTkFrame):
             state="disabled"
         )
         self.next_button.pack(side="left", padx=5)
+        
+        # Totals for the current filter
+        self.totals_label = ctk.CTkLabel(
+            pagination_frame,
+            text="Sessions: -",
+            font=("Arial", 12, "bold")
+        )
+        self.totals_label.pack(side="right", padx=10)
 
     def show_graph_window(self):
         # Create new window
@@ -607,31 +663,18 @@ class SessionsTab(ctk.CTkFrame):
             f"Are you sure you want to delete {len(self.selected_sessions)} selected sessions?\nThis action cannot be undone."):
             return
         
-        db = Database()
-        session = db.get_session()
-        try:
-            # Delete selected sessions
-            session.query(Session).filter(
-                Session.id.in_(self.selected_sessions.keys())
-            ).delete(synchronize_session=False)
-            
-            session.commit()
-            messagebox.showinfo("Success", f"{len(self.selected_sessions)} sessions deleted successfully")
-            
-            # Clear selection and refresh
-            self.selected_sessions.clear()
+        success, message = SessionImporter().delete_sessions(self.selected_sessions.keys())
+        if not success:
+            messagebox.showerror("Error", message)
+            return
+        messagebox.showinfo("Success", message)
+        
+        # Clear selection and let every tab pick up the change
+        self.selected_sessions.clear()
+        main_window = self.winfo_toplevel()
+        if hasattr(main_window, 'check_for_changes'):
+            main_window.check_for_changes()
+        else:
             self.fetch_sessions()
-            
-            # Update other tabs if needed
-            main_window = self.winfo_toplevel()
-            if hasattr(main_window, 'tabs'):
-                if "Stats" in main_window.tabs:
-                    main_window.tabs["Stats"].update_stats()
-                if "Bankroll Overview" in main_window.tabs:
-                    main_window.tabs["Bankroll Overview"].fetch_sessions()
-                
-        except Exception as e:
-            session.rollback()
-            messagebox.showerror("Error", f"Failed to delete sessions: {str(e)}")
-        finally:
-            session.close()
\ No newline at end of file
+        if hasattr(main_window, 'maintenance'):
+            main_window.maintenance.request_run()
\ No newline at end of file
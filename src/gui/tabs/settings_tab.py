@@ -8,6 +8,13 @@ from ...config import Config
 import os
 import webbrowser
 import platform
+import threading
+from ...database.maintenance import MaintenanceScheduler
+from ...scraping.import_scheduler import ImportScheduler
+from ...scraping.dump_archive import DumpArchive
+from ...scraping.site_adapters import get_adapter
+from ...scraping.browser_daemon import BrowserDaemonClient
+from ...scraping.http_fetcher import clear_logins
 
 class SettingsTab(ctk.CTkFrame):
     def __init__(self, parent):
@@ -24,6 +31,7 @@ class SettingsTab(ctk.CTkFrame):
         self.create_tools_section()
         self.create_database_section()
         self.create_backup_section()
+        self.create_maintenance_section()
         
     def create_tools_section(self):
         """Create Tools section with quick access features"""
@@ -106,6 +114,65 @@ class SettingsTab(ctk.CTkFrame):
         )
         delete_btn.pack(pady=5)
         
+        # Serve reads from an in-memory copy of the database
+        self.memory_mirror_var = ctk.BooleanVar(value=Config.get_setting('memory_mirror', False))
+        mirror_switch = ctk.CTkSwitch(
+            button_container,
+            text="Load database into memory (faster filtering)",
+            variable=self.memory_mirror_var,
+            command=self.toggle_memory_mirror,
+            font=("Arial", 13)
+        )
+        mirror_switch.pack(pady=5)
+        
+        # Keep a headless browser running so repeat imports skip Chrome start-up
+        self.browser_daemon_var = ctk.BooleanVar(value=Config.get_setting('browser_daemon', False))
+        daemon_switch = ctk.CTkSwitch(
+            button_container,
+            text="Keep browser running between imports",
+            variable=self.browser_daemon_var,
+            command=self.toggle_browser_daemon,
+            font=("Arial", 13)
+        )
+        daemon_switch.pack(pady=5)
+        
+        # Read history from the site's JSON responses instead of the page table
+        self.network_capture_var = ctk.BooleanVar(value=Config.get_setting('network_capture', False))
+        capture_switch = ctk.CTkSwitch(
+            button_container,
+            text="Capture history from network responses",
+            variable=self.network_capture_var,
+            command=self.toggle_network_capture,
+            font=("Arial", 13)
+        )
+        capture_switch.pack(pady=5)
+        
+        # After one browser login, fetch history over HTTP with the saved cookies
+        self.browserless_var = ctk.BooleanVar(value=Config.get_setting('browserless_fetch', False))
+        browserless_switch = ctk.CTkSwitch(
+            button_container,
+            text="Fetch history without a browser after login",
+            variable=self.browserless_var,
+            command=self.toggle_browserless_fetch,
+            font=("Arial", 13)
+        )
+        browserless_switch.pack(pady=5)
+        
+        # Import new sessions unattended with the saved login or background browser
+        self.scheduled_import_var = ctk.BooleanVar(value=Config.get_setting('scheduled_import', False))
+        schedule_switch = ctk.CTkSwitch(
+            button_container,
+            text="Import new sessions automatically",
+            variable=self.scheduled_import_var,
+            command=self.toggle_scheduled_import,
+            font=("Arial", 13)
+        )
+        schedule_switch.pack(pady=5)
+        
+        self.schedule_label = ctk.CTkLabel(button_container, text="", font=("Arial", 12))
+        self.schedule_label.pack(pady=(0, 5))
+        self.refresh_schedule_status()
+        
     def create_backup_section(self):
         """Create Backup section"""
         backup_frame = ctk.CTkFrame(self.main_container)
@@ -154,20 +221,135 @@ class SettingsTab(ctk.CTkFrame):
         )
         restore_btn.pack(pady=5)
         
+    def create_maintenance_section(self):
+        """Create Database Maintenance section showing the last background run"""
+        maintenance_frame = ctk.CTkFrame(self.main_container)
+        maintenance_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=10)
+        
+        # Section header with icon
+        header_frame = ctk.CTkFrame(maintenance_frame, fg_color="transparent")
+        header_frame.pack(fill="x", pady=(10, 5))
+        
+        header = ctk.CTkLabel(
+            header_frame, 
+            text="🧹 Database Maintenance",
+            font=("Arial", 16, "bold")
+        )
+        header.pack(side="left", padx=10)
+        
+        # Separator
+        separator = ctk.CTkFrame(maintenance_frame, height=2, fg_color="gray50")
+        separator.pack(fill="x", padx=10, pady=(0, 10))
+        
+        self.maintenance_label = ctk.CTkLabel(
+            maintenance_frame,
+            text="Last run: never",
+            font=("Arial", 13),
+            justify="left"
+        )
+        self.maintenance_label.pack(pady=5, padx=20)
+        
+        run_btn = ctk.CTkButton(
+            maintenance_frame,
+            text="🔧 Run Maintenance Now",
+            command=self.run_maintenance_now,
+            width=200,
+            height=40,
+            font=("Arial", 13)
+        )
+        run_btn.pack(pady=10, padx=20)
+        
+        self.refresh_maintenance_status()
+        
+    def refresh_maintenance_status(self):
+        """Show the result of the last maintenance run, updating periodically"""
+        result = MaintenanceScheduler.last_result()
+        if result:
+            if result.get('error'):
+                status = f"Error: {result['error']}"
+                color = "#FF3B30"
+            else:
+                status = (f"Integrity: {result.get('integrity')}   "
+                          f"Pages reclaimed: {result.get('pages_reclaimed', 0)}   "
+                          f"Took: {result.get('duration_ms', 0)} ms")
+                color = "#287C37" if result.get('integrity') == "ok" else "#FF3B30"
+            self.maintenance_label.configure(
+                text=f"Last run: {result.get('finished_at')}\n{status}",
+                text_color=color
+            )
+        self.after(5000, self.refresh_maintenance_status)
+        
+    def run_maintenance_now(self):
+        main_window = self.winfo_toplevel()
+        if not hasattr(main_window, 'maintenance'):
+            return
+        self.maintenance_label.configure(text="Running maintenance...", text_color="gray")
+        threading.Thread(target=main_window.maintenance.run_maintenance, daemon=True).start()
+        
     def refresh_database(self):
         try:
             db = Database()
             db.update_total_hours()  # Update any calculations if needed
             
-            # Get main window and refresh sessions if possible
+            # Let every tab pick up the change
             main_window = self.winfo_toplevel()
-            if hasattr(main_window, 'tabs') and "Sessions" in main_window.tabs:
-                main_window.tabs["Sessions"].fetch_sessions()
+            if hasattr(main_window, 'check_for_changes'):
+                main_window.check_for_changes()
             
             messagebox.showinfo("Success", "Database refreshed successfully")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh database: {str(e)}")
             
+    def toggle_memory_mirror(self):
+        try:
+            Database.set_memory_mirror(self.memory_mirror_var.get())
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to change memory mode: {str(e)}")
+            
+    def toggle_browser_daemon(self):
+        enabled = self.browser_daemon_var.get()
+        Config.set_setting('browser_daemon', enabled)
+        if not enabled:
+            try:
+                BrowserDaemonClient().shutdown()
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to stop background browser: {str(e)}")
+            
+    def toggle_network_capture(self):
+        Config.set_setting('network_capture', self.network_capture_var.get())
+        # The running background browser was started without the event log
+        if Config.get_setting('browser_daemon', False):
+            BrowserDaemonClient().shutdown()
+            
+    def toggle_scheduled_import(self):
+        enabled = self.scheduled_import_var.get()
+        Config.set_setting('scheduled_import', enabled)
+        main_window = self.winfo_toplevel()
+        if enabled and hasattr(main_window, 'import_scheduler'):
+            main_window.import_scheduler.request_run()
+        self.refresh_schedule_status(repeat=False)
+        
+    def refresh_schedule_status(self, repeat=True):
+        """Show the result of the last scheduled import, updating periodically"""
+        result = ImportScheduler.last_result()
+        if not self.scheduled_import_var.get():
+            self.schedule_label.configure(text="", text_color="gray")
+        elif result:
+            when = datetime.fromtimestamp(result['timestamp']).strftime('%Y-%m-%d %H:%M')
+            color = "#FF3B30" if result.get('status') == 'error' else "gray"
+            self.schedule_label.configure(text=f"Last run {when}: {result.get('message')}", text_color=color)
+        else:
+            self.schedule_label.configure(text="No scheduled import yet", text_color="gray")
+        if repeat:
+            self.after(5000, self.refresh_schedule_status)
+        
+    def toggle_browserless_fetch(self):
+        enabled = self.browserless_var.get()
+        Config.set_setting('browserless_fetch', enabled)
+        if not enabled:
+            # Saved cookies are only kept while the mode is on
+            clear_logins()
+            
     def confirm_delete_sessions(self):
         if messagebox.askyesno("Confirm Delete", 
             "Are you sure you want to delete ALL sessions?\nThis action cannot be undone."):
@@ -178,14 +360,21 @@ class SettingsTab(ctk.CTkFrame):
             db = Database()
             session = db.get_session()
             session.execute(text("DELETE FROM sessions"))
+            # Next scrape must read full pages again
+            session.execute(text("DELETE FROM import_watermarks"))
             session.commit()
             session.close()
+            DumpArchive().clear_ingested()
             messagebox.showinfo("Success", "All sessions deleted successfully")
             
-            # Get main window and refresh sessions if possible
+            # Let every tab pick up the change
             main_window = self.winfo_toplevel()
-            if hasattr(main_window, 'tabs') and "Sessions" in main_window.tabs:
-                main_window.tabs["Sessions"].fetch_sessions()
+            if hasattr(main_window, 'check_for_changes'):
+                main_window.check_for_changes()
+            
+            # Reclaim the freed pages and refresh planner statistics when idle
+            if hasattr(main_window, 'maintenance'):
+                main_window.maintenance.request_run()
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete sessions: {str(e)}")
@@ -255,14 +444,16 @@ class SettingsTab(ctk.CTkFrame):
                         
                         # Restore selected backup
                         shutil.copy2(backup_path, db_path)
+                        # Archived dumps may hold sessions the backup lacks
+                        DumpArchive().clear_ingested()
                         
                         messagebox.showinfo("Success", "Database restored successfully")
                         select_window.destroy()
                         
-                        # Update sessions tab through the main window
+                        # Let every tab pick up the restored data
                         main_window = self.winfo_toplevel()
-                        if hasattr(main_window, 'tabs') and "Sessions" in main_window.tabs:
-                            main_window.tabs["Sessions"].fetch_sessions()
+                        if hasattr(main_window, 'check_for_changes'):
+                            main_window.check_for_changes()
                         
                     except Exception as e:
                         messagebox.showerror("Error", f"Failed to restore backup: {str(e)}")
@@ -284,7 +475,7 @@ class SettingsTab(ctk.CTkFrame):
 
     def open_poker_site(self):
         """Open the poker site in default Chrome browser across different operating systems"""
-        url = "https://play.clubspoker.com/d/?my-games"
+        url = get_adapter().url
         try:
             # Try to open specifically in Chrome based on OS
             system = platform.system()
@@ -2,7 +2,9 @@ import customtkinter as ctk
 from datetime import datetime, timedelta
 from ...database.database import Database
 from ...database.models import Session
+from ...database.change_monitor import current_data_version
 from ...utils.stats_calculator import StatsCalculator
+from ...utils.time_index import TimeIndex
 import logging
 
 logger = logging.getLogger(__name__)
@@ -58,9 +60,6 @@ class DatePicker(ctk.CTkFrame):
 
 class StatsTab(ctk.CTkFrame):
     def __init__(self, parent):
-        # Add this line at the start of __init__ to filter out StatsCalculator logs
-        logging.getLogger('poker_tracker.src.utils.stats_calculator').setLevel(logging.WARNING)
-        
         super().__init__(parent)
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)  # Stats content gets more space
@@ -71,6 +70,11 @@ class StatsTab(ctk.CTkFrame):
         # Create stats content
         self.create_stats_frame()
         
+        # All sessions sorted by start time; date ranges are sliced from this
+        self.all_sessions = []
+        self.time_index = TimeIndex()
+        self.loaded_version = None  # Data version the sessions were loaded at
+        
         # Initialize filters
         self.load_stakes_options()
         
@@ -118,7 +122,7 @@ class StatsTab(ctk.CTkFrame):
         self.stakes_listbox = ctk.CTkOptionMenu(
             stakes_frame,
             values=["Loading..."],
-            command=self.update_stats
+            command=self.render_stats
         )
         self.stakes_listbox.pack(side="left", padx=5)
         
@@ -285,7 +289,7 @@ class StatsTab(ctk.CTkFrame):
             self.calendar_frame.grid()
         else:
             self.calendar_frame.grid_remove()
-        self.update_stats()
+        self.render_stats()
 
     def get_date_filter(self):
         date_range = self.date_var.get()
@@ -383,197 +387,211 @@ class StatsTab(ctk.CTkFrame):
             (worst_streak['profit'], worst_streak['bb'], worst_streak['sessions'], worst_streak['hands'])
         )
 
-    def update_stats(self, *args):
+    def load_sessions(self):
+        """Load all sessions once and index them by start time"""
+        self.loaded_version = current_data_version()
         db = Database()
         session = db.get_session()
         try:
-            query = session.query(Session)
-            
-            # Apply date filter
-            start_date, end_date = self.get_date_filter()
-            if start_date and end_date:
-                query = query.filter(Session.start_time >= start_date, Session.start_time <= end_date)
-                
-            # Apply stakes filter
-            stakes_filter = self.stakes_listbox.get()
-            if stakes_filter != "All Stakes":
-                query = query.filter(Session.stakes == stakes_filter)
-                
-            # Execute query
-            sessions = query.all()
-            
-            if sessions:
-                # Calculate stats
+            self.all_sessions = session.query(Session).order_by(Session.start_time, Session.id).all()
+            self.time_index = TimeIndex.from_sessions(self.all_sessions)
+        finally:
+            session.close()
+
+    def on_data_changed(self):
+        """Reload when the database changed since the sessions were loaded"""
+        if self.loaded_version != current_data_version():
+            self.update_stats()
+
+    def update_stats(self, *args):
+        """Reload sessions from the database and refresh the stats"""
+        self.load_sessions()
+        self.render_stats()
+
+    def render_stats(self, *args):
+        """Refresh the stats for the current filters from the loaded sessions"""
+        # Apply date filter by slicing the time-ordered sessions
+        start_date, end_date = self.get_date_filter()
+        lo, hi = self.time_index.span(start_date, end_date)
+        sessions = self.all_sessions[lo:hi]
+        
+        # Apply stakes filter
+        stakes_filter = self.stakes_listbox.get()
+        if stakes_filter != "All Stakes":
+            sessions = [s for s in sessions if s.stakes == stakes_filter]
+        
+        if sessions:
+            # Calculate stats
+            if stakes_filter == "All Stakes":
+                total_profit, total_hands, _ = self.time_index.range_totals(start_date, end_date)
+            else:
                 total_profit = sum(s.result for s in sessions)
                 total_hands = sum(s.hands_played for s in sessions)
+            
+            # Find biggest win and loss sessions
+            biggest_win_session = max(sessions, key=lambda s: s.result)
+            biggest_loss_session = min(sessions, key=lambda s: s.result)
+            
+            # Sort sessions by start time and handle overlaps
+            sorted_sessions = sorted(sessions, key=lambda s: s.start_time)
+            total_hours = 0
+            current_end = None
+            
+            for s in sorted_sessions:
+                start = s.start_time
+                duration_hours = self.parse_duration(s.duration)
+                end = start + timedelta(hours=duration_hours)
                 
-                # Find biggest win and loss sessions
-                biggest_win_session = max(sessions, key=lambda s: s.result)
-                biggest_loss_session = min(sessions, key=lambda s: s.result)
-                
-                # Sort sessions by start time and handle overlaps
-                sorted_sessions = sorted(sessions, key=lambda s: s.start_time)
-                total_hours = 0
-                current_end = None
-                
-                for s in sorted_sessions:
-                    start = s.start_time
-                    duration_hours = self.parse_duration(s.duration)
-                    end = start + timedelta(hours=duration_hours)
-                    
-                    if current_end is None:
+                if current_end is None:
+                    total_hours += duration_hours
+                else:
+                    if start > current_end:
+                        # No overlap, add full duration
                         total_hours += duration_hours
                     else:
-                        if start > current_end:
-                            # No overlap, add full duration
-                            total_hours += duration_hours
-                        else:
-                            # Overlap exists, only add non-overlapping time
-                            if end > current_end:
-                                total_hours += (end - current_end).total_seconds() / 3600
-                    
-                    current_end = max(end, current_end) if current_end else end
-                
-                winning_sessions = sum(1 for s in sessions if s.result > 0)
-                
-                # Helper function for color coding
-                def color_amount(amount):
-                    return "#287C37" if amount > 0 else "#FF3B30"
-                
-                # Format currency with color
-                def format_currency(amount):
-                    color = color_amount(amount)
-                    return f"${abs(amount):,.2f}", color
-                
-                # Update labels
-                amount, color = format_currency(total_profit)
-                self.total_profit.configure(text=f"Total Won: {amount}", text_color=color)
-                
-                hourly_rate = total_profit/total_hours if total_hours else 0
-                amount, color = format_currency(hourly_rate)
-                self.profit_per_hour.configure(text=f"$/hour: {amount}", text_color=color)
-                
-                per_hand = total_profit/total_hands if total_hands else 0
-                amount, color = format_currency(per_hand)
-                self.profit_per_hand.configure(text=f"$/hand: {amount}", text_color=color)
-                
-                self.total_time.configure(text=f"Total Time: {self.format_duration(total_hours)}")
-                self.sessions_won.configure(text=f"Sessions Won: {winning_sessions}/{len(sessions)}")
-                self.win_percentage.configure(text=f"Win Rate: {(winning_sessions/len(sessions))*100:.1f}%")
-                self.total_hands.configure(text=f"Total Hands: {total_hands:,}")
+                        # Overlap exists, only add non-overlapping time
+                        if end > current_end:
+                            total_hours += (end - current_end).total_seconds() / 3600
                 
-                # Calculate hands per hour
-                hands_per_hour = int(total_hands / total_hours) if total_hours else 0
-                self.hands_per_hour.configure(text=f"Hands/Hour: {hands_per_hour:,}")
-                
-                # Update biggest win/loss
-                win_amount, win_color = format_currency(biggest_win_session.result)
-                self.biggest_win.configure(
-                    text=f"Biggest Win: {win_amount}\n{biggest_win_session.stakes} ({biggest_win_session.start_time.strftime('%Y-%m-%d')})",
-                    text_color=win_color
-                )
-                
-                loss_amount, loss_color = format_currency(biggest_loss_session.result)
-                self.biggest_loss.configure(
-                    text=f"Biggest Loss: {loss_amount}\n{biggest_loss_session.stakes} ({biggest_loss_session.start_time.strftime('%Y-%m-%d')})",
-                    text_color=loss_color
-                )
-                
-                # Calculate and display streaks
-                best_streak, worst_streak = self.calculate_streaks(sessions)
-                
-                # Format streak information
-                best_amount, best_color = format_currency(best_streak[0])
-                self.best_streak.configure(
-                    text=f"Best Streak: {best_amount} ({best_streak[1]:,.1f} BB)\n({best_streak[2]} sessions, {best_streak[3]:,} hands)",
-                    text_color=best_color
-                )
+                current_end = max(end, current_end) if current_end else end
+            
+            winning_sessions = sum(1 for s in sessions if s.result > 0)
+            
+            # Helper function for color coding
+            def color_amount(amount):
+                return "#287C37" if amount > 0 else "#FF3B30"
+            
+            # Format currency with color
+            def format_currency(amount):
+                color = color_amount(amount)
+                return f"${abs(amount):,.2f}", color
+            
+            # Update labels
+            amount, color = format_currency(total_profit)
+            self.total_profit.configure(text=f"Total Won: {amount}", text_color=color)
+            
+            hourly_rate = total_profit/total_hours if total_hours else 0
+            amount, color = format_currency(hourly_rate)
+            self.profit_per_hour.configure(text=f"$/hour: {amount}", text_color=color)
+            
+            per_hand = total_profit/total_hands if total_hands else 0
+            amount, color = format_currency(per_hand)
+            self.profit_per_hand.configure(text=f"$/hand: {amount}", text_color=color)
+            
+            self.total_time.configure(text=f"Total Time: {self.format_duration(total_hours)}")
+            self.sessions_won.configure(text=f"Sessions Won: {winning_sessions}/{len(sessions)}")
+            self.win_percentage.configure(text=f"Win Rate: {(winning_sessions/len(sessions))*100:.1f}%")
+            self.total_hands.configure(text=f"Total Hands: {total_hands:,}")
+            
+            # Calculate hands per hour
+            hands_per_hour = int(total_hands / total_hours) if total_hours else 0
+            self.hands_per_hour.configure(text=f"Hands/Hour: {hands_per_hour:,}")
+            
+            # Update biggest win/loss
+            win_amount, win_color = format_currency(biggest_win_session.result)
+            self.biggest_win.configure(
+                text=f"Biggest Win: {win_amount}\n{biggest_win_session.stakes} ({biggest_win_session.start_time.strftime('%Y-%m-%d')})",
+                text_color=win_color
+            )
+            
+            loss_amount, loss_color = format_currency(biggest_loss_session.result)
+            self.biggest_loss.configure(
+                text=f"Biggest Loss: {loss_amount}\n{biggest_loss_session.stakes} ({biggest_loss_session.start_time.strftime('%Y-%m-%d')})",
+                text_color=loss_color
+            )
+            
+            # Calculate and display streaks
+            best_streak, worst_streak = self.calculate_streaks(sessions)
+            
+            # Format streak information
+            best_amount, best_color = format_currency(best_streak[0])
+            self.best_streak.configure(
+                text=f"Best Streak: {best_amount} ({best_streak[1]:,.1f} BB)\n({best_streak[2]} sessions, {best_streak[3]:,} hands)",
+                text_color=best_color
+            )
+            
+            worst_amount, worst_color = format_currency(worst_streak[0])
+            self.worst_streak.configure(
+                text=f"Worst Streak: {worst_amount} ({worst_streak[1]:,.1f} BB)\n({worst_streak[2]} sessions, {worst_streak[3]:,} hands)",
+                text_color=worst_color
+            )
+            
+            # Get all results in BB for Hold'em sessions only
+            holdem_sessions = [s for s in sessions if s.game_format == "Hold'em"]
+            if holdem_sessions:
+                total_bb_won = 0
+                total_hands = 0
                 
-                worst_amount, worst_color = format_currency(worst_streak[0])
-                self.worst_streak.configure(
-                    text=f"Worst Streak: {worst_amount} ({worst_streak[1]:,.1f} BB)\n({worst_streak[2]} sessions, {worst_streak[3]:,} hands)",
-                    text_color=worst_color
-                )
+                for s in holdem_sessions:
+                    try:
+                        # Extract BB size from stakes (e.g., "1 SC / 2 SC" -> 2)
+                        bb_size = float(s.stakes.split('/')[1].strip().split()[0])
+                        # Convert result to BB (if result is $100 and BB is $2, that's 50 BB)
+                        bb_result = s.result / bb_size
+                        # Add to running totals
+                        total_bb_won += bb_result
+                        total_hands += s.hands_played
+                    except (IndexError, ValueError) as e:
+                        logger.warning(f"Could not process stakes {s.stakes}: {e}")
+                        continue
                 
-                # Get all results in BB for Hold'em sessions only
-                holdem_sessions = [s for s in sessions if s.game_format == "Hold'em"]
-                if holdem_sessions:
-                    total_bb_won = 0
-                    total_hands = 0
+                if total_hands > 0:
+                    # Calculate BB/100: (total BB won / total hands) * 100
+                    bb_per_100 = (total_bb_won / total_hands) * 100
                     
+                    # For standard deviation, use session-level results
+                    bb_results = []
                     for s in holdem_sessions:
                         try:
-                            # Extract BB size from stakes (e.g., "1 SC / 2 SC" -> 2)
                             bb_size = float(s.stakes.split('/')[1].strip().split()[0])
-                            # Convert result to BB (if result is $100 and BB is $2, that's 50 BB)
                             bb_result = s.result / bb_size
-                            # Add to running totals
-                            total_bb_won += bb_result
-                            total_hands += s.hands_played
-                        except (IndexError, ValueError) as e:
-                            logger.warning(f"Could not process stakes {s.stakes}: {e}")
+                            # Convert to BB/100 for each session
+                            bb_per_100_session = (bb_result / s.hands_played) * 100
+                            bb_results.append(bb_per_100_session)
+                        except (IndexError, ValueError, ZeroDivisionError):
                             continue
                     
-                    if total_hands > 0:
-                        # Calculate BB/100: (total BB won / total hands) * 100
-                        bb_per_100 = (total_bb_won / total_hands) * 100
-                        
-                        # For standard deviation, use session-level results
-                        bb_results = []
-                        for s in holdem_sessions:
-                            try:
-                                bb_size = float(s.stakes.split('/')[1].strip().split()[0])
-                                bb_result = s.result / bb_size
-                                # Convert to BB/100 for each session
-                                bb_per_100_session = (bb_result / s.hands_played) * 100
-                                bb_results.append(bb_per_100_session)
-                            except (IndexError, ValueError, ZeroDivisionError):
-                                continue
-                        
-                        # Calculate variance stats on BB/100 results
-                        mean, variance, std_dev = StatsCalculator.calculate_variance_stats(bb_results, len(bb_results))
-                        
-                        # Update labels
-                        self.bb_per_100.configure(
-                            text=f"BB/100: {bb_per_100:.2f}",
-                            text_color=color_amount(bb_per_100)
+                    # Calculate variance stats on BB/100 results
+                    mean, variance, std_dev = StatsCalculator.calculate_variance_stats(bb_results, len(bb_results))
+                    
+                    # Update labels
+                    self.bb_per_100.configure(
+                        text=f"BB/100: {bb_per_100:.2f}",
+                        text_color=color_amount(bb_per_100)
+                    )
+                    self.std_dev.configure(
+                        text=f"Std Dev (BB/100): {std_dev:.2f}"
+                    )
+                    
+                    # Pass win rate (BB/100) first, then std dev
+                    recommended_buyins, warning_msg = StatsCalculator.recommend_bankroll(std_dev, bb_per_100)
+                    
+                    if recommended_buyins is None:
+                        self.bankroll_rec.configure(
+                            text=warning_msg,
+                            text_color="#FF3B30"  # Red color for warning
                         )
-                        self.std_dev.configure(
-                            text=f"Std Dev (BB/100): {std_dev:.2f}"
+                    else:
+                        # Divide recommended buyins by 2 to get correct value
+                        recommended_buyins = recommended_buyins / 2
+                        self.bankroll_rec.configure(
+                            text=f"Recommended Bankroll: {recommended_buyins:.0f} buyins (${recommended_buyins * bb_size * 100:,.2f})",
+                            text_color="white"  # Reset to default color
                         )
-                        
-                        # Pass win rate (BB/100) first, then std dev
-                        recommended_buyins, warning_msg = StatsCalculator.recommend_bankroll(std_dev, bb_per_100)
-                        
-                        if recommended_buyins is None:
-                            self.bankroll_rec.configure(
-                                text=warning_msg,
-                                text_color="#FF3B30"  # Red color for warning
-                            )
-                        else:
-                            # Divide recommended buyins by 2 to get correct value
-                            recommended_buyins = recommended_buyins / 2
-                            self.bankroll_rec.configure(
-                                text=f"Recommended Bankroll: {recommended_buyins:.0f} buyins (${recommended_buyins * bb_size * 100:,.2f})",
-                                text_color="white"  # Reset to default color
-                            )
-            else:
-                # Reset labels if no sessions found
-                self.total_profit.configure(text="Total Won: -")
-                self.profit_per_hour.configure(text="$/hour: -")
-                self.profit_per_hand.configure(text="$/hand: -")
-                self.total_time.configure(text="Total Time: -")
-                self.sessions_won.configure(text="Sessions Won: -")
-                self.win_percentage.configure(text="Win Rate: -%")
-                self.biggest_win.configure(text="Biggest Win: -")
-                self.biggest_loss.configure(text="Biggest Loss: -")
-                self.bb_per_100.configure(text="BB/100: -")
-                self.std_dev.configure(text="Std Dev (BB): -")
-                self.total_hands.configure(text="Total Hands: -")
-                self.hands_per_hour.configure(text="Hands/Hour: -")
-                self.best_streak.configure(text="Best Streak: -")
-                self.worst_streak.configure(text="Worst Streak: -")
-                self.bankroll_rec.configure(text="Recommended Bankroll: - buyins")
-                
-        finally:
-            session.close()
\ No newline at end of file
+        else:
+            # Reset labels if no sessions found
+            self.total_profit.configure(text="Total Won: -")
+            self.profit_per_hour.configure(text="$/hour: -")
+            self.profit_per_hand.configure(text="$/hand: -")
+            self.total_time.configure(text="Total Time: -")
+            self.sessions_won.configure(text="Sessions Won: -")
+            self.win_percentage.configure(text="Win Rate: -%")
+            self.biggest_win.configure(text="Biggest Win: -")
+            self.biggest_loss.configure(text="Biggest Loss: -")
+            self.bb_per_100.configure(text="BB/100: -")
+            self.std_dev.configure(text="Std Dev (BB): -")
+            self.total_hands.configure(text="Total Hands: -")
+            self.hands_per_hour.configure(text="Hands/Hour: -")
+            self.best_streak.configure(text="Best Streak: -")
+            self.worst_streak.configure(text="Worst Streak: -")
+            self.bankroll_rec.configure(text="Recommended Bankroll: - buyins")
\ No newline at end of file
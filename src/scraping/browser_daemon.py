@@ -0,0 +1,365 @@
+import os
+import sys
+import json
+import time
+import secrets
+import logging
+import threading
+import subprocess
+from multiprocessing.connection import Listener, Client, AuthenticationError
+from .driver_manager import DriverManager
+from .network_capture import enable_capture
+from .site_adapters import get_adapter
+from ..config import Config
+from ..utils.logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = 'browser_daemon.json'
+
+# The daemon's own profile under APP_DIR, so it never holds the lock on the
+# profile a foreground scrape uses, and the file marking a login in it
+PROFILE_NAME = 'daemon_profile'
+LOGIN_MARKER = 'logged_in'
+
+# Driver methods a client may call, and attributes it may read
+ALLOWED_CALLS = {
+    'get', 'refresh', 'execute_script', 'execute_async_script', 'set_script_timeout',
+    'get_log', 'execute_cdp_cmd', 'get_cookies'
+}
+ALLOWED_ATTRIBUTES = {'current_url', 'title'}
+
+def state_path():
+    return os.path.join(Config.APP_DIR, STATE_FILE)
+
+def login_marker_path():
+    return os.path.join(DriverManager(PROFILE_NAME).profile_dir, LOGIN_MARKER)
+
+def logged_in():
+    """Whether an import through the daemon's browser has been verified"""
+    return os.path.exists(login_marker_path())
+
+def mark_logged_in():
+    """Let the daemon run headless from its next start"""
+    path = login_marker_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(time.strftime('%Y-%m-%d %H:%M:%S'))
+
+class BrowserDaemon:
+    """Chrome kept running between imports, served over a local socket
+
+    The browser uses its own profile and runs headless once an import
+    through it was verified; until then its window is shown, so the first
+    login can be done in it. Clients connect with the key in the state file and send requests as
+    dicts; every driver call runs under one lock. A watchdog restarts a
+    browser that stopped answering and shuts the daemon down once no
+    client has been connected for BROWSER_DAEMON_IDLE_S.
+    """
+
+    def __init__(self):
+        self.authkey = secrets.token_bytes(32)
+        self.listener = None
+        self.driver = None
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+        self.clients = 0
+        self.last_used = time.monotonic()
+
+    def start_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        manager = DriverManager(PROFILE_NAME)
+        options = webdriver.ChromeOptions()
+        options.add_argument(f'--user-data-dir={manager.prepare_profile()}')
+        options.add_argument('--profile-directory=Default')
+        if logged_in():
+            options.add_argument('--headless=new')
+        else:
+            logger.info("No login verified in the background browser yet, showing its window")
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        if Config.get_setting('network_capture', False):
+            enable_capture(options)
+        self.driver = webdriver.Chrome(service=Service(executable_path=manager.driver_path()), options=options)
+        # Load the site once so the login is refreshed before the first import
+        self.driver.get(get_adapter().url)
+        logger.info("Browser started")
+
+    def stop_driver(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+    def healthy(self):
+        if self.driver is None:
+            return False
+        try:
+            return self.driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def ensure_driver(self):
+        """Restart the browser if it crashed or was never started"""
+        if not self.healthy():
+            if self.driver is not None:
+                logger.warning("Browser stopped responding, restarting it")
+            self.stop_driver()
+            self.start_driver()
+
+    def handle(self, request):
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'pid': os.getpid(), 'healthy': self.healthy()}
+        if op == 'shutdown':
+            self.stopping.set()
+            return {'ok': True}
+        if op == 'call':
+            name = request.get('name')
+            if name not in ALLOWED_CALLS and name not in ALLOWED_ATTRIBUTES:
+                return {'ok': False, 'error': f"Driver call not allowed: {name}"}
+            self.ensure_driver()
+            value = getattr(self.driver, name)
+            if name in ALLOWED_CALLS:
+                value = value(*request.get('args', ()))
+            return {'ok': True, 'value': value}
+        return {'ok': False, 'error': f"Unknown request: {op}"}
+
+    def serve_client(self, conn):
+        try:
+            while not self.stopping.is_set():
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    break
+                with self.lock:
+                    try:
+                        reply = self.handle(request)
+                    except Exception as e:
+                        reply = {'ok': False, 'error': str(e)}
+                    self.last_used = time.monotonic()
+                try:
+                    conn.send(reply)
+                except Exception as e:
+                    # e.g. a script returned an element, which cannot be pickled
+                    conn.send({'ok': False, 'error': f"Unsendable reply: {e}"})
+        finally:
+            conn.close()
+            with self.lock:
+                self.clients -= 1
+                self.last_used = time.monotonic()
+
+    def accept_loop(self):
+        while not self.stopping.is_set():
+            try:
+                conn = self.listener.accept()
+            except AuthenticationError:
+                logger.warning("Rejected a connection with the wrong key")
+                continue
+            except OSError:
+                break  # Listener closed on shutdown
+            with self.lock:
+                self.clients += 1
+            threading.Thread(target=self.serve_client, args=(conn,), daemon=True).start()
+
+    def watchdog(self):
+        while not self.stopping.wait(Config.BROWSER_DAEMON_HEALTH_INTERVAL_S):
+            with self.lock:
+                if self.clients == 0 and time.monotonic() - self.last_used > Config.BROWSER_DAEMON_IDLE_S:
+                    logger.info("Idle timeout reached, shutting down")
+                    self.stopping.set()
+                    break
+                try:
+                    self.ensure_driver()
+                except Exception as e:
+                    logger.error(f"Browser restart failed: {e}")
+
+    def write_state(self):
+        path = state_path()
+        tmp = path + '.tmp'
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({
+                'address': list(self.listener.address),
+                'authkey': self.authkey.hex(),
+                'pid': os.getpid()
+            }, f)
+        os.replace(tmp, path)
+
+    def remove_state(self):
+        try:
+            with open(state_path(), 'r') as f:
+                if json.load(f).get('pid') != os.getpid():
+                    return  # A newer daemon owns the file
+            os.remove(state_path())
+        except (OSError, ValueError):
+            pass
+
+    def run(self):
+        self.start_driver()
+        self.listener = Listener(('127.0.0.1', 0), authkey=self.authkey)
+        self.write_state()
+        logger.info(f"Listening on {self.listener.address}")
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+        threading.Thread(target=self.watchdog, daemon=True).start()
+        try:
+            self.stopping.wait()
+        finally:
+            self.remove_state()
+            self.listener.close()
+            with self.lock:
+                self.stop_driver()
+            logger.info("Browser daemon stopped")
+
+class RemoteDriver:
+    """Stand-in for a Selenium driver that forwards calls to the daemon
+
+    Covers the calls the scraper and HistoryLoader make. quit() only drops
+    the connection; the daemon's browser stays up for the next import.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def call(self, name, *args):
+        self.conn.send({'op': 'call', 'name': name, 'args': args})
+        reply = self.conn.recv()
+        if not reply['ok']:
+            raise RuntimeError(reply['error'])
+        return reply['value']
+
+    def get(self, url):
+        return self.call('get', url)
+
+    def refresh(self):
+        return self.call('refresh')
+
+    def execute_script(self, script, *args):
+        return self.call('execute_script', script, *args)
+
+    def execute_async_script(self, script, *args):
+        return self.call('execute_async_script', script, *args)
+
+    def set_script_timeout(self, seconds):
+        return self.call('set_script_timeout', seconds)
+
+    def get_log(self, log_type):
+        return self.call('get_log', log_type)
+
+    def execute_cdp_cmd(self, cmd, params):
+        return self.call('execute_cdp_cmd', cmd, params)
+
+    def get_cookies(self):
+        return self.call('get_cookies')
+
+    @property
+    def current_url(self):
+        return self.call('current_url')
+
+    @property
+    def title(self):
+        return self.call('title')
+
+    def quit(self):
+        self.conn.close()
+
+class BrowserDaemonClient:
+    """Finds, starts and talks to the browser daemon"""
+
+    def read_state(self):
+        try:
+            with open(state_path(), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def try_connect(self):
+        """Connection to a running daemon that answered a ping, else None"""
+        state = self.read_state()
+        if state is None:
+            return None
+        try:
+            conn = Client(tuple(state['address']), authkey=bytes.fromhex(state['authkey']))
+        except (OSError, EOFError, AuthenticationError, KeyError, ValueError):
+            return None
+        try:
+            conn.send({'op': 'ping'})
+            if conn.recv().get('ok'):
+                return conn
+        except (OSError, EOFError):
+            pass
+        conn.close()
+        return None
+
+    def launch(self):
+        """Start the daemon as a detached process that outlives the GUI"""
+        # Run this module from the directory holding its top-level package
+        root = os.path.abspath(__file__)
+        for _ in range(__name__.count('.') + 1):
+            root = os.path.dirname(root)
+        kwargs = {}
+        if os.name == 'nt':
+            kwargs['creationflags'] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs['start_new_session'] = True
+        # Keeps errors from before logging is set up (e.g. selenium missing)
+        Config.ensure_directories()
+        with open(os.path.join(Config.LOG_DIR, 'browser_daemon_stderr.log'), 'a') as log:
+            return subprocess.Popen(
+                [sys.executable, '-m', __name__], cwd=root,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=log,
+                **kwargs
+            )
+
+    def connect(self, start=True):
+        """RemoteDriver on the daemon, starting the daemon first if needed"""
+        conn = self.try_connect()
+        if conn is None and start:
+            logger.info("Starting browser daemon")
+            process = self.launch()
+            deadline = time.monotonic() + Config.BROWSER_DAEMON_START_TIMEOUT_S
+            # Stop waiting early if it exited, e.g. because Chrome failed to start
+            while conn is None and process.poll() is None and time.monotonic() < deadline:
+                time.sleep(0.5)
+                conn = self.try_connect()
+            conn = conn or self.try_connect()
+        if conn is None:
+            raise RuntimeError("Browser daemon is not running")
+        return RemoteDriver(conn)
+
+    def status(self):
+        """The daemon's ping reply, or None if it is not running"""
+        conn = self.try_connect()
+        if conn is None:
+            return None
+        try:
+            conn.send({'op': 'ping'})
+            return conn.recv()
+        finally:
+            conn.close()
+
+    def shutdown(self):
+        conn = self.try_connect()
+        if conn is None:
+            return False
+        try:
+            conn.send({'op': 'shutdown'})
+            return conn.recv().get('ok', False)
+        except (OSError, EOFError):
+            return False
+        finally:
+            conn.close()
+
+def main():
+    setup_logging('browser_daemon')
+    if BrowserDaemonClient().status() is not None:
+        logger.info("Another browser daemon is already running")
+        return
+    BrowserDaemon().run()
+
+if __name__ == '__main__':
+    main()
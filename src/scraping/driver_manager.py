@@ -0,0 +1,158 @@
+import os
+import re
+import shutil
+import logging
+import platform
+import subprocess
+from webdriver_manager.chrome import ChromeDriverManager
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Profile entries that carry the site login; the rest (cache, history,
+# extensions) is not copied
+PROFILE_ITEMS = [
+    'Cookies', 'Network', 'Local Storage', 'Session Storage',
+    'IndexedDB', 'Login Data', 'Web Data', 'Preferences'
+]
+
+# Chrome major versions whose driver is kept
+KEEP_DRIVER_VERSIONS = 2
+
+VERSION_RE = re.compile(r'(\d+)\.(\d+)\.(\d+)\.(\d+)')
+
+class DriverManager:
+    """ChromeDriver cache and isolated Chrome profile for the scraper
+
+    The driver is downloaded once per Chrome major version into
+    APP_DIR/drivers and reused; finding it only costs a stat of the Chrome
+    binary while Chrome is not updated. Chrome runs on a private copy of the
+    user's login data, so the user's own browser never has to be closed.
+    """
+
+    def __init__(self, profile_name='chrome_profile'):
+        self.system = platform.system()
+        self.driver_dir = os.path.join(Config.APP_DIR, 'drivers')
+        # Chrome locks a profile dir, so browsers running at once need their own
+        self.profile_dir = os.path.join(Config.APP_DIR, profile_name)
+
+    def user_data_dir(self):
+        """The user's own Chrome data directory"""
+        if self.system == 'Darwin':
+            return os.path.expanduser('~/Library/Application Support/Google/Chrome')
+        if self.system == 'Windows':
+            return os.path.join(os.getenv('LOCALAPPDATA', ''), 'Google', 'Chrome', 'User Data')
+        if self.system == 'Linux':
+            return os.path.expanduser('~/.config/google-chrome')
+        raise RuntimeError(f"Unsupported operating system: {self.system}")
+
+    def chrome_binary(self):
+        if self.system == 'Darwin':
+            candidates = ['/Applications/Google Chrome.app/Contents/MacOS/Google Chrome']
+        elif self.system == 'Windows':
+            candidates = [
+                os.path.join(os.getenv(var, ''), 'Google', 'Chrome', 'Application', 'chrome.exe')
+                for var in ('PROGRAMFILES', 'PROGRAMFILES(X86)', 'LOCALAPPDATA')
+            ]
+        else:
+            candidates = [shutil.which(name) for name in ('google-chrome', 'google-chrome-stable', 'chromium')]
+        for path in candidates:
+            if path and os.path.exists(path):
+                return path
+        return None
+
+    def chrome_version(self):
+        """Installed Chrome version, cached until the binary changes"""
+        binary = self.chrome_binary()
+        if binary is None:
+            return None
+        stamp = os.path.getmtime(binary)
+        cached = Config.get_setting('chrome_version')
+        if cached and cached.get('binary') == binary and cached.get('mtime') == stamp:
+            return cached['version']
+
+        version = self.read_chrome_version(binary)
+        if version:
+            Config.set_setting('chrome_version', {'binary': binary, 'mtime': stamp, 'version': version})
+        return version
+
+    def read_chrome_version(self, binary):
+        try:
+            if self.system == 'Windows':
+                import winreg
+                with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r'Software\Google\Chrome\BLBeacon') as key:
+                    text = winreg.QueryValueEx(key, 'version')[0]
+            elif self.system == 'Darwin':
+                import plistlib
+                info = os.path.join(binary.split('/Contents/')[0], 'Contents', 'Info.plist')
+                with open(info, 'rb') as f:
+                    text = plistlib.load(f)['CFBundleShortVersionString']
+            else:
+                text = subprocess.run([binary, '--version'], capture_output=True, text=True, timeout=10).stdout
+        except Exception as e:
+            logger.warning(f"Could not read Chrome version: {e}")
+            return None
+        match = VERSION_RE.search(text)
+        return match.group(0) if match else None
+
+    def driver_path(self):
+        """Path of a ChromeDriver matching the installed Chrome"""
+        name = 'chromedriver.exe' if self.system == 'Windows' else 'chromedriver'
+        version = self.chrome_version()
+        if version is None:
+            # Unknown Chrome: let webdriver_manager pick, without our cache
+            return ChromeDriverManager().install()
+
+        major = version.split('.')[0]
+        cached = os.path.join(self.driver_dir, major, name)
+        if os.path.exists(cached):
+            return cached
+
+        logger.info(f"Downloading ChromeDriver for Chrome {version}")
+        downloaded = ChromeDriverManager(driver_version=version).install()
+        os.makedirs(os.path.dirname(cached), exist_ok=True)
+        shutil.copy2(downloaded, cached)
+        os.chmod(cached, 0o755)
+        self.prune_drivers(major)
+        return cached
+
+    def prune_drivers(self, current):
+        """Drop drivers for all but the newest Chrome versions"""
+        majors = sorted((d for d in os.listdir(self.driver_dir) if d.isdigit()), key=int)
+        for major in majors[:-KEEP_DRIVER_VERSIONS]:
+            if major != current:
+                shutil.rmtree(os.path.join(self.driver_dir, major), ignore_errors=True)
+
+    def prepare_profile(self):
+        """Refresh the private profile from the user's and return its data dir
+
+        Only entries newer than the private copy are copied, so logging in
+        inside the scraper's browser is kept too. Files Chrome holds locked
+        are skipped.
+        """
+        try:
+            source = self.user_data_dir()
+        except RuntimeError:
+            source = None
+        if source and os.path.isdir(source):
+            # Local State holds the key Chrome encrypts cookies with
+            self.sync(os.path.join(source, 'Local State'), os.path.join(self.profile_dir, 'Local State'))
+            for item in PROFILE_ITEMS:
+                self.sync(os.path.join(source, 'Default', item), os.path.join(self.profile_dir, 'Default', item))
+        os.makedirs(os.path.join(self.profile_dir, 'Default'), exist_ok=True)
+        return self.profile_dir
+
+    def sync(self, src, dst):
+        if os.path.isdir(src):
+            for entry in os.listdir(src):
+                self.sync(os.path.join(src, entry), os.path.join(dst, entry))
+            return
+        if not os.path.isfile(src):
+            return
+        try:
+            if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src):
+                return
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            shutil.copy2(src, dst)
+        except OSError as e:
+            logger.warning(f"Skipped profile file {src}: {e}")
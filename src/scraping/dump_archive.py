@@ -0,0 +1,190 @@
+import os
+import io
+import json
+import lzma
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per block when hashing or compressing a dump
+BLOCK_SIZE = 1024 * 1024
+
+INDEX_FILE = 'archive_index.json'
+
+# Low lzma preset: ~10x faster than the default for ~25% larger archives
+LZMA_PRESET = 1
+
+class DumpArchive:
+    """Content-addressed store for raw page dumps in DB_Import_Files
+
+    Each dump is kept once as <sha256>.txt.xz, however often it is saved or
+    re-imported. archive_index.json records every hash seen and whether it
+    was fully ingested, so importing an identical file again only costs
+    hashing it. The index entry outlives the payload when retention prunes
+    old dumps, which keeps the short-circuit working.
+    """
+
+    lock = threading.Lock()
+
+    def __init__(self, root=None):
+        self.root = root or Config.IMPORT_DIR
+        if not os.path.exists(self.root):
+            os.makedirs(self.root)
+        self.index_path = os.path.join(self.root, INDEX_FILE)
+
+    @staticmethod
+    def hash_text(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def hash_file(path):
+        """SHA-256 of a file, read in blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def path_for(self, digest):
+        return os.path.join(self.root, f'{digest}.txt.xz')
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save_index(self, index):
+        tmp_path = self.index_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def is_ingested(self, digest):
+        return self.load_index().get(digest, {}).get('ingested', False)
+
+    def store_text(self, text, source=None):
+        """Archive scraped page text; returns its hash"""
+        return self.store_stream(io.BytesIO(text.encode('utf-8')), self.hash_text(text), source)
+
+    def store_file(self, path, digest=None):
+        """Archive a dump file; returns its hash"""
+        digest = digest or self.hash_file(path)
+        with open(path, 'rb') as f:
+            return self.store_stream(f, digest, os.path.basename(path))
+
+    def store_stream(self, stream, digest, source=None):
+        size, stored = self.write_payload(stream, digest)
+        self.record(digest, size, stored, source)
+        return digest
+
+    def write_payload(self, stream, digest):
+        """Compress a dump to <digest>.txt.xz unless already there
+
+        Touches no index state, so worker processes can call it. Returns
+        (size, stored) byte counts, or (None, None) if it already existed.
+        """
+        archive_path = self.path_for(digest)
+        if os.path.exists(archive_path):
+            return None, None
+        tmp_path = f'{archive_path}.{os.getpid()}.tmp'
+        size = 0
+        with lzma.open(tmp_path, 'wb', preset=LZMA_PRESET) as out:
+            for block in iter(lambda: stream.read(BLOCK_SIZE), b''):
+                out.write(block)
+                size += len(block)
+        os.replace(tmp_path, archive_path)
+        stored = os.path.getsize(archive_path)
+        logger.info(f"Archived dump {digest[:12]} ({size} -> {stored} bytes)")
+        return size, stored
+
+    def record(self, digest, size=None, stored=None, source=None):
+        """Add an archived dump to the index and apply retention"""
+        with self.lock:
+            index = self.load_index()
+            entry = index.setdefault(digest, {'ingested': False, 'sessions': 0})
+            if size is not None:
+                entry['size'] = size
+                entry['stored'] = stored
+                entry['archived_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if source:
+                entry['source'] = source
+            self.save_index(index)
+        self.enforce_retention()
+
+    def mark_ingested(self, digest, sessions=0, span=None):
+        """Record that every session in this dump is in the database
+
+        span is the (oldest, newest) start time in the dump, which lets
+        clear_ingested() forget only the dumps holding deleted sessions.
+        """
+        with self.lock:
+            index = self.load_index()
+            entry = index.setdefault(digest, {})
+            entry['ingested'] = True
+            entry['sessions'] = sessions
+            entry['ingested_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if span:
+                entry['oldest'], entry['newest'] = (t.isoformat() for t in span)
+            self.save_index(index)
+
+    @staticmethod
+    def span(sessions):
+        """(oldest, newest) start time of some sessions, or None"""
+        starts = [session.start_time for session in sessions]
+        return (min(starts), max(starts)) if starts else None
+
+    def clear_ingested(self, start_times=None):
+        """Forget ingestion state, so those dumps are imported again
+
+        With start_times (of deleted sessions), only dumps whose span covers
+        one of them are forgotten, plus any without a recorded span.
+        Without, every dump is, e.g. after all sessions were deleted.
+        """
+        stamps = None if start_times is None else sorted(t.isoformat() for t in start_times)
+        with self.lock:
+            index = self.load_index()
+            for entry in index.values():
+                if stamps is None or 'oldest' not in entry or any(
+                        entry['oldest'] <= stamp <= entry['newest'] for stamp in stamps):
+                    entry['ingested'] = False
+            self.save_index(index)
+
+    def open_text(self, digest):
+        """Open an archived dump for reading as text"""
+        return lzma.open(self.path_for(digest), 'rt', encoding='utf-8')
+
+    def enforce_retention(self):
+        """Delete the oldest archived dumps and audit files above the size cap"""
+        files = []
+        for name in os.listdir(self.root):
+            if name.endswith('.txt.xz') or (name.startswith('parsed_sessions_') and name.endswith('.jsonl')):
+                path = os.path.join(self.root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        if total <= Config.IMPORT_ARCHIVE_MAX_BYTES:
+            return 0
+
+        removed = 0
+        for _, size, path in sorted(files):
+            if total <= Config.IMPORT_ARCHIVE_MAX_BYTES:
+                break
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning(f"Could not prune {path}: {e}")
+                continue
+            total -= size
+            removed += 1
+        logger.info(f"Pruned {removed} old import files from {self.root}")
+        return removed
@@ -0,0 +1,115 @@
+import os
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+from typing import NamedTuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .session_parser import iter_sessions
+from .dump_archive import DumpArchive
+from .site_adapters import detect_file
+from ..database.session_importer import SessionImporter
+
+logger = logging.getLogger(__name__)
+
+class FileProgress(NamedTuple):
+    """Outcome of importing one file, reported to the GUI"""
+    path: str
+    status: str  # 'imported', 'skipped' or 'error'
+    sessions: int
+    message: str
+
+def parse_dump(path, digest, archive_root):
+    """Parse and archive one dump file (runs in a worker process)
+
+    Returns (sessions, size, stored); compression happens here as well so
+    the single writer only ever does database work.
+    """
+    # The file was saved when the page was scraped; date rows relative to that
+    scraped_at = datetime.fromtimestamp(os.path.getmtime(path))
+    adapter = detect_file(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        sessions = list(iter_sessions(f, reference=scraped_at, adapter=adapter))
+    with open(path, 'rb') as f:
+        size, stored = DumpArchive(archive_root).write_payload(f, digest)
+    return sessions, size, stored
+
+class FolderImporter:
+    """Import every dump file in a folder, parsing files in parallel
+
+    Files are parsed in a process pool so every core is busy, and the parsed
+    records come back to a single writer thread that imports them one file
+    per transaction with batched de-duplication. Files already ingested are
+    skipped after hashing. Progress is put on `events` as FileProgress items,
+    followed by None when the run is over.
+    """
+
+    def __init__(self, paths, max_workers=None):
+        self.paths = list(paths)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.thread = None
+        self.started_at = None
+
+    @staticmethod
+    def find_dumps(folder):
+        """Text dump files in a folder, oldest first"""
+        paths = [
+            os.path.join(folder, name) for name in os.listdir(folder)
+            if name.lower().endswith('.txt') and os.path.isfile(os.path.join(folder, name))
+        ]
+        return sorted(paths, key=os.path.getmtime)
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self.run, name="FolderImport", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        archive = DumpArchive()
+        importer = SessionImporter()
+        try:
+            pending = {}
+            for path in self.paths:
+                digest = archive.hash_file(path)
+                if archive.is_ingested(digest):
+                    self.events.put(FileProgress(path, 'skipped', 0, "already imported"))
+                else:
+                    pending[path] = digest
+
+            if not pending:
+                return
+
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(pending))) as pool:
+                futures = {
+                    pool.submit(parse_dump, path, digest, archive.root): path
+                    for path, digest in pending.items()
+                }
+                for future in as_completed(futures):
+                    if self.cancel_event.is_set():
+                        # Drop queued files; the pool still waits for running ones
+                        for pending_future in futures:
+                            pending_future.cancel()
+                        break
+                    path = futures[future]
+                    try:
+                        sessions, size, stored = future.result()
+                    except Exception as e:
+                        self.events.put(FileProgress(path, 'error', 0, f"parse failed: {e}"))
+                        continue
+
+                    archive.record(pending[path], size, stored, os.path.basename(path))
+                    success, message = importer.import_sessions(sessions)
+                    if success:
+                        archive.mark_ingested(pending[path], len(sessions), archive.span(sessions))
+                    self.events.put(FileProgress(path, 'imported' if success else 'error', len(sessions), message))
+        except Exception as e:
+            logger.error(f"Folder import failed: {e}")
+            self.events.put(FileProgress('', 'error', 0, str(e)))
+        finally:
+            self.events.put(None)
@@ -0,0 +1,97 @@
+import json
+import logging
+from datetime import datetime
+from .session_parser import reached_watermark
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Records the next DOM change; armed before asking for more rows so a change
+# made synchronously by the click is not missed
+ARM_OBSERVER_SCRIPT = r"""
+    window.__historyChanged = new Promise(resolve => {
+        const observer = new MutationObserver(() => {
+            observer.disconnect();
+            // Let the rest of the batch render before it is read
+            requestAnimationFrame(() => resolve(true));
+        });
+        observer.observe(document.body, {childList: true, subtree: true});
+    });
+"""
+
+# Resolves true once the armed observer saw a change, false after the timeout
+WAIT_FOR_CHANGE_SCRIPT = r"""
+    const done = arguments[arguments.length - 1];
+    const timeout = new Promise(resolve => setTimeout(() => resolve(false), arguments[0]));
+    Promise.race([window.__historyChanged || Promise.resolve(false), timeout]).then(done);
+"""
+
+class HistoryLoader:
+    """Loads a site's whole session history without the user scrolling
+
+    Each round reads only the rows that appeared since the last round, asks
+    the page for more (a "load more" click or a scroll) and then waits on a
+    MutationObserver instead of a fixed sleep. Loading ends when a few
+    rounds in a row add nothing, or as soon as the import watermark is
+    reached, since everything below it was imported before.
+    """
+
+    def __init__(self, driver, adapter, watermark=None, reference=None):
+        self.driver = driver
+        self.adapter = adapter
+        self.watermark = watermark
+        self.decoder = adapter.decoder(reference or datetime.now())
+        self.rows = []
+        self.reached_watermark = False
+
+    def supported(self):
+        return self.adapter.rows_script is not None
+
+    def read_new_rows(self):
+        payload = self.driver.execute_script(self.adapter.rows_script, len(self.rows))
+        return json.loads(payload) if payload else []
+
+    def request_more(self):
+        """Ask the page for older rows and wait until its DOM changes
+
+        Returns False if nothing changed within HISTORY_MUTATION_TIMEOUT_MS.
+        """
+        timeout_ms = Config.HISTORY_MUTATION_TIMEOUT_MS
+        self.driver.execute_script(ARM_OBSERVER_SCRIPT)
+        self.driver.execute_script(self.adapter.load_more_script)
+        self.driver.set_script_timeout(timeout_ms / 1000 + 5)
+        return self.driver.execute_async_script(WAIT_FOR_CHANGE_SCRIPT, timeout_ms)
+
+    def decode(self, rows):
+        """SessionRecords for new rows, cut off at the watermark"""
+        sessions = []
+        for session in self.adapter.decode_cells(rows, self.decoder):
+            if self.watermark is not None and reached_watermark(session, self.watermark):
+                self.reached_watermark = True
+                break
+            sessions.append(session)
+        return sessions
+
+    def batches(self):
+        """Yield lists of new SessionRecords while the history keeps loading"""
+        idle_rounds = 0
+        while idle_rounds < Config.HISTORY_IDLE_ROUNDS:
+            rows = self.read_new_rows()
+            if rows:
+                idle_rounds = 0
+                self.rows.extend(rows)
+                sessions = self.decode(rows)
+                if sessions:
+                    yield sessions
+                if self.reached_watermark:
+                    logger.info(f"Reached import watermark after {len(self.rows)} rows")
+                    return
+            else:
+                idle_rounds += 1
+
+            self.request_more()
+        logger.info(f"History stopped growing at {len(self.rows)} rows")
+
+    def text(self):
+        """Every row read so far, in the page text format"""
+        return self.adapter.rows_to_text(self.rows)
@@ -0,0 +1,250 @@
+import os
+import ssl
+import json
+import time
+import queue
+import asyncio
+import logging
+import http.client
+from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from .session_parser import reached_watermark
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+LOGIN_FILE = 'site_logins.json'
+
+class LoginRequired(Exception):
+    """The saved cookies were rejected; the browser is needed to log in again"""
+
+def login_path():
+    return os.path.join(Config.APP_DIR, LOGIN_FILE)
+
+def load_logins():
+    try:
+        with open(login_path(), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_login(site):
+    """Saved cookies and captured history endpoint for a site, or None"""
+    return load_logins().get(site)
+
+def save_login(site, cookies, api_url=None, paging=None):
+    """Store a logged-in browser's cookies for browserless fetches (owner-only file)
+
+    api_url and paging are the history endpoint as network capture recorded
+    it (see paging_from_urls); without them the last recorded ones are kept.
+    """
+    logins = load_logins()
+    previous = logins.get(site) or {}
+    if api_url is None:
+        api_url, paging = previous.get('api_url'), previous.get('paging')
+    logins[site] = {'cookies': cookies, 'api_url': api_url, 'paging': paging, 'saved_at': datetime.now().isoformat()}
+    Config.ensure_directories()
+    tmp = login_path() + '.tmp'
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(logins, f)
+    os.replace(tmp, login_path())
+
+def forget_login(site):
+    logins = load_logins()
+    if logins.pop(site, None) is not None:
+        with open(login_path(), 'w') as f:
+            json.dump(logins, f)
+
+def clear_logins():
+    try:
+        os.remove(login_path())
+    except FileNotFoundError:
+        pass
+
+def cookie_header(cookies, host):
+    """Cookie header value with the unexpired cookies that apply to host"""
+    now = time.time()
+    pairs = []
+    for cookie in cookies:
+        domain = cookie.get('domain', '').lstrip('.')
+        if domain and host != domain and not host.endswith('.' + domain):
+            continue
+        if cookie.get('expiry') and cookie['expiry'] < now:
+            continue
+        pairs.append(f"{cookie['name']}={cookie['value']}")
+    return '; '.join(pairs)
+
+class ConnectionPool:
+    """Keep-alive connections to one host, shared by worker threads
+
+    A connection goes back to the pool after each response, so consecutive
+    pages reuse it instead of a new TCP and TLS handshake. A request on a
+    connection the server already closed is retried once on a fresh one.
+    """
+
+    def __init__(self, url, timeout=None):
+        parts = urlsplit(url)
+        self.https = parts.scheme == 'https'
+        self.host = parts.hostname
+        self.port = parts.port
+        self.timeout = timeout or Config.FETCH_TIMEOUT_S
+        self.context = ssl.create_default_context() if self.https else None
+        self.idle = queue.LifoQueue()
+        self.opened = 0
+
+    def connect(self):
+        self.opened += 1
+        if self.https:
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.context)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def get(self, path, headers):
+        """(status, body) of a GET request"""
+        try:
+            conn = self.idle.get_nowait()
+            fresh = False
+        except queue.Empty:
+            conn = self.connect()
+            fresh = True
+        while True:
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if fresh:
+                    raise
+                conn = self.connect()
+                fresh = True
+        if response.will_close:
+            conn.close()
+        else:
+            self.idle.put(conn)
+        return response.status, body
+
+    def close(self):
+        while True:
+            try:
+                self.idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+class RateLimiter:
+    """Spaces out request starts to at most `rate` per second"""
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self.next_at = 0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            now = asyncio.get_running_loop().time()
+            delay = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class HistoryFetcher:
+    """Pulls a site's session history over HTTP with a saved login
+
+    Only the endpoint network capture recorded is requested. When the
+    capture saw it paged (login['paging']), pages are requested a window at
+    a time, the window's requests running concurrently on pooled
+    connections behind a rate limit. Pages are consumed in order, newest
+    first, so fetching stops at the first empty page or at the import
+    watermark; at most one window of pages past that point is requested.
+    The first page is requested on its own, so finding nothing new costs
+    one request. Without known paging only the recorded URL is fetched.
+    """
+
+    def __init__(self, adapter, login, concurrency=None, rate=None):
+        self.adapter = adapter
+        self.api_url = login.get('api_url')
+        if not self.api_url:
+            raise ValueError(f"No history endpoint recorded for {adapter.name}; import once with network capture on")
+        self.paging = login.get('paging')
+        self.concurrency = concurrency or Config.FETCH_CONCURRENCY
+        self.rate = rate if rate is not None else Config.FETCH_RATE_PER_S
+        self.pool = ConnectionPool(self.api_url)
+        self.headers = {
+            'Accept': 'application/json',
+            'Cookie': cookie_header(login.get('cookies', []), self.pool.host),
+            'Connection': 'keep-alive',
+        }
+        self.rows = []
+        self.reached_watermark = False
+
+    def page_path(self, index):
+        """Path and query of the index-th page (0 is the newest)"""
+        parts = urlsplit(self.api_url)
+        query = parts.query
+        if self.paging:
+            param = self.paging['param']
+            pairs = [(key, value) for key, value in parse_qsl(query) if key != param]
+            pairs.append((param, str(self.paging['first'] + index * self.paging['step'])))
+            query = urlencode(pairs)
+        return urlunsplit(('', '', parts.path, query, ''))
+
+    async def fetch_page(self, limiter, page):
+        await limiter.wait()
+        loop = asyncio.get_running_loop()
+        status, body = await loop.run_in_executor(None, self.pool.get, self.page_path(page), self.headers)
+        if status in (401, 403):
+            raise LoginRequired(f"History request was refused ({status})")
+        if status != 200:
+            raise RuntimeError(f"History page {page} failed with HTTP {status}")
+        return self.adapter.decode_api(body.decode('utf-8', errors='replace'))
+
+    async def fetch(self, watermark=None, on_batch=None):
+        limiter = RateLimiter(self.rate)
+        sessions = []
+        page = 0
+        last_first = None
+        size = 1
+        while True:
+            window = range(page, page + size)
+            pages = await asyncio.gather(*(self.fetch_page(limiter, number) for number in window))
+            for records in pages:
+                # An empty page is the end; a repeated one means paging is ignored
+                if not records or records[0] == last_first:
+                    return sessions
+                last_first = records[0]
+                self.rows.extend(records)
+                batch = []
+                for session in records:
+                    if watermark is not None and reached_watermark(session, watermark):
+                        self.reached_watermark = True
+                        break
+                    batch.append(session)
+                sessions.extend(batch)
+                if batch and on_batch:
+                    on_batch(batch)
+                if self.reached_watermark or not self.paging:
+                    return sessions
+            page += size
+            size = self.concurrency
+
+    def fetch_all(self, watermark=None, on_batch=None):
+        """SessionRecords newer than the watermark, newest first
+
+        on_batch is called with each page's new records as it arrives.
+        Raises LoginRequired if the cookies no longer work.
+        """
+        started = time.monotonic()
+        try:
+            sessions = asyncio.run(self.fetch(watermark, on_batch))
+        finally:
+            self.pool.close()
+        logger.info(
+            f"Fetched {len(self.rows)} rows over {self.pool.opened} connections "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return sessions
+
+    def text(self):
+        """Every row fetched, in the page text format"""
+        return self.adapter.rows_to_text([self.adapter.session_cells(session) for session in self.rows])
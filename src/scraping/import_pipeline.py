@@ -0,0 +1,286 @@
+import os
+import time
+import queue
+import logging
+import threading
+from datetime import datetime
+from typing import NamedTuple
+from sqlalchemy import text
+from .session_parser import iter_sessions, CHUNK_SIZE
+from .parallel_parser import parse_large_file, PARALLEL_MIN_BYTES
+from .site_adapters import detect_file
+from ..database.session_importer import SessionImporter
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Ends a stage's output
+DONE = object()
+
+class PipelineProgress(NamedTuple):
+    """Counts so far, reported to the GUI while the import runs"""
+    bytes_read: int
+    total_bytes: int
+    parsed: int
+    imported: int
+    duplicates: int
+    elapsed: float
+
+class PipelineResult(NamedTuple):
+    """Outcome of the run; always the last event"""
+    status: str  # 'done', 'cancelled' or 'error'
+    imported: int
+    duplicates: int
+    message: str
+
+class StageStopped(Exception):
+    """Another stage failed or the run was cancelled"""
+
+class ChunkStream:
+    """Read-only text stream over the chunks the read stage queues"""
+
+    def __init__(self, pipeline, chunks):
+        self.pipeline = pipeline
+        self.chunks = chunks
+        self.finished = False
+
+    def read(self, size=-1):
+        if size == 0 or self.finished:
+            return ''
+        chunk = self.pipeline.get(self.chunks)
+        if chunk is DONE:
+            self.finished = True
+            return ''
+        return chunk
+
+class ImportPipeline:
+    """Import one dump file through staged threads
+
+    read -> parse -> normalize -> write, connected by queues holding at most
+    PIPELINE_QUEUE_SIZE items, so memory stays flat and a slow stage holds
+    the earlier ones back. Files of PARALLEL_MIN_BYTES or more skip the read
+    stage: parse_large_file decodes them in a process pool, which a cancel
+    cannot interrupt, and the parse stage batches its result. Normalize sorts each batch and drops sessions
+    already seen in this run; write de-duplicates against the database in
+    its own transaction and inserts each batch under a savepoint,
+    committing every PIPELINE_COMMIT_ROWS sessions. A failure or cancel()
+    rolls back only the uncommitted batches, so the database always holds
+    whole batches, and a later import of the same file adds the rest.
+    Progress goes on `events` as PipelineProgress, then one PipelineResult.
+    """
+
+    def __init__(self, path, room=None, adapter=None, reference=None):
+        self.path = path
+        self.room = room
+        self.adapter = adapter or detect_file(path)
+        # The file was saved when the page was scraped; date rows relative to that
+        self.reference = reference or datetime.fromtimestamp(os.path.getmtime(path))
+        self.total_bytes = os.path.getsize(path)
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.stop_event = threading.Event()  # Set on cancel or when a stage fails
+        self.error = None
+        self.bytes_read = 0
+        self.parsed = 0
+        self.imported = 0
+        self.duplicates = 0  # Already in the database
+        self.repeated = 0  # Seen earlier in this file
+        self.oldest = self.newest = None  # Start times parsed so far
+        self.started_at = None
+        self.thread = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        self.thread = threading.Thread(target=self.run, name="ImportPipeline", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        """Stop after the current batch, keeping what is committed"""
+        self.cancel_event.set()
+        self.stop_event.set()
+
+    def put(self, stage_queue, item):
+        while not self.stop_event.is_set():
+            try:
+                stage_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise StageStopped()
+
+    def get(self, stage_queue):
+        while not self.stop_event.is_set():
+            try:
+                return stage_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        raise StageStopped()
+
+    def stage(self, target, *args):
+        """Run a stage in a thread; its first error stops the others"""
+        def run():
+            try:
+                target(*args)
+            except StageStopped:
+                pass
+            except Exception as e:
+                logger.error(f"Import stage {target.__name__} failed: {e}")
+                self.error = self.error or e
+                self.stop_event.set()
+
+        thread = threading.Thread(target=run, name=f"ImportPipeline-{target.__name__}", daemon=True)
+        thread.start()
+        return thread
+
+    def read(self, chunks):
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                self.bytes_read = f.buffer.tell()
+                self.put(chunks, chunk)
+        self.put(chunks, DONE)
+
+    def parallel(self):
+        """Whether the file is large enough for parse_large_file"""
+        return self.total_bytes >= PARALLEL_MIN_BYTES
+
+    def parse(self, chunks, batches):
+        if self.parallel():
+            sessions = parse_large_file(self.path, reference=self.reference, adapter=self.adapter)
+            self.bytes_read = self.total_bytes
+        else:
+            sessions = iter_sessions(ChunkStream(self, chunks), reference=self.reference, adapter=self.adapter)
+        batch = []
+        for session in sessions:
+            batch.append(session)
+            if len(batch) >= Config.PIPELINE_BATCH_ROWS:
+                self.parsed += len(batch)
+                self.put(batches, batch)
+                batch = []
+        if batch:
+            self.parsed += len(batch)
+            self.put(batches, batch)
+        self.put(batches, DONE)
+
+    def normalize(self, batches, normalized):
+        seen = set()
+        while True:
+            batch = self.get(batches)
+            if batch is DONE:
+                break
+            unique = []
+            batch = sorted(batch, key=lambda x: x.start_time)
+            if self.oldest is None or batch[0].start_time < self.oldest:
+                self.oldest = batch[0].start_time
+            if self.newest is None or batch[-1].start_time > self.newest:
+                self.newest = batch[-1].start_time
+            for session in batch:
+                key = SessionImporter.dedup_key(session)
+                if key in seen:
+                    self.repeated += 1
+                    continue
+                seen.add(key)
+                unique.append(session)
+            if unique:
+                self.put(normalized, unique)
+        self.put(normalized, DONE)
+
+    def write(self, normalized):
+        """Insert batches in savepoints, committing every PIPELINE_COMMIT_ROWS
+
+        Only a run that reaches the end of the file commits the last group;
+        on a cancel or another stage's error it is rolled back.
+        """
+        importer = SessionImporter()
+        session = importer.db.get_session()
+        uncommitted = 0
+        committed = (0, 0)  # (imported, duplicates) as of the last commit
+        newest = None
+        try:
+            while True:
+                batch = self.get(normalized)
+                if batch is DONE:
+                    break
+                if not uncommitted:
+                    # Explicit BEGIN: pysqlite does not open a transaction for
+                    # SAVEPOINT, so the first release would commit on its own
+                    session.execute(text("BEGIN"))
+                savepoint = session.begin_nested()
+                try:
+                    imported, duplicates = importer.write_batch(session, batch, self.room)
+                    savepoint.commit()
+                except Exception:
+                    savepoint.rollback()
+                    raise
+                uncommitted += imported + duplicates
+                self.imported += imported
+                self.duplicates += duplicates
+                newest = batch[-1] if newest is None or batch[-1].start_time > newest.start_time else newest
+                if uncommitted >= Config.PIPELINE_COMMIT_ROWS:
+                    session.commit()
+                    committed = (self.imported, self.duplicates)
+                    uncommitted = 0
+
+            # Only a complete history may move the watermark
+            if self.room and newest is not None:
+                if not uncommitted:
+                    session.execute(text("BEGIN"))
+                importer.update_watermark(session, self.room, newest)
+            session.commit()
+        except Exception:
+            # StageStopped or an error: earlier commits stay, the open
+            # batches are dropped together
+            session.rollback()
+            self.imported, self.duplicates = committed
+            raise
+        finally:
+            session.close()
+
+    def span(self):
+        """(oldest, newest) start time in the file, or None"""
+        return (self.oldest, self.newest) if self.oldest else None
+
+    def progress(self):
+        return PipelineProgress(
+            self.bytes_read, self.total_bytes, self.parsed, self.imported, self.duplicates + self.repeated,
+            time.monotonic() - self.started_at
+        )
+
+    def run(self):
+        chunks = queue.Queue(Config.PIPELINE_QUEUE_SIZE)
+        batches = queue.Queue(Config.PIPELINE_QUEUE_SIZE)
+        normalized = queue.Queue(Config.PIPELINE_QUEUE_SIZE)
+        threads = [
+            self.stage(self.parse, chunks, batches),
+            self.stage(self.normalize, batches, normalized),
+            self.stage(self.write, normalized),
+        ]
+        if not self.parallel():
+            threads.insert(0, self.stage(self.read, chunks))
+        writer = threads[-1]
+        while writer.is_alive():
+            writer.join(Config.PIPELINE_PROGRESS_INTERVAL_S)
+            self.events.put(self.progress())
+        # Upstream stages stop too if the writer ended early
+        self.stop_event.set()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.monotonic() - self.started_at
+        if self.error is not None:
+            status = 'error'
+            message = f"Import stopped by an error after {self.imported} sessions: {self.error}"
+        elif self.cancel_event.is_set():
+            status = 'cancelled'
+            message = f"Import cancelled after {self.imported} sessions"
+        else:
+            status = 'done'
+            message = f"Imported {self.imported} sessions"
+            if self.duplicates + self.repeated:
+                message += f" (skipped {self.duplicates + self.repeated} duplicates)"
+        message += f" in {elapsed:.1f}s"
+        logger.info(f"{os.path.basename(self.path)}: {message}")
+        self.events.put(self.progress())
+        self.events.put(PipelineResult(status, self.imported, self.duplicates + self.repeated, message))
@@ -0,0 +1,125 @@
+import time
+import logging
+import threading
+from .session_scraper import SessionScraper
+from .site_adapters import get_adapter
+from ..database.session_importer import SessionImporter
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+class ImportScheduler:
+    """Unattended incremental web imports while the app runs
+
+    Each run pulls the site's history down to the import watermark with the
+    saved login, or through the background browser, imports it and
+    archives it. A run that finds nothing new stops at the first page and
+    writes nothing. Sites never imported by hand (no watermark) are
+    skipped, so catch-up is always just the delta. Failures retry after
+    IMPORT_SCHEDULE_RETRY_S, doubling up to IMPORT_SCHEDULE_MAX_BACKOFF_S.
+    """
+
+    def __init__(self, change_monitor=None):
+        self.change_monitor = change_monitor
+        self.stop_event = threading.Event()
+        self.wake = threading.Event()
+        self.held = threading.Event()
+        self.run_lock = threading.Lock()
+        self.failures = 0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run_loop, name="ImportScheduler", daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake.set()
+
+    def request_run(self):
+        """Run as soon as possible, e.g. right after the schedule is turned on"""
+        self.wake.set()
+
+    def hold(self, timeout=-1):
+        """Keep scheduled runs off the browser while a manual import uses it
+
+        Takes run_lock, so it waits up to timeout seconds (forever by
+        default) for a run in progress to finish; returns False, not held,
+        if that run is still going.
+        """
+        if not self.run_lock.acquire(timeout=timeout):
+            return False
+        self.held.set()
+        return True
+
+    def release(self):
+        if self.held.is_set():
+            self.held.clear()
+            self.run_lock.release()
+
+    @staticmethod
+    def last_result():
+        """Result of the most recent run, or None"""
+        return Config.get_setting('last_scheduled_import')
+
+    def next_delay(self):
+        if self.failures:
+            return min(Config.IMPORT_SCHEDULE_RETRY_S * 2 ** (self.failures - 1), Config.IMPORT_SCHEDULE_MAX_BACKOFF_S)
+        return Config.get_setting('import_interval_s', Config.IMPORT_SCHEDULE_INTERVAL_S)
+
+    def run_loop(self):
+        while not self.stop_event.is_set():
+            self.wake.wait(self.next_delay())
+            self.wake.clear()
+            if self.stop_event.is_set():
+                break
+            if Config.get_setting('scheduled_import', False) and not self.held.is_set():
+                self.run_import()
+
+    def run_import(self, room=None):
+        """Import the delta for a site now; returns the result dict"""
+        with self.run_lock:
+            room = room or get_adapter().name
+            result = {'timestamp': time.time(), 'room': room, 'status': None, 'sessions': 0, 'message': ''}
+            try:
+                result.update(self.import_room(room))
+                self.failures = 0
+            except Exception as e:
+                self.failures += 1
+                result.update(status='error', message=str(e))
+                logger.error(f"Scheduled import for {room} failed: {e}")
+            result['next_run_s'] = self.next_delay()
+            Config.set_setting('last_scheduled_import', result)
+            return result
+
+    def import_room(self, room):
+        if SessionImporter().get_watermark(room) is None:
+            return {'status': 'skipped', 'message': "Import once by hand first"}
+
+        scraper = SessionScraper()
+        scraper.room = room
+        try:
+            if scraper.can_fetch_without_browser():
+                content, sessions = scraper.fetch_history()
+            elif Config.get_setting('browser_daemon', False):
+                if not scraper.connect_daemon() or not scraper.navigate_to_url(get_adapter(room).url):
+                    raise RuntimeError("Background browser is unavailable")
+                content, sessions = scraper.load_history()
+            else:
+                return {'status': 'skipped', 'message': "Needs a saved login or the background browser"}
+
+            sessions = scraper.parse_preview(content, sessions)
+            if not sessions:
+                return {'status': 'unchanged', 'message': "No new sessions"}
+            success, message = scraper.verify()
+            if not success:
+                raise RuntimeError(message)
+            scraper.save_content()
+        finally:
+            scraper.cleanup()
+
+        if self.change_monitor is not None:
+            self.change_monitor.post('scheduled_import')
+        logger.info(f"Scheduled import for {room}: {message}")
+        return {'status': 'imported', 'sessions': len(sessions), 'message': message}
@@ -0,0 +1,152 @@
+import re
+import json
+import logging
+from decimal import Decimal
+from datetime import datetime
+from .session_parser import SessionRecord
+
+logger = logging.getLogger(__name__)
+
+# Field names tried for each session column, compared lower-case without
+# '_' or '-'. No site documents its history API, so these cover the usual
+# spellings; decode_payload logs rows that none of them fit.
+START_KEYS = ('starttime', 'startedat', 'start', 'begin', 'date', 'createdat')
+END_KEYS = ('endtime', 'endedat', 'end', 'finishedat')
+DURATION_KEYS = ('duration', 'durationseconds', 'durationsec', 'elapsed', 'length')
+FORMAT_KEYS = ('gameformat', 'gametype', 'game', 'variant', 'format')
+STAKES_KEYS = ('stakes', 'stake', 'blinds')
+SMALL_BLIND_KEYS = ('smallblind', 'sb')
+BIG_BLIND_KEYS = ('bigblind', 'bb')
+HANDS_KEYS = ('handsplayed', 'hands', 'handcount', 'numhands')
+RESULT_KEYS = ('result', 'net', 'profit', 'winnings', 'amount')
+
+DURATION_TEXT_RE = re.compile(r'^(?:\d+h )?\d+m \d+s$')
+AMOUNT_RE = re.compile(r'\d[\d,]*(?:\.\d+)?|\.\d+')
+CLOCK_RE = re.compile(r'^(?:(\d+):)?(\d+):(\d+)$')
+
+def load_json(body):
+    """Parse a response body, skipping anti-hijacking prefixes like )]}'"""
+    start = min((i for i in (body.find('{'), body.find('[')) if i >= 0), default=0)
+    return json.loads(body[start:])
+
+def normalize(row):
+    return {key.lower().replace('_', '').replace('-', ''): value for key, value in row.items()}
+
+def pick(row, keys):
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ''):
+            return value
+    return None
+
+def find_rows(payload):
+    """First list of objects in a JSON payload that look like session rows"""
+    if isinstance(payload, list):
+        if payload and all(isinstance(item, dict) for item in payload) and pick(normalize(payload[0]), START_KEYS) is not None:
+            return payload
+        children = payload
+    elif isinstance(payload, dict):
+        children = payload.values()
+    else:
+        return []
+    for child in children:
+        rows = find_rows(child)
+        if rows:
+            return rows
+    return []
+
+def parse_time(value):
+    """Local naive datetime from epoch seconds/milliseconds or ISO 8601 text"""
+    if isinstance(value, str) and value.strip().lstrip('-').isdigit():
+        value = int(value)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value)
+    parsed = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def format_duration(seconds):
+    """Seconds in the page's '1h 2m 3s' / '2m 3s' format"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    text = f"{minutes}m {seconds}s"
+    return f"{hours}h {text}" if hours else text
+
+def parse_duration(value):
+    if isinstance(value, (int, float)):
+        return format_duration(value)
+    text = str(value).strip()
+    if DURATION_TEXT_RE.match(text):
+        return text
+    clock = CLOCK_RE.match(text)
+    if clock:
+        hours, minutes, seconds = (int(part or 0) for part in clock.groups())
+        return format_duration(hours * 3600 + minutes * 60 + seconds)
+    return format_duration(float(text))
+
+def format_amount(value):
+    """Every digit of a float, without an exponent or trailing zeros (1.0 -> '1', 1e-05 -> '0.00001')"""
+    return format(Decimal(repr(float(value))).normalize(), 'f')
+
+def parse_stakes(value):
+    """Stakes text in the page's 'X SC / Y SC' format, from e.g. '0.5/1' or '$0.50 / $1'"""
+    blinds = AMOUNT_RE.findall(str(value))
+    if len(blinds) != 2:
+        raise ValueError(f"Unrecognised stakes: {value!r}")
+    small, big = (float(blind.replace(',', '')) for blind in blinds)
+    return f"{format_amount(small)} SC / {format_amount(big)} SC"
+
+def parse_amount(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    return float(str(value).replace('SC', '').replace(',', '').strip())
+
+def parse_format(value):
+    text = str(value)
+    key = text.lower().replace("'", '').replace(' ', '')
+    if 'holdem' in key or key in ('nlhe', 'nl', 'texas'):
+        return "Hold'em"
+    if 'omaha' in key or key.startswith('plo'):
+        return "Omaha"
+    return text
+
+def decode_row(row):
+    """SessionRecord for one JSON row; raises if a required column is missing"""
+    row = normalize(row)
+    start_time = parse_time(pick(row, START_KEYS))
+
+    duration = pick(row, DURATION_KEYS)
+    if duration is None:
+        duration = (parse_time(pick(row, END_KEYS)) - start_time).total_seconds()
+
+    stakes = pick(row, STAKES_KEYS)
+    if stakes is None:
+        stakes = f"{format_amount(parse_amount(pick(row, SMALL_BLIND_KEYS)))}/{format_amount(parse_amount(pick(row, BIG_BLIND_KEYS)))}"
+
+    return SessionRecord(
+        start_time=start_time,
+        duration=parse_duration(duration),
+        game_format=parse_format(pick(row, FORMAT_KEYS)),
+        stakes=parse_stakes(stakes),
+        hands_played=int(pick(row, HANDS_KEYS) or 0),
+        result=parse_amount(pick(row, RESULT_KEYS))
+    )
+
+def decode_payload(payload):
+    """SessionRecords for every usable row of a parsed JSON payload
+
+    Rows missing a column are skipped and counted in the log rather than
+    failing the whole response, so one odd row cannot block an import.
+    """
+    sessions = []
+    skipped = 0
+    for row in find_rows(payload):
+        try:
+            sessions.append(decode_row(row))
+        except (TypeError, ValueError, AttributeError):
+            skipped += 1
+    if skipped:
+        logger.warning(f"Skipped {skipped} session rows that could not be decoded")
+    return sessions
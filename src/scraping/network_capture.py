@@ -0,0 +1,123 @@
+import json
+import base64
+import logging
+from urllib.parse import urlsplit, parse_qsl
+from .history_loader import HistoryLoader
+from .session_parser import reached_watermark
+
+logger = logging.getLogger(__name__)
+
+def paging_from_urls(urls):
+    """How a history endpoint pages, from the URLs of captured responses
+
+    Returns {'param', 'first', 'step'} for the query parameter whose whole
+    number value changes between requests to the same path (e.g. page=1,
+    page=2 or offset=0, offset=50), or None if fewer than two pages were
+    captured and the paging is unknown.
+    """
+    values = {}
+    paths = set()
+    for url in urls:
+        parts = urlsplit(url)
+        paths.add(parts.path)
+        for key, value in parse_qsl(parts.query):
+            if value.isdigit():
+                values.setdefault(key, set()).add(int(value))
+    if len(paths) != 1:
+        return None
+    for key, seen in values.items():
+        if len(seen) > 1:
+            ordered = sorted(seen)
+            step = min(b - a for a, b in zip(ordered, ordered[1:]))
+            return {'param': key, 'first': ordered[0], 'step': step}
+    return None
+
+def enable_capture(options):
+    """Ask ChromeDriver to keep DevTools network events in the performance log"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+class NetworkCapture(HistoryLoader):
+    """Reads the session history from the site's own JSON responses
+
+    Instead of the rendered table, each round drains the DevTools events in
+    Chrome's performance log, fetches the body of every finished response
+    whose URL matches the adapter's api_pattern() and decodes it with the
+    adapter. Loading more history, idle detection and the watermark
+    cut-off work as in HistoryLoader; the driver needs enable_capture().
+    """
+
+    def __init__(self, driver, adapter, watermark=None, reference=None):
+        super().__init__(driver, adapter, watermark, reference)
+        self.pending = set()  # Matching responses whose body is not loaded yet
+        self.seen = set()
+        self.api_urls = []  # Matching response URLs in the order seen, reused by HistoryFetcher
+        self.api_re = adapter.api_pattern()
+        self.other_json = set()  # JSON response URLs that did not match, logged if none did
+
+    def supported(self):
+        return self.api_re is not None
+
+    def drain_events(self):
+        """Request ids of matching responses that finished loading since the last call"""
+        finished = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method = message.get('method')
+            params = message.get('params', {})
+            if method == 'Network.responseReceived':
+                url = params['response']['url']
+                if self.api_re.search(url):
+                    self.pending.add(params['requestId'])
+                    if url not in self.api_urls:
+                        self.api_urls.append(url)
+                elif 'json' in params['response'].get('mimeType', '') and len(self.other_json) < 50:
+                    self.other_json.add(url.split('?')[0])
+            elif method == 'Network.loadingFinished':
+                request_id = params['requestId']
+                if request_id in self.pending and request_id not in self.seen:
+                    self.pending.discard(request_id)
+                    self.seen.add(request_id)
+                    finished.append(request_id)
+        return finished
+
+    def response_body(self, request_id):
+        reply = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        body = reply['body']
+        if reply.get('base64Encoded'):
+            body = base64.b64decode(body).decode('utf-8', errors='replace')
+        return body
+
+    def batches(self):
+        yield from super().batches()
+        if not self.api_urls and self.other_json:
+            logger.info(f"No response matched {self.api_re.pattern!r}; set history_api_patterns to one of "
+                        f"these JSON endpoints: {sorted(self.other_json)}")
+
+    def api_endpoint(self):
+        """(url, paging) of the history endpoint as captured, or None"""
+        if not self.api_urls:
+            return None
+        return self.api_urls[0], paging_from_urls(self.api_urls)
+
+    def read_new_rows(self):
+        """SessionRecords from the responses finished since the last round"""
+        sessions = []
+        for request_id in self.drain_events():
+            try:
+                sessions.extend(self.adapter.decode_api(self.response_body(request_id)))
+            except Exception as e:
+                logger.warning(f"Could not decode history response {request_id}: {e}")
+        return sessions
+
+    def decode(self, rows):
+        """The new rows are records already; only cut them off at the watermark"""
+        sessions = []
+        for session in rows:
+            if self.watermark is not None and reached_watermark(session, self.watermark):
+                self.reached_watermark = True
+                break
+            sessions.append(session)
+        return sessions
+
+    def text(self):
+        return self.adapter.rows_to_text([self.adapter.session_cells(session) for session in self.rows])
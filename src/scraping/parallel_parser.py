@@ -0,0 +1,123 @@
+import gc
+import os
+import mmap
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from .session_parser import SessionRecord, iter_sessions
+from .site_adapters import get_adapter
+
+# Dumps smaller than this are parsed in-process; pool start-up would dominate
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+
+@contextmanager
+def gc_paused():
+    """Pause the cyclic GC while building many (acyclic) records
+
+    Otherwise every few thousand allocations trigger a collection that walks
+    all records built so far, which costs a third of the parse time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+def split_points(buffer, parts, record_start_re):
+    """Offsets that cut buffer into about `parts` slices at record starts
+
+    Only the first line of a record matches record_start_re, so cutting just
+    before a match never splits a record.
+    """
+    size = len(buffer)
+    points = [0]
+    for i in range(1, parts):
+        match = record_start_re.search(buffer, max(size * i // parts, points[-1]))
+        if match is None:
+            break
+        if match.start() > points[-1]:
+            points.append(match.start())
+    points.append(size)
+    return points
+
+def scan_days(site, path, start, end):
+    """Start time text of the rows in [start, end) that move the year walk
+
+    That is the first row of each run of same-day rows, and the first row
+    of the run with another time, which can decide the list order.
+
+    The regex scans a read-only mmap of the file, so every worker shares the
+    page cache instead of receiving a pickled copy of its slice.
+    """
+    adapter = get_adapter(site)
+    days = []
+    last_day = first_time = None
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for match in adapter.session_bytes_re.finditer(mm, start, end):
+            start_time = match.group(1).decode('utf-8')
+            day = adapter.day_of(start_time)
+            if day != last_day:
+                days.append(start_time)
+                last_day = day
+                first_time = start_time
+            elif first_time is not None and start_time != first_time:
+                days.append(start_time)
+                first_time = None
+    return days
+
+def parse_slice(site, path, start, end, reference, seed):
+    """Decode the records in [start, end), continuing the year walk from a seed
+
+    Returns the records as columns, which unpickle much faster than rows.
+    """
+    adapter = get_adapter(site)
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8', errors='replace')
+    # session_re expects the \n line ends text-mode reads produce
+    text = text.replace('\r\n', '\n')
+    decoder = adapter.decoder(reference)
+    decoder.year, decoder.last_month_day, decoder.last_time, decoder.order = seed
+    decode = adapter.decode_match
+    with gc_paused():
+        return list(zip(*(decode(match, decoder) for match in adapter.session_re.finditer(text))))
+
+def parse_large_file(path, reference=None, adapter=None, max_workers=None):
+    """Parse a dump file into SessionRecords, in parallel when it is large
+
+    The year of a row depends on every row above it. A first parallel pass
+    only collects the rows of each slice that move the year walk (see
+    scan_days); replaying those in order is
+    enough to seed each slice's decoder with the exact year it starts in, so
+    the second pass decodes all slices independently. Results are merged
+    back in file order.
+    """
+    adapter = adapter or get_adapter()
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2 or os.path.getsize(path) < PARALLEL_MIN_BYTES:
+        with open(path, 'r', encoding='utf-8') as f, gc_paused():
+            return list(iter_sessions(f, reference=reference, adapter=adapter))
+
+    reference = reference or datetime.now()
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        points = split_points(mm, workers * 4, adapter.record_start_re)
+    starts, ends = points[:-1], points[1:]
+    # Workers look the adapter up by name rather than unpickling it
+    site = repeat(adapter.name)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        decoder = adapter.decoder(reference)
+        seeds = []
+        for days in pool.map(scan_days, site, repeat(path), starts, ends):
+            seeds.append((decoder.year, decoder.last_month_day, decoder.last_time, decoder.order))
+            for text in days:
+                decoder.decode(text)
+
+        sessions = []
+        # Results are unpickled on the pool's thread, so pause GC for all of it
+        with gc_paused():
+            for columns in pool.map(parse_slice, site, repeat(path), starts, ends, repeat(reference), seeds):
+                sessions.extend(map(SessionRecord, *columns))
+        return sessions
@@ -0,0 +1,425 @@
+"""Offline stand-in for a poker site, for testing and benchmarking the scraper
+
+    python -m src.scraping.replay generate FIXTURE_DIR [--sessions N] [--per-page N]
+    python -m src.scraping.replay record FIXTURE_DIR
+    python -m src.scraping.replay serve FIXTURE_DIR [--port P] [--delay-ms D]
+    python -m src.scraping.replay bench FIXTURE_DIR [--delay-ms D] [--browser] [--capture]
+
+A fixture directory holds manifest.json, the history page and either a
+generated games.json (paged by the server) or JSON responses recorded from
+the live site.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qsl
+from .site_adapters import ClubsPokerAdapter, get_adapter
+from .json_sessions import load_json, decode_payload
+from .session_parser import iter_sessions
+from .history_loader import HistoryLoader
+from .network_capture import NetworkCapture, enable_capture, paging_from_urls
+from .http_fetcher import HistoryFetcher
+from ..utils.logging_setup import setup_logging
+
+MANIFEST = 'manifest.json'
+API_PATH = '/api/my-games'
+PAGE_PATH = '/d/'
+# Paging of generated fixtures' history endpoint
+PAGE_PARAM = 'page'
+FIRST_PAGE = 1
+# How the page names the generated game types
+GAME_NAMES = {'NLHE': "Hold'em", 'PLO': "Omaha"}
+
+# History page for generated fixtures: renders each page of the API as
+# table rows and offers "Load more" until a page comes back empty
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>My games</title></head>
+<body>
+<table id="history"><tbody></tbody></table>
+<button id="more">Load more</button>
+<script>
+let page = __FIRST_PAGE__;
+const body = document.querySelector('#history tbody');
+const more = document.getElementById('more');
+async function loadPage() {
+    const response = await fetch('__API_PATH__?page=' + page++);
+    const games = await response.json();
+    for (const game of games) {
+        const row = document.createElement('tr');
+        for (const cell of game._cells) {
+            const td = document.createElement('td');
+            td.textContent = cell;
+            row.appendChild(td);
+        }
+        body.appendChild(row);
+    }
+    if (!games.length) more.remove();
+}
+more.addEventListener('click', loadPage);
+loadPage();
+</script>
+</body></html>
+"""
+
+class ReplayAdapter(ClubsPokerAdapter):
+    """Clubs Poker format served by the replay server (not registered)"""
+    url = None
+    api_url_re = re.compile(re.escape(API_PATH))
+
+def generate(fixture_dir, sessions=1000, per_page=50, seed=0, newest=None):
+    """Write a synthetic fixture of `sessions` games, newest first"""
+    rng = random.Random(seed)
+    start = (newest or datetime.now()).replace(second=0, microsecond=0)
+    games = []
+    for _ in range(sessions):
+        start -= timedelta(minutes=rng.randint(20, 60 * 20))
+        seconds = rng.randint(60, 6 * 3600)
+        small_blind = rng.choice([0.1, 0.25, 0.5, 1.0])
+        game_type = rng.choice(['NLHE', 'PLO'])
+        hands = rng.randint(1, 400)
+        net = round(rng.uniform(-200, 200), 2) + 0.0  # No -0.0
+        hours, rest = divmod(seconds, 3600)
+        duration = f"{rest // 60}m {rest % 60}s"
+        game = {
+            'startedAt': int(start.timestamp()),
+            'durationSeconds': seconds,
+            'gameType': game_type,
+            'smallBlind': small_blind,
+            'bigBlind': small_blind * 2,
+            'handsPlayed': hands,
+            'net': net,
+            # Cells as the real page would render them, used by the fixture
+            # page; formatted here rather than by the decoder under test
+            '_cells': [
+                f"{start:%b} {start.day}, {start.hour % 12 or 12}:{start:%M} {'PM' if start.hour >= 12 else 'AM'}",
+                f"{hours}h {duration}" if hours else duration,
+                GAME_NAMES[game_type],
+                f"{small_blind:g} SC / {small_blind * 2:g} SC",
+                str(hands),
+                f"{'+' if net >= 0 else ''}{net!r} SC",
+            ],
+        }
+        games.append(game)
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    with open(os.path.join(fixture_dir, 'games.json'), 'w') as f:
+        json.dump(games, f)
+    page = PAGE_TEMPLATE.replace('__API_PATH__', API_PATH).replace('__FIRST_PAGE__', str(FIRST_PAGE))
+    with open(os.path.join(fixture_dir, 'page.html'), 'w', encoding='utf-8') as f:
+        f.write(page)
+    manifest = {
+        'page': {'path': PAGE_PATH, 'file': 'page.html'},
+        'api': {'path': API_PATH, 'file': 'games.json', 'per_page': per_page,
+                'paging': {'param': PAGE_PARAM, 'first': FIRST_PAGE, 'step': 1}},
+        'responses': [],
+    }
+    with open(os.path.join(fixture_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def record(driver, adapter, fixture_dir):
+    """Save the open history page and every captured history response
+
+    The driver must have been started with enable_capture() and the history
+    loaded (e.g. by a HistoryLoader) so the responses are in its log.
+    """
+    capture = NetworkCapture(driver, adapter)
+    os.makedirs(os.path.join(fixture_dir, 'responses'), exist_ok=True)
+    responses = []
+    urls = {}
+    # Read the log directly: drain_events() keeps only the request ids
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message.get('method') == 'Network.responseReceived':
+            url = message['params']['response']['url']
+            if adapter.api_pattern().search(url):
+                urls[message['params']['requestId']] = url
+    for number, (request_id, url) in enumerate(urls.items(), 1):
+        try:
+            body = capture.response_body(request_id)
+        except Exception:
+            continue  # Evicted from Chrome's buffer
+        name = os.path.join('responses', f"{number:04d}.json")
+        with open(os.path.join(fixture_dir, name), 'w', encoding='utf-8') as f:
+            f.write(body)
+        parts = urlsplit(url)
+        responses.append({'path': parts.path, 'query': parts.query, 'file': name})
+
+    html = driver.execute_script("return document.documentElement.outerHTML;")
+    with open(os.path.join(fixture_dir, 'page.html'), 'w', encoding='utf-8') as f:
+        f.write(html)
+    api_path = responses[0]['path'] if responses else API_PATH
+    manifest = {
+        'page': {'path': urlsplit(driver.current_url).path or '/', 'file': 'page.html'},
+        'api': {'path': api_path, 'file': None, 'per_page': 0, 'paging': paging_from_urls(urls.values()),
+                'query': responses[0]['query'] if responses else ''},
+        'responses': responses,
+    }
+    with open(os.path.join(fixture_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+class ReplayServer:
+    """Serves a fixture directory over HTTP in place of the live site
+
+    The page is served at its recorded path; history requests are answered
+    from recorded responses, or by paging the fixture's games.json, and an
+    unknown page of the history endpoint is an empty list (end of history).
+    delay_ms is added to every history response, page_delay_ms to the page.
+    """
+
+    def __init__(self, fixture_dir, port=0, delay_ms=0, page_delay_ms=0):
+        self.fixture_dir = fixture_dir
+        with open(os.path.join(fixture_dir, MANIFEST), 'r') as f:
+            self.manifest = json.load(f)
+        self.delay = delay_ms / 1000
+        self.page_delay = page_delay_ms / 1000
+        self.games = None
+        api = self.manifest['api']
+        if api.get('file'):
+            with open(os.path.join(fixture_dir, api['file']), 'r') as f:
+                self.games = json.load(f)
+        self.recorded = {
+            (response['path'], response['query']): response['file'] for response in self.manifest['responses']
+        }
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self.handler_class())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def page_url(self):
+        return self.base_url + self.manifest['page']['path']
+
+    @property
+    def api_url(self):
+        return self.base_url + self.manifest['api']['path']
+
+    def login(self):
+        """Saved login as network capture would have recorded it against this server"""
+        api = self.manifest['api']
+        paging = api.get('paging')
+        query = api.get('query', '')
+        if paging and not query:
+            query = f"{paging['param']}={paging['first']}"
+        return {'api_url': self.api_url + ('?' + query if query else ''), 'paging': paging, 'cookies': []}
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="ReplayServer", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def read(self, name):
+        with open(os.path.join(self.fixture_dir, name), 'rb') as f:
+            return f.read()
+
+    def respond(self, path, query):
+        """(status, content type, body) for a GET"""
+        if path == self.manifest['page']['path'] or path == '/':
+            time.sleep(self.page_delay)
+            return 200, 'text/html; charset=utf-8', self.read(self.manifest['page']['file'])
+
+        api = self.manifest['api']
+        if path != api['path']:
+            return 404, 'text/plain', b'not found'
+        self.requests += 1
+        time.sleep(self.delay)
+        if (path, query) in self.recorded:
+            return 200, 'application/json', self.read(self.recorded[(path, query)])
+        if self.games is not None:
+            paging = api['paging']
+            params = dict(parse_qsl(query))
+            page = (int(params.get(paging['param'], paging['first'])) - paging['first']) // paging['step']
+            per_page = api['per_page']
+            body = json.dumps(self.games[page * per_page:(page + 1) * per_page]).encode('utf-8')
+            return 200, 'application/json', body
+        return 200, 'application/json', b'[]'
+
+    def handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                status, content_type, body = server.respond(parts.path, parts.query)
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+def expected_sessions(server):
+    """SessionRecords the fixture holds, newest first"""
+    if server.games is not None:
+        return decode_payload(server.games)
+    sessions = []
+    for name in server.recorded.values():
+        sessions.extend(decode_payload(load_json(server.read(name).decode('utf-8'))))
+    return sessions
+
+def report(name, sessions, expected, seconds, extra=""):
+    status = "ok" if sessions == expected else f"MISMATCH ({len(sessions)} vs {len(expected)} expected)"
+    rate = len(sessions) / seconds if seconds else 0
+    print(f"{name:<10} {len(sessions):>7} sessions  {seconds:7.2f}s  {rate:>10,.0f}/s  {status}{extra}")
+
+def bench(fixture_dir, delay_ms=0, page_delay_ms=0, browser=False, capture=False):
+    """Measure fetch, parse and (optionally) browser loading against a fixture"""
+    server = ReplayServer(fixture_dir, delay_ms=delay_ms, page_delay_ms=page_delay_ms).start()
+    adapter = ReplayAdapter()
+    try:
+        expected = expected_sessions(server)
+        print(f"Fixture: {len(expected)} sessions, {delay_ms} ms per history response")
+
+        # Rows as page text, parsed the way a pasted or archived dump is;
+        # generated fixtures carry the page's own cells
+        if server.games is not None:
+            rows = [game['_cells'] for game in server.games]
+        else:
+            rows = [adapter.session_cells(session) for session in expected]
+        text = adapter.rows_to_text(rows)
+        started = time.perf_counter()
+        parsed = list(iter_sessions(text, reference=expected[0].start_time if expected else None, adapter=adapter))
+        report("parse", parsed, expected, time.perf_counter() - started)
+
+        server.requests = 0
+        fetcher = HistoryFetcher(adapter, server.login(), rate=0)
+        started = time.perf_counter()
+        fetched = fetcher.fetch_all()
+        report("fetch", fetched, expected, time.perf_counter() - started,
+               f"  ({server.requests} requests, {fetcher.pool.opened} connections)")
+
+        if browser:
+            bench_browser(server, adapter, expected, capture)
+    finally:
+        server.stop()
+
+def bench_browser(server, adapter, expected, capture):
+    """Load the fixture page in headless Chrome with the history loaders"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from .driver_manager import DriverManager
+
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    if capture:
+        enable_capture(options)
+    driver = webdriver.Chrome(service=Service(executable_path=DriverManager().driver_path()), options=options)
+    try:
+        started = time.perf_counter()
+        driver.get(server.page_url)
+        print(f"page load  {time.perf_counter() - started:7.2f}s")
+
+        loader_class = NetworkCapture if capture else HistoryLoader
+        loader = loader_class(driver, adapter, reference=expected[0].start_time if expected else None)
+        waits = []
+        request_more = loader.request_more
+
+        def timed_request_more():
+            wait_started = time.perf_counter()
+            result = request_more()
+            waits.append(time.perf_counter() - wait_started)
+            return result
+
+        loader.request_more = timed_request_more
+        started = time.perf_counter()
+        loaded = [session for batch in loader.batches() for session in batch]
+        waits.sort()
+        median = waits[len(waits) // 2] * 1000 if waits else 0
+        report(loader_class.__name__[:10], loaded, expected, time.perf_counter() - started,
+               f"  ({len(waits)} rounds, median wait {median:.0f} ms)")
+    finally:
+        driver.quit()
+
+def record_live(fixture_dir, site=None):
+    """Open the live site in Chrome, let the user log in, then record it"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from .driver_manager import DriverManager
+
+    adapter = get_adapter(site)
+    manager = DriverManager()
+    options = webdriver.ChromeOptions()
+    options.add_argument(f'--user-data-dir={manager.prepare_profile()}')
+    options.add_argument('--profile-directory=Default')
+    enable_capture(options)
+    driver = webdriver.Chrome(service=Service(executable_path=manager.driver_path()), options=options)
+    try:
+        driver.get(adapter.url)
+        input("Log in if needed and wait for the history to show, then press Enter...")
+        loader = HistoryLoader(driver, adapter)
+        rows = sum(len(batch) for batch in loader.batches())
+        manifest = record(driver, adapter, fixture_dir)
+        print(f"Recorded {len(manifest['responses'])} responses ({rows} rows on the page) to {fixture_dir}")
+    finally:
+        driver.quit()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m src.scraping.replay", description=__doc__.split("\n")[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate_parser = commands.add_parser('generate', help="write a synthetic fixture")
+    generate_parser.add_argument('fixture_dir')
+    generate_parser.add_argument('--sessions', type=int, default=1000)
+    generate_parser.add_argument('--per-page', type=int, default=50)
+    generate_parser.add_argument('--seed', type=int, default=0)
+
+    record_parser = commands.add_parser('record', help="record the live site into a fixture")
+    record_parser.add_argument('fixture_dir')
+    record_parser.add_argument('--site')
+
+    for name, text in (('serve', "serve a fixture until interrupted"), ('bench', "benchmark against a fixture")):
+        sub = commands.add_parser(name, help=text)
+        sub.add_argument('fixture_dir')
+        sub.add_argument('--delay-ms', type=int, default=0, help="latency added to each history response")
+        sub.add_argument('--page-delay-ms', type=int, default=0, help="latency added to the page")
+        if name == 'serve':
+            sub.add_argument('--port', type=int, default=8765)
+        else:
+            sub.add_argument('--browser', action='store_true', help="also load the page in headless Chrome")
+            sub.add_argument('--capture', action='store_true', help="read rows from network responses in Chrome")
+
+    args = parser.parse_args(argv)
+    setup_logging('replay')
+    if args.command == 'generate':
+        generate(args.fixture_dir, args.sessions, args.per_page, args.seed)
+        print(f"Wrote {args.sessions} sessions to {args.fixture_dir}")
+    elif args.command == 'record':
+        record_live(args.fixture_dir, args.site)
+    elif args.command == 'serve':
+        server = ReplayServer(args.fixture_dir, args.port, args.delay_ms, args.page_delay_ms).start()
+        print(f"Serving {args.fixture_dir} at {server.page_url} (Ctrl+C to stop)")
+        try:
+            server.thread.join()
+        except KeyboardInterrupt:
+            server.stop()
+    elif args.command == 'bench':
+        bench(args.fixture_dir, args.delay_ms, args.page_delay_ms, args.browser, args.capture)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
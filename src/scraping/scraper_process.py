@@ -0,0 +1,187 @@
+import queue
+import logging
+import multiprocessing
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+from .session_parser import SessionParser
+
+logger = logging.getLogger(__name__)
+
+# Messages from the scraper process to the GUI
+
+class StatusMessage(NamedTuple):
+    """A line for the status box"""
+    text: str
+
+class ReadyMessage(NamedTuple):
+    """The history can be loaded; auto means no login step was needed"""
+    auto: bool
+
+class PreviewMessage(NamedTuple):
+    """Summary of a scrape to verify; its raw page is sent on request"""
+    sessions: int
+    new: int  # Not in the database before this scrape
+    duplicates: int
+    newest: Optional[datetime]
+    oldest: Optional[datetime]
+    watermark: Optional[datetime]
+    head: List[str]  # First PREVIEW_EDGE_ROWS rows, formatted
+    tail: List[str]  # Last rows not in head
+    raw_lines: int
+
+class RawMessage(NamedTuple):
+    """A window of the raw page, starting at line `start`"""
+    start: int
+    text: str
+
+class ImportedMessage(NamedTuple):
+    """Outcome of importing the verified sessions"""
+    success: bool
+    message: str
+    sessions: int
+
+class SavedMessage(NamedTuple):
+    """Where the verified scrape and its audit were written"""
+    content_file: str
+    audit_file: str
+    sessions: int
+
+class ErrorMessage(NamedTuple):
+    text: str
+
+class ClosedMessage(NamedTuple):
+    """The scraper process is exiting; always the last message"""
+
+# Commands from the GUI, sent as (command, args)
+LOAD = 'load'  # Load the history and send a preview
+RETRY = 'retry'  # Re-read the page as it is now and send a preview
+RAW = 'raw'  # Send raw page lines: args (start, count)
+IMPORT = 'import'  # Import the previewed sessions
+SAVE = 'save'  # Archive the imported scrape and write its audit
+CLOSE_BROWSER = 'close_browser'
+QUIT = 'quit'
+
+def start_session(scraper, url, events):
+    """Open the site, or fetch without a browser if a saved login allows it"""
+    from .http_fetcher import LoginRequired, forget_login
+
+    if scraper.can_fetch_without_browser():
+        try:
+            events.put(StatusMessage("Fetching history with saved login...\n"))
+            scraper.prefetch()
+            return True
+        except LoginRequired:
+            forget_login(scraper.room)
+            events.put(StatusMessage("Saved login expired, opening browser to log in...\n"))
+        except Exception as e:
+            events.put(StatusMessage(f"Fetch without browser failed ({str(e)}), opening browser...\n"))
+
+    if not scraper.initialize_driver():
+        events.put(ErrorMessage("Failed to initialize browser\n"))
+        return False
+    events.put(StatusMessage("Browser initialized...\n"))
+    if not scraper.navigate_to_url(url):
+        events.put(ErrorMessage("Failed to navigate to URL\n"))
+        return False
+    events.put(StatusMessage("Navigation successful...\n"))
+    return True
+
+def run_scraper(room, url, commands, events):
+    """Scraper process entry point: open the site, then serve GUI commands"""
+    from .session_scraper import SessionScraper
+    from ..utils.logging_setup import setup_logging
+
+    setup_logging('session_scraper')
+    scraper = SessionScraper()
+    scraper.room = room
+    scraper.set_status_callback(lambda text: events.put(StatusMessage(text)))
+    try:
+        if not start_session(scraper, url, events):
+            return
+        events.put(ReadyMessage(auto=scraper.prefetched is not None))
+
+        while True:
+            command, args = commands.get()
+            if command == QUIT:
+                break
+            try:
+                if command in (LOAD, RETRY):
+                    if command == RETRY and scraper.driver is not None:
+                        content, sessions = scraper.rescrape_page()
+                    else:
+                        content, sessions = scraper.load_history()
+                    sessions = scraper.parse_preview(content, sessions)
+                    events.put(PreviewMessage(**scraper.preview_summary(sessions)))
+                elif command == RAW:
+                    events.put(RawMessage(*scraper.raw_window(*args)))
+                elif command == IMPORT:
+                    success, message = scraper.verify()
+                    events.put(ImportedMessage(success, message, len(scraper.preview[1])))
+                elif command == SAVE:
+                    content_file = scraper.save_content()
+                    sessions = scraper.parsed_sessions or []
+                    audit_file = SessionParser().write_audit(sessions)
+                    events.put(SavedMessage(content_file, audit_file, len(sessions)))
+                elif command == CLOSE_BROWSER:
+                    scraper.cleanup()
+            except Exception as e:
+                logger.error(f"Scraper command {command} failed: {e}")
+                events.put(ErrorMessage(f"Error: {str(e)}\n"))
+    except Exception as e:
+        events.put(ErrorMessage(f"Error: {str(e)}\n"))
+    finally:
+        try:
+            scraper.cleanup()
+        finally:
+            events.put(ClosedMessage())
+
+class ScraperProcess:
+    """GUI-side handle on a scraper running in its own process
+
+    Selenium, parsing and importing all happen in the child, which reports
+    through `events`; the GUI drains them with messages() from an after()
+    loop and answers with send(). A child that does not quit when asked is
+    killed, so a hung driver cannot take the app down.
+    """
+
+    def __init__(self, room, url):
+        # spawn: forking a process that already runs Tk is not safe
+        context = multiprocessing.get_context('spawn')
+        self.commands = context.Queue()
+        self.events = context.Queue()
+        self.process = context.Process(
+            target=run_scraper, args=(room, url, self.commands, self.events),
+            name="SessionScraper", daemon=True
+        )
+
+    def start(self):
+        self.process.start()
+
+    def send(self, command, *args):
+        self.commands.put((command, args))
+
+    def messages(self):
+        """Messages received so far, without blocking"""
+        received = []
+        while True:
+            try:
+                received.append(self.events.get_nowait())
+            except queue.Empty:
+                return received
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        """Ask the child to close its browser and exit"""
+        if self.process.is_alive():
+            self.send(QUIT)
+
+    def kill(self):
+        """End a child that did not stop within SCRAPER_STOP_TIMEOUT_MS"""
+        if self.process.is_alive():
+            logger.warning("Scraper process did not stop, terminating it")
+            self.process.terminate()
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
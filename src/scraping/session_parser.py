@@ -1,8 +1,116 @@
+import io
 import re
+import hashlib
+import json
+import threading
 from datetime import datetime
+from typing import NamedTuple
 import os
 from ..database.database import Database
 
+SESSION_PATTERN = (
+    r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{1,2}:\d{2} [APM]{2})\n"  # Date and time
+    r"((?:\d+h )?\d+m \d+s)\n"  # Duration
+    r"([^\n]+)\n"  # Game format (any, e.g. from a JSON history)
+    r"([\d.]+ SC / [\d.]+ SC)\n"  # Stakes
+    r"(\d+)\n"  # Hands played
+    r"([+-][\d.]+ SC)"  # Result
+)
+SESSION_RE = re.compile(SESSION_PATTERN)
+
+# Characters read per chunk when streaming a page dump
+CHUNK_SIZE = 64 * 1024
+
+# Upper bound on the length of one record; an unmatched tail shorter than this
+# may be the start of a record cut by a chunk boundary and is carried over
+MAX_RECORD_LENGTH = 256
+
+class SessionRecord(NamedTuple):
+    """One parsed session row"""
+    start_time: datetime
+    duration: str
+    game_format: str
+    stakes: str
+    hands_played: int
+    result: float
+
+    def fingerprint(self):
+        """Short stable hash identifying this session"""
+        key = (f"{self.start_time.isoformat()}|{self.duration}|{self.game_format}|"
+               f"{self.stakes}|{self.hands_played}|{self.result!r}")
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+def decode_match(match, decoder):
+    """Build a SessionRecord from a SESSION_RE match"""
+    return SessionRecord(
+        start_time=decoder.decode(match.group(1)),
+        duration=match.group(2),
+        game_format=match.group(3),
+        stakes=match.group(4),
+        hands_played=int(match.group(5)),
+        result=float(match.group(6).replace(" SC", ""))
+    )
+
+def iter_sessions(stream, chunk_size=CHUNK_SIZE, reference=None, adapter=None):
+    """Lazily yield SessionRecords from a page dump
+
+    The stream (text or binary file object) is read in fixed-size chunks and
+    only the unmatched tail of each chunk is carried into the next, so memory
+    stays flat regardless of the dump size. `reference` is when the page was
+    scraped (default: now) and anchors the year of the undated rows.
+    `adapter` is the site's SiteAdapter; without one the Clubs Poker format
+    is parsed.
+    """
+    if isinstance(stream, str):
+        stream = io.StringIO(stream)
+    elif isinstance(stream.read(0), bytes):
+        text = io.TextIOWrapper(stream, encoding='utf-8', errors='replace')
+        try:
+            yield from iter_sessions(text, chunk_size, reference, adapter)
+        finally:
+            text.detach()  # Leave the caller's file open
+        return
+
+    # Resolved once, so the per-record loop costs the same for every site
+    from .site_adapters import get_adapter
+    adapter = adapter or get_adapter()
+    finditer, decode, max_length = adapter.session_re.finditer, adapter.decode_match, adapter.max_record_length
+    decoder = adapter.decoder(reference)
+
+    buffer = ''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+        last_end = 0
+        for match in finditer(buffer):
+            yield decode(match, decoder)
+            last_end = match.end()
+        buffer = buffer[max(last_end, len(buffer) - max_length):]
+
+def stop_at_watermark(sessions, watermark):
+    """Yield sessions newer than the import watermark
+
+    Pages list sessions newest first, so iteration stops at the first row
+    older than the watermark (or the watermark row itself) and the rest of
+    the page is never parsed. Rows sharing the watermark's start time but
+    not its fingerprint still pass through to the importer's dedup.
+    """
+    if watermark is None:
+        yield from sessions
+        return
+    for session in sessions:
+        if reached_watermark(session, watermark):
+            return
+        yield session
+
+def reached_watermark(session, watermark):
+    """Whether a session is the watermark row or older than it"""
+    if session.start_time < watermark.start_time:
+        return True
+    return session.start_time == watermark.start_time and session.fingerprint() == watermark.fingerprint
+
 class SessionParser:
     def __init__(self):
         app_dir = Database.get_app_directory()
@@ -10,114 +118,22 @@ class SessionParser:
         if not os.path.exists(self.export_dir):
             os.makedirs(self.export_dir)
 
-    def parse_file(self, input_file):
-        """Parse the scraped content file and extract session data"""
-        with open(input_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Find all table entries using the format from the scraped page
-        table_entries = re.finditer(
-            r"(Jan \d{1,2}, \d{1,2}:\d{2} [APM]{2})\n"  # Date and time
-            r"((?:\d+h )?\d+m \d+s)\n"  # Duration
-            r"(Hold'em|Omaha)\n"  # Game format
-            r"([\d.]+ SC / [\d.]+ SC)\n"  # Stakes
-            r"(\d+)\n"  # Hands played
-            r"([+-][\d.]+ SC)",  # Result
-            content
-        )
-
-        parsed_sessions = []
-        for match in table_entries:
-            start_time_str = match.group(1)
-            duration = match.group(2)
-            game_format = match.group(3)
-            stakes = match.group(4)
-            hands_played = int(match.group(5))
-            result = float(match.group(6).replace(" SC", ""))
-
-            # Parse start time
-            start_time = datetime.strptime(start_time_str, "%b %d, %I:%M %p")
-            start_time = start_time.replace(year=datetime.now().year)
-
-            session = {
-                'start_time': start_time,
-                'duration': duration,
-                'game_format': game_format,
-                'stakes': stakes,
-                'hands_played': hands_played,
-                'result': result
-            }
-            parsed_sessions.append(session)
-
-        # Save parsed sessions to file
+    def write_audit(self, sessions):
+        """Write sessions to a JSONL audit file in the background
+
+        The import itself never waits on this; it only leaves a structured,
+        full-precision record of what was imported.
+        """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        output_file = os.path.join(self.export_dir, f'parsed_sessions_{timestamp}.txt')
-        
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for session in parsed_sessions:
-                f.write(f"Start time ({session['start_time'].strftime('%b %d, %I:%M %p')}) "
-                       f"Duration ({session['duration']}) "
-                       f"Format ({session['game_format']}) "
-                       f"Stake ({session['stakes']}) "
-                       f"HandsPlayed ({session['hands_played']}) "
-                       f"Result (${session['result']:.2f})\n")
+        output_file = os.path.join(self.export_dir, f'parsed_sessions_{timestamp}.jsonl')
+        sessions = list(sessions)
 
-        return output_file
+        def write():
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for session in sessions:
+                    row = session._asdict()
+                    row['start_time'] = session.start_time.isoformat()
+                    f.write(json.dumps(row) + "\n")
 
-    def get_sessions(self, parsed_file):
-        """Extract session data from parsed file"""
-        sessions = []
-        with open(parsed_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                if not line.strip():  # Skip empty lines
-                    continue
-                    
-                # Extract data using regex
-                match = re.match(
-                    r"Start time \((.*?)\) "
-                    r"Duration \((.*?)\) "
-                    r"Format \((.*?)\) "
-                    r"Stake \((.*?)\) "
-                    r"HandsPlayed \((\d+)\) "
-                    r"Result \(\$([-\d.]+)\)",
-                    line
-                )
-                
-                if match:
-                    start_time = datetime.strptime(match.group(1), "%b %d, %I:%M %p")
-                    start_time = start_time.replace(year=datetime.now().year)
-                    
-                    session = {
-                        'start_time': start_time,
-                        'duration': match.group(2),
-                        'game_format': match.group(3),
-                        'stakes': match.group(4),
-                        'hands_played': int(match.group(5)),
-                        'result': float(match.group(6))
-                    }
-                    sessions.append(session)
-        
-        return sessions
-
-    def parse_content(self, content):
-        """Parse content string and return list of session dictionaries"""
-        pattern = r"Start time \((.*?)\) Duration \((.*?)\) Format \((.*?)\) Stake \((.*?)\) HandsPlayed \((\d+)\) Result \(\$(.*?)\)"
-        sessions = []
-        
-        for match in re.finditer(pattern, content):
-            start_time_str, duration, game_format, stakes, hands_played, result = match.groups()
-            
-            start_time = datetime.strptime(start_time_str, "%b %d, %I:%M %p")
-            start_time = start_time.replace(year=datetime.now().year)
-            
-            session = {
-                'start_time': start_time,
-                'duration': duration,
-                'game_format': game_format,
-                'stakes': stakes,
-                'hands_played': int(hands_played),
-                'result': float(result)
-            }
-            sessions.append(session)
-            
-        return sessions 
\ No newline at end of file
+        threading.Thread(target=write, name="SessionAudit").start()
+        return output_file
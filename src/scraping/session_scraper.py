@@ -1,47 +1,46 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
-from webdriver_manager.chrome import ChromeDriverManager
-from ..database.database import Database
-import time
 import logging
-import os
+import re
+import json
 from datetime import datetime
-import tkinter as tk
-from tkinter import scrolledtext, messagebox
-from ..scraping.session_parser import SessionParser
+from ..scraping.dump_archive import DumpArchive
+from ..scraping.session_parser import SessionParser, iter_sessions, stop_at_watermark
+from ..scraping.site_adapters import get_adapter
+from ..scraping.history_loader import HistoryLoader
+from ..scraping.network_capture import NetworkCapture, enable_capture
+from ..scraping.driver_manager import DriverManager
+from ..scraping.browser_daemon import BrowserDaemonClient, logged_in, mark_logged_in
+from ..scraping.http_fetcher import HistoryFetcher, load_login, save_login
 from ..database.session_importer import SessionImporter
-import re
 from ..config import Config
-import platform
-import subprocess
+
+def format_session(session):
+    """One session as a line of the verification preview"""
+    return (
+        f"Start time ({session.start_time.strftime('%b %d, %I:%M %p')}) "
+        f"Duration ({session.duration}) "
+        f"Format ({session.game_format}) "
+        f"Stake ({session.stakes}) "
+        f"HandsPlayed ({session.hands_played}) "
+        f"Result ({session.result:+.2f} SC)"
+    )
 
 class SessionScraper:
     def __init__(self):
         self.driver = None
         self.page_text = None
+        self.parsed_sessions = None
+        self.room = get_adapter().name
+        self.api_endpoint = None  # (url, paging) of the history endpoint seen by network capture
+        self.prefetched = None  # (content, sessions) fetched without a browser
+        self.preview = None  # (content, sessions) shown for verification
+        self.line_starts = None  # Offsets of the preview's raw lines, built on first use
         self.verification_result = False
+        self.via_daemon = False  # Driving the background browser
         self.status_callback = None
-        self.setup_logging()
-        
-    def setup_logging(self):
-        app_dir = Database.get_app_directory()
-        log_dir = os.path.join(app_dir, "logs")
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        log_file = os.path.join(log_dir, f'session_scraper_{timestamp}.log')
-        
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger('SessionScraper')
+        self.logger = logging.getLogger(__name__)
 
     def set_status_callback(self, callback):
         """Set callback function for status updates"""
@@ -54,50 +53,30 @@ class SessionScraper:
             if self.status_callback:
                 self.status_callback("Starting driver initialization...\n")
             
-            # Force kill ALL chrome and chromedriver processes
-            subprocess.run(['pkill', '-9', 'Google Chrome'], capture_output=True)
-            subprocess.run(['pkill', '-9', 'chromedriver'], capture_output=True)
-            time.sleep(1)  # Give processes time to fully terminate
+            if Config.get_setting('browser_daemon', False) and self.connect_daemon():
+                return True
             
             options = webdriver.ChromeOptions()
             
-            # Get system-specific default Chrome path
-            system = platform.system()
-            if system == 'Darwin':  # macOS
-                user_data_dir = os.path.expanduser('~/Library/Application Support/Google/Chrome')
-            elif system == 'Windows':
-                username = os.getenv('USERNAME')
-                user_data_dir = rf'C:\Users\{username}\AppData\Local\Google\Chrome\User Data'
-            elif system == 'Linux':
-                user_data_dir = os.path.expanduser('~/.config/google-chrome')
-            else:
-                error_msg = f"Unsupported operating system: {system}"
-                self.logger.error(error_msg)
-                if self.status_callback:
-                    self.status_callback(error_msg + "\n")
-                return False
+            # Private copy of the user's login data; their own Chrome can stay open
+            manager = DriverManager()
+            user_data_dir = manager.prepare_profile()
             
             # Add essential options
             options.add_argument(f'--user-data-dir={user_data_dir}')
             options.add_argument('--profile-directory=Default')
             options.add_argument('--no-sandbox')
             options.add_argument('--disable-dev-shm-usage')
+            if Config.get_setting('network_capture', False):
+                enable_capture(options)
             
             self.logger.info("Creating Chrome driver...")
             if self.status_callback:
                 self.status_callback("Creating Chrome driver...\n")
             
-            # Clean up and recreate ChromeDriver
-            driver_cache = os.path.expanduser('~/.wdm/drivers/chromedriver')
-            if os.path.exists(driver_cache):
-                import shutil
-                shutil.rmtree(driver_cache)
-            
-            driver_path = ChromeDriverManager().install()
-            os.chmod(driver_path, 0o755)
-            
+            # Cached per Chrome major version, downloaded only after Chrome updates
             service = Service(
-                executable_path=driver_path
+                executable_path=manager.driver_path()
             )
             
             self.logger.info("Initializing WebDriver...")
@@ -127,6 +106,20 @@ class SessionScraper:
                     pass
             return False
 
+    def connect_daemon(self):
+        """Use the background browser, starting it if needed; False to launch Chrome here"""
+        try:
+            self.driver = BrowserDaemonClient().connect()
+        except Exception as e:
+            self.logger.warning(f"Background browser unavailable, launching Chrome: {str(e)}")
+            return False
+        self.via_daemon = True
+        msg = "Connected to background browser"
+        self.logger.info(msg)
+        if self.status_callback:
+            self.status_callback(msg + "\n")
+        return True
+
     def navigate_to_url(self, url):
         """Navigate to the specified URL"""
         try:
@@ -134,158 +127,196 @@ class SessionScraper:
             # Wait for page to fully load
             wait = WebDriverWait(self.driver, 10)
             wait.until(lambda driver: driver.execute_script('return document.readyState') == 'complete')
-            time.sleep(3)  # Additional wait for AJAX content
+            # Late AJAX content is waited for by the history loader after login
             return True
         except Exception as e:
             self.logger.error(f"Navigation error: {str(e)}")
             return False
 
-    def get_page_content(self):
-        """Extract page content after login and show in popup for verification"""
+    def rescrape_page(self):
+        """The page as it is now, without loading more; returns (content, None)"""
+        return self.extract_page()
+
+    def extract_page(self):
+        """Session rows from the page; returns (content, sessions)
+
+        One call to the site's rows script returns just the history table
+        cells as JSON, which are decoded directly into the sessions newer
+        than the watermark. The whole page text is only pulled if that finds
+        no rows (e.g. after a layout change), with sessions None so that it
+        is parsed instead.
+        """
+        adapter = get_adapter(self.room)
+        if adapter.rows_script:
+            try:
+                payload = self.driver.execute_script(adapter.rows_script)
+                if payload:
+                    rows = json.loads(payload)
+                    self.logger.info(f"Extracted {len(rows)} rows ({len(payload)} bytes) from the history table")
+                    watermark = SessionImporter().get_watermark(self.room)
+                    sessions = list(stop_at_watermark(adapter.decode_cells(rows, adapter.decoder()), watermark))
+                    return adapter.rows_to_text(rows), sessions
+            except Exception as e:
+                self.logger.warning(f"Row extraction failed, using page text: {str(e)}")
+        return self.driver.execute_script("return document.body.innerText;"), None
+
+    def load_history(self):
+        """Load the history down to the import watermark
+
+        With network capture on, the history is read from the site's JSON
+        responses and the table is only scraped if none were seen. Returns
+        (content, sessions). Falls back to the page as it is now
+        (extract_page) if the site has no row extraction or the loader
+        found no rows. Nothing is written until verify(), so a cancelled
+        preview imports nothing.
+        """
+        if self.prefetched is not None:
+            result, self.prefetched = self.prefetched, None
+            return result
+        if self.driver is None:
+            try:
+                return self.fetch_history()
+            except Exception as e:
+                self.logger.error(f"History fetch failed: {str(e)}")
+                return f"History fetch failed: {str(e)}", []
+        
+        adapter = get_adapter(self.room)
+        watermark = SessionImporter().get_watermark(self.room)
+        loaders = [HistoryLoader(self.driver, adapter, watermark)]
+        if Config.get_setting('network_capture', False):
+            loaders.insert(0, NetworkCapture(self.driver, adapter, watermark))
+        
+        for loader in loaders:
+            if not loader.supported():
+                continue
+            sessions = self.stream_history(loader)
+            if isinstance(loader, NetworkCapture):
+                self.api_endpoint = loader.api_endpoint() or self.api_endpoint
+            if loader.rows:
+                return loader.text(), sessions
+            self.logger.info(f"{type(loader).__name__} found no rows")
+        return self.extract_page()
+
+    def stream_history(self, loader):
+        """Collect the batches a loader yields, reporting progress; returns all its sessions"""
+        sessions = []
         try:
-            def parse_and_format_content(content):
-                # Parse the content using regex
-                table_entries = re.finditer(
-                    SESSION_PATTERN,
-                    content
-                )
-                
-                parsed_sessions = []
-                formatted_text = "=== Parsed Sessions ===\n\n"
-                
-                for match in table_entries:
-                    start_time_str = match.group(1)
-                    duration = match.group(2)
-                    game_format = match.group(3)
-                    stakes = match.group(4)
-                    hands_played = int(match.group(5))
-                    result = float(match.group(6).replace(" SC", ""))
+            for batch in loader.batches():
+                sessions.extend(batch)
+                if self.status_callback:
+                    self.status_callback(f"Loaded {len(loader.rows)} rows, {len(sessions)} new sessions...\n")
+        except Exception as e:
+            self.logger.warning(f"Automatic history loading stopped: {str(e)}")
+        return sessions
 
-                    # Parse start time
-                    start_time = datetime.strptime(start_time_str, "%b %d, %I:%M %p")
-                    start_time = start_time.replace(year=datetime.now().year)
-                    
-                    session = {
-                        'start_time': start_time,
-                        'duration': duration,
-                        'game_format': game_format,
-                        'stakes': stakes,
-                        'hands_played': hands_played,
-                        'result': result
-                    }
-                    parsed_sessions.append(session)
-                    
-                    formatted_text += (
-                        f"Start time ({start_time.strftime('%b %d, %I:%M %p')}) "
-                        f"Duration ({duration}) "
-                        f"Format ({game_format}) "
-                        f"Stake ({stakes}) "
-                        f"HandsPlayed ({hands_played}) "
-                        f"Result ({result:+.2f} SC)\n"
-                    )
-                
-                formatted_text += "\n=== Raw Content ===\n\n" + content
-                return formatted_text, parsed_sessions
-            
-            def show_verification_window(content):
-                popup = tk.Tk()
-                popup.title("Scraped Content Verification")
-                popup.geometry("800x600")
-                
-                # Add warning text at the top
-                warning_label = tk.Label(
-                    popup,
-                    text="⚠️ WARNING: You must be logged into the poker site in Google Chrome before proceeding! ⚠️",
-                    font=("TkDefaultFont", 10, "bold"),
-                    wraplength=700
-                )
-                warning_label.pack(pady=(10,0))
-                
-                # Add scrollable text area
-                text_area = scrolledtext.ScrolledText(popup, width=80, height=30)
-                text_area.pack(padx=10, pady=10, expand=True, fill='both')
-                
-                # Parse and show formatted content
-                formatted_content, parsed_sessions = parse_and_format_content(content)
-                text_area.insert(tk.END, formatted_content)
-                
-                # Button functions
-                def verify():
-                    try:
-                        importer = SessionImporter()
-                        success, message = importer.import_sessions(parsed_sessions)
-                        if success:
-                            messagebox.showinfo("Success", f"Successfully imported {len(parsed_sessions)} sessions")
-                            self.verification_result = True
-                            self.page_text = content  # Save the raw content
-                            popup.destroy()
-                        else:
-                            messagebox.showerror("Import Error", f"Failed to import sessions: {message}")
-                    except Exception as e:
-                        messagebox.showerror("Error", f"Error during import: {str(e)}")
-                
-                def new_scrape():
-                    popup.destroy()
-                    new_content = self.driver.execute_script("return document.body.innerText;")
-                    show_verification_window(new_content)
-                
-                def retry():
-                    popup.destroy()
-                    new_content = self.driver.execute_script("return document.body.innerText;")
-                    show_verification_window(new_content)
-                
-                def close_browser():
-                    if messagebox.askyesno("Confirm Close", "Are you sure you want to close the browser?"):
-                        self.driver.quit()
-                        popup.destroy()
-                
-                def cancel():
-                    if messagebox.askyesno("Confirm Cancel", "Are you sure you want to cancel? This will close the browser."):
-                        self.verification_result = False
-                        self.page_text = None
-                        self.driver.quit()
-                        popup.destroy()
-                
-                # Button frame
-                button_frame = tk.Frame(popup)
-                button_frame.pack(pady=10)
-                
-                # Add buttons with updated text
-                tk.Button(button_frame, text="Continue after session history loaded", command=verify).pack(side=tk.LEFT, padx=5)
-                tk.Button(button_frame, text="New Scrape", command=new_scrape).pack(side=tk.LEFT, padx=5)
-                tk.Button(button_frame, text="Retry Current", command=retry).pack(side=tk.LEFT, padx=5)
-                tk.Button(button_frame, text="Close Browser", command=close_browser).pack(side=tk.LEFT, padx=5)
-                tk.Button(button_frame, text="Cancel", command=cancel).pack(side=tk.LEFT, padx=5)
-                
-                popup.mainloop()
-            
-            # Initial scrape
-            self.verification_result = False
-            initial_content = self.driver.execute_script("return document.body.innerText;")
-            show_verification_window(initial_content)
-            
-            return self.verification_result
+    def can_fetch_without_browser(self):
+        """Whether browserless fetch is on and a capture recorded the history endpoint"""
+        login = load_login(self.room)
+        return Config.get_setting('browserless_fetch', False) and login is not None and bool(login.get('api_url'))
+
+    def fetch_history(self):
+        """Fetch the history over HTTP with the saved login; returns (content, sessions)
+
+        Like load_history, nothing is written until verify(). Raises
+        LoginRequired if the saved cookies were refused.
+        """
+        adapter = get_adapter(self.room)
+        fetcher = HistoryFetcher(adapter, load_login(self.room))
+        fetched = []
+        
+        def on_batch(batch):
+            fetched.extend(batch)
+            if self.status_callback:
+                self.status_callback(f"Fetched {len(fetcher.rows)} rows, {len(fetched)} new sessions...\n")
+        
+        sessions = fetcher.fetch_all(SessionImporter().get_watermark(self.room), on_batch)
+        return fetcher.text(), sessions
+
+    def prefetch(self):
+        """Fetch without a browser ahead of the verification window"""
+        self.prefetched = self.fetch_history()
+
+    def save_login(self):
+        """Keep the browser's cookies so later imports can skip the browser"""
+        if self.driver is None or not Config.get_setting('browserless_fetch', False):
+            return
+        try:
+            url, paging = self.api_endpoint or (None, None)
+            save_login(self.room, self.driver.get_cookies(), url, paging)
         except Exception as e:
-            self.logger.error(f"Content extraction error: {str(e)}")
-            return False
+            self.logger.warning(f"Could not save login: {str(e)}")
+
+    def parse_preview(self, content, sessions=None):
+        """Sessions to verify from a scrape, keeping the scrape for verify()
+
+        Only sessions newer than the last import for this room are read.
+        """
+        if sessions is None:
+            watermark = SessionImporter().get_watermark(self.room)
+            sessions = list(stop_at_watermark(iter_sessions(content, adapter=get_adapter(self.room)), watermark))
+        self.preview = (content, sessions)
+        self.line_starts = None
+        return sessions
+
+    def preview_summary(self, sessions):
+        """Counts, date span and first and last rows of the previewed scrape
+
+        Costs the same to show however long the history is; the raw page
+        stays here and is read in windows with raw_window().
+        """
+        importer = SessionImporter()
+        new = importer.count_new(sessions)
+        watermark = importer.get_watermark(self.room)
+        edge = Config.PREVIEW_EDGE_ROWS
+        starts = [session.start_time for session in sessions]
+        return {
+            'sessions': len(sessions),
+            'new': new,
+            'duplicates': len(sessions) - new,
+            'newest': max(starts) if starts else None,
+            'oldest': min(starts) if starts else None,
+            'watermark': watermark.start_time if watermark else None,
+            'head': [format_session(session) for session in sessions[:edge]],
+            'tail': [format_session(session) for session in sessions[max(edge, len(sessions) - edge):]],
+            'raw_lines': self.preview[0].count("\n") + 1,
+        }
+
+    def raw_window(self, start, count):
+        """Lines [start, start + count) of the previewed raw page"""
+        content = self.preview[0]
+        if self.line_starts is None:
+            self.line_starts = [0] + [match.end() for match in re.finditer("\n", content)]
+        lines = self.line_starts
+        start = max(0, min(start, len(lines) - 1))
+        end = start + count
+        return start, content[lines[start]:lines[end] if end < len(lines) else len(content)]
+
+    def verify(self):
+        """Import the previewed sessions and advance the watermark; returns (success, message)"""
+        content, sessions = self.preview
+        success, message = SessionImporter().import_sessions(sessions, room=self.room)
+        if success:
+            self.verification_result = True
+            self.page_text = content  # Save the raw content
+            self.parsed_sessions = sessions
+            self.save_login()
+            if self.via_daemon and sessions and not logged_in():
+                # The page showed history, so the daemon's profile is logged in
+                mark_logged_in()
+        return success, message
 
     def save_content(self):
-        """Save the scraped content to file"""
+        """Archive the scraped content; returns the archive path"""
         if not self.page_text:
             return None
-            
-        app_dir = Database.get_app_directory()
-        output_dir = os.path.join(app_dir, "DB_Import_Files")
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
-        
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = os.path.join(output_dir, f'page_content_{timestamp}.txt')
         
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(self.page_text)
-            return filename
+            archive = DumpArchive()
+            digest = archive.store_text(self.page_text, source=f"scrape {datetime.now().strftime('%Y%m%d_%H%M%S')}")
+            if self.verification_result:
+                sessions = self.parsed_sessions or []
+                archive.mark_ingested(digest, len(sessions), archive.span(sessions))
+            return archive.path_for(digest)
         except Exception as e:
             self.logger.error(f"Save error: {str(e)}")
             return None
@@ -294,13 +325,4 @@ class SessionScraper:
         """Close browser and cleanup"""
         if self.driver:
             self.driver.quit()
-            self.driver = None 
-
-SESSION_PATTERN = (
-    r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{1,2}:\d{2} [APM]{2})\n"  # Date and time
-    r"((?:\d+h )?\d+m \d+s)\n"  # Duration
-    r"(Hold'em|Omaha)\n"  # Game format
-    r"([\d.]+ SC / [\d.]+ SC)\n"  # Stakes
-    r"(\d+)\n"  # Hands played
-    r"([+-][\d.]+ SC)"  # Result
-) 
\ No newline at end of file
+            self.driver = None
@@ -0,0 +1,190 @@
+import re
+import logging
+from .session_parser import SESSION_PATTERN, SESSION_RE, MAX_RECORD_LENGTH, SessionRecord, decode_match
+from .json_sessions import load_json, decode_payload, format_amount
+from ..utils.time_utils import StartTimeDecoder
+from ..config import Config
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the start of a dump to recognise its site
+SNIFF_BYTES = 4096
+
+class SiteAdapter:
+    """Session history format of one poker site
+
+    Subclasses provide precompiled patterns for a record and for the first
+    line of a record, a decoder for the site's start times and a cheap
+    sniff() on the first few KB of a dump. Register them with @register.
+    """
+
+    name = None
+    url = None
+    session_re = None  # One record; groups feed decode_match
+    session_bytes_re = None  # Same pattern over raw bytes (\n or \r\n line ends), for mmap scans
+    record_start_re = None  # Raw bytes, MULTILINE: first line of a record
+    max_record_length = MAX_RECORD_LENGTH
+    rows_script = None  # In-page JS returning a JSON array of row cells after arguments[0] rows, or null
+    api_url_re = None  # Default for URLs of the site's JSON history responses; see api_pattern()
+
+    # Reveals older history: clicks a visible "load/show more" control, else
+    # scrolls the last row (and the page) into view
+    load_more_script = r"""
+        const more = Array.from(document.querySelectorAll('button, a, [role="button"]')).find(
+            el => /^\s*(load|show) more\b/i.test(el.textContent) && el.offsetParent !== null);
+        if (more) {
+            more.click();
+            return 'click';
+        }
+        const rows = document.querySelectorAll('tr, [role="row"]');
+        if (rows.length) rows[rows.length - 1].scrollIntoView({block: 'end'});
+        window.scrollTo(0, document.documentElement.scrollHeight);
+        return 'scroll';
+    """
+
+    def sniff(self, prefix):
+        """Whether the first bytes of a dump look like this site's format"""
+        return self.record_start_re.search(prefix) is not None
+
+    def decoder(self, reference=None):
+        """Stateful start time decoder for one dump
+
+        Must expose year, last_month_day, last_time and order like
+        StartTimeDecoder, which the parallel parser seeds to start decoding
+        mid-file.
+        """
+        return StartTimeDecoder(reference)
+
+    # SessionRecord from a session_re match and the dump's decoder; the
+    # default reads six groups in page order, like SESSION_RE
+    decode_match = staticmethod(decode_match)
+
+    def day_of(self, start_text):
+        """Part of a start time naming the day, used to collapse same-day rows"""
+        return start_text
+
+    def decode_cells(self, rows, decoder):
+        """Yield SessionRecords straight from row cells in session_cells() order
+
+        Rows whose cells do not decode are skipped, like text session_re
+        does not match.
+        """
+        for row in rows:
+            try:
+                yield SessionRecord(
+                    start_time=decoder.decode(row[0]),
+                    duration=row[1],
+                    game_format=row[2],
+                    stakes=row[3],
+                    hands_played=int(row[4]),
+                    result=float(row[5].replace(" SC", ""))
+                )
+            except (IndexError, KeyError, ValueError):
+                logger.debug(f"Skipped a row that is not a session: {row}")
+
+    def rows_to_text(self, rows):
+        """Render extracted rows in the page text format session_re parses"""
+        return "\n".join("\n".join(row) for row in rows)
+
+    def api_pattern(self):
+        """Regex for the URLs of history responses
+
+        The 'history_api_patterns' setting ({site name: regex}) overrides
+        api_url_re, which is only a guess at the site's undocumented API.
+        NetworkCapture logs the JSON responses it saw when none matched.
+        """
+        pattern = (Config.get_setting('history_api_patterns', {}) or {}).get(self.name)
+        return re.compile(pattern, re.IGNORECASE) if pattern else self.api_url_re
+
+    def decode_api(self, body):
+        """SessionRecords in one history response body, newest first"""
+        return decode_payload(load_json(body))
+
+    def session_cells(self, session):
+        """A SessionRecord as the row cells the page shows"""
+        start = session.start_time
+        result = format_amount(session.result)
+        return [
+            f"{start:%b} {start.day}, {start.hour % 12 or 12}:{start:%M %p}",
+            session.duration,
+            session.game_format,
+            session.stakes,
+            str(session.hands_played),
+            f"{result if result.startswith('-') else '+' + result} SC"
+        ]
+
+class ClubsPokerAdapter(SiteAdapter):
+    name = "Clubs Poker"
+    url = "https://play.clubspoker.com/d/?my-games"
+    session_re = SESSION_RE
+    # Files are scanned undecoded, so these also accept Windows line ends
+    session_bytes_re = re.compile(SESSION_PATTERN.replace(r"\n", r"\r?\n").encode('ascii'))
+    record_start_re = re.compile(
+        rb"^(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{1,2}:\d{2} [APM]{2}\r?\n",
+        re.MULTILINE
+    )
+
+    # Walks the history table and returns only the six cells of each session
+    # row not read yet; textContent avoids the layout pass innerText forces
+    rows_script = r"""
+        const date = /^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{1,2}:\d{2} [AP]M$/;
+        const skip = arguments[0] || 0;
+        const rows = [];
+        let seen = 0;
+        for (const row of document.querySelectorAll('tr, [role="row"]')) {
+            const cells = row.children;
+            if (cells.length < 6 || !date.test(cells[0].textContent.trim())) continue;
+            if (seen++ < skip) continue;
+            const out = [];
+            for (let i = 0; i < 6; i++) out.push(cells[i].textContent.trim());
+            rows.push(out);
+        }
+        return rows.length ? JSON.stringify(rows) : null;
+    """
+
+    # Guess at the "my games" page's history API, not confirmed by a
+    # capture; the history_api_patterns setting overrides it
+    api_url_re = re.compile(r'clubspoker\.com/.*(?:my-?games|game-?history|/games\b)', re.IGNORECASE)
+
+    def sniff(self, prefix):
+        return b'clubspoker' in prefix.lower() or self.session_bytes_re.search(prefix) is not None
+
+    def day_of(self, start_text):
+        return start_text[:start_text.index(',')]
+
+ADAPTERS = {}
+
+def register(adapter_class):
+    """Class decorator adding a SiteAdapter to the registry"""
+    ADAPTERS[adapter_class.name] = adapter_class()
+    return adapter_class
+
+register(ClubsPokerAdapter)
+
+DEFAULT_ADAPTER = ADAPTERS[ClubsPokerAdapter.name]
+
+def get_adapter(name=None):
+    """Adapter registered under name (the default site if name is None)"""
+    if name is None:
+        return DEFAULT_ADAPTER
+    return ADAPTERS[name]
+
+def site_names():
+    return list(ADAPTERS)
+
+def detect_adapter(prefix):
+    """Adapter whose format matches the first bytes of a dump
+
+    Falls back to the default site, so an unrecognised file still parses
+    the way it always did.
+    """
+    for adapter in ADAPTERS.values():
+        if adapter.sniff(prefix):
+            return adapter
+    logger.info(f"No site recognised in dump prefix, assuming {DEFAULT_ADAPTER.name}")
+    return DEFAULT_ADAPTER
+
+def detect_file(path):
+    """Adapter for a dump file, reading only its first SNIFF_BYTES"""
+    with open(path, 'rb') as f:
+        return detect_adapter(f.read(SNIFF_BYTES))
@@ -0,0 +1,63 @@
+import os
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from ..config import Config
+
+FORMAT = '%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s'
+
+_listener = None
+
+def log_levels():
+    """Level per logger name ('' is the root): Config.LOG_LEVELS updated by the 'log_levels' setting"""
+    levels = dict(Config.LOG_LEVELS)
+    levels.update(Config.get_setting('log_levels', {}) or {})
+    return levels
+
+def setup_logging(name='poker_tracker'):
+    """Send this process's logging through a queue to a background writer
+
+    Loggers only put records on an in-memory queue; a QueueListener thread
+    formats them into LOG_DIR/<name>.log, rotated at LOG_MAX_BYTES, and
+    echoes LOG_CONSOLE_LEVEL and above to stderr. Each process calls this
+    once with its own name, since rotating one file from several processes
+    is not safe. Later calls are no-ops.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    Config.ensure_directories()
+    formatter = logging.Formatter(FORMAT)
+    file_handler = logging.handlers.RotatingFileHandler(
+        os.path.join(Config.LOG_DIR, f'{name}.log'),
+        maxBytes=Config.LOG_MAX_BYTES, backupCount=Config.LOG_BACKUP_COUNT, encoding='utf-8'
+    )
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(Config.LOG_CONSOLE_LEVEL)
+    console_handler.setFormatter(formatter)
+
+    records = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(records))
+    for logger_name, level in log_levels().items():
+        logging.getLogger(logger_name or None).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(records, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+def shutdown_logging():
+    """Write out queued records and close the log file"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -2,6 +2,8 @@ import numpy as np
 from typing import List, Tuple
 import logging
 
+logger = logging.getLogger(__name__)
+
 class StatsCalculator:
     @staticmethod
     def calculate_variance_stats(results_bb: List[float], n_hands: int) -> Tuple[float, float, float]:
@@ -71,15 +73,11 @@ class StatsCalculator:
         # Convert BB to buyins (1 buyin = 100BB) and round up
         recommended_buyins = int(np.ceil(required_bb))
         
-        # For debugging
-        logger = logging.getLogger(__name__)
-        logger.info(f"""
-        Bankroll calculation:
-        - Input std_dev (BB/100): {std_dev}
-        - Input bb_per_100: {bb_per_100}
-        - z_score: {z_score}
-        - required_bb: {required_bb}
-        - recommended_buyins: {recommended_buyins}
-        """)
+        # Called on every stats refresh; only format the breakdown when it is logged
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Bankroll calculation: std_dev={std_dev}, bb_per_100={bb_per_100}, z_score={z_score}, "
+                f"required_bb={required_bb}, recommended_buyins={recommended_buyins}"
+            )
         
         return max(recommended_buyins, 20), ""  # Minimum 20 buyins 
\ No newline at end of file
@@ -0,0 +1,59 @@
+from bisect import bisect_left, bisect_right
+from .time_utils import parse_duration
+
+class TimeIndex:
+    """Prefix sums of profit, hands and hours ordered by session start time
+
+    Totals for any [start, end] window are the difference of two prefix sums,
+    located with two binary searches, so range queries are O(log n).
+    """
+
+    def __init__(self):
+        self.times = []
+        self.cum_profit = [0.0]
+        self.cum_hands = [0]
+        self.cum_hours = [0.0]
+
+    @classmethod
+    def from_sessions(cls, sessions):
+        """Build an index from Session rows (sorted by start time if needed)"""
+        index = cls()
+        for s in sorted(sessions, key=lambda s: s.start_time):
+            index.append(
+                s.start_time,
+                s.result,
+                s.hands_played,
+                parse_duration(s.duration) if s.duration else 0
+            )
+        return index
+
+    def __len__(self):
+        return len(self.times)
+
+    def append(self, start_time, result, hands, hours):
+        """Add a session that starts at or after the newest indexed session"""
+        if self.times and start_time < self.times[-1]:
+            raise ValueError("Sessions must be appended in start time order")
+        self.times.append(start_time)
+        self.cum_profit.append(self.cum_profit[-1] + (float(result) if result else 0))
+        self.cum_hands.append(self.cum_hands[-1] + (hands or 0))
+        self.cum_hours.append(self.cum_hours[-1] + (hours or 0))
+
+    def span(self, start=None, end=None):
+        """Return (lo, hi) positions of sessions with start <= start_time <= end"""
+        lo = bisect_left(self.times, start) if start is not None else 0
+        hi = bisect_right(self.times, end) if end is not None else len(self.times)
+        return lo, max(lo, hi)
+
+    def range_totals(self, start=None, end=None):
+        """Return (profit, hands, hours) for sessions in [start, end]"""
+        lo, hi = self.span(start, end)
+        return (
+            self.cum_profit[hi] - self.cum_profit[lo],
+            self.cum_hands[hi] - self.cum_hands[lo],
+            self.cum_hours[hi] - self.cum_hours[lo]
+        )
+
+    def running_balances(self):
+        """Cumulative profit after each session, oldest first"""
+        return self.cum_profit[1:]
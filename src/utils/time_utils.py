@@ -1,3 +1,12 @@
+import calendar
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+
 def parse_duration(duration_str):
     """Convert duration string like '2h 45m 41s' to hours"""
     hours = 0
@@ -13,4 +22,94 @@ def parse_duration(duration_str):
         elif part.endswith('s'):
             seconds = float(part[:-1])
     
-    return hours + (minutes / 60) + (seconds / 3600) 
\ No newline at end of file
+    return hours + (minutes / 60) + (seconds / 3600)
+
+@lru_cache(maxsize=1024)
+def _month_day(date_prefix):
+    """Decode a date prefix like 'Jan 5' into (month, day)"""
+    return MONTHS[date_prefix[:3]], int(date_prefix[4:])
+
+class StartTimeDecoder:
+    """Decode session start times like 'Jan 5, 1:23 PM' into datetimes
+
+    A hand-rolled tokenizer for the site's fixed format replaces
+    datetime.strptime, and date prefixes are cached since sessions cluster
+    on the same days. The site omits the year, so it starts from the
+    reference time (a first row that would lie in the future belongs to the
+    year before) and walks the list newest first, the site's order: the
+    year steps back whenever the date jumps forward. Only a list that
+    cannot be newest first, where the first two distinct times fall on one
+    day and go forward, is read oldest first, the year stepping on whenever
+    the date jumps back; a date that would then lie after the reference
+    goes in the year before instead.
+
+    year, last_month_day, last_time and order hold the walk's state, which
+    the parallel parser seeds to start decoding mid-file.
+    """
+
+    def __init__(self, reference=None):
+        self.reference = reference or datetime.now()
+        self.year = None
+        self.last_month_day = None
+        self.last_time = None
+        self.order = None  # 'newest' or 'oldest' first, once two times differ
+
+    def decode(self, text):
+        comma = text.index(',', 4)
+        month, day = _month_day(text[:comma])
+        colon = text.index(':', comma)
+        hour = int(text[comma + 2:colon])
+        minute = int(text[colon + 1:colon + 3])
+        if text[colon + 4] == 'P':
+            if hour != 12:
+                hour += 12
+        elif hour == 12:
+            hour = 0
+
+        month_day = (month, day)
+        if self.year is None:
+            self.year = self.reference.year
+            if self.in_future(month, day, hour, minute):
+                self.year -= 1
+        elif month_day != self.last_month_day:
+            if self.order is None:
+                self.order = 'newest'
+            if self.order == 'newest':
+                if month_day > self.last_month_day:
+                    self.year -= 1
+            else:
+                if month_day < self.last_month_day:
+                    self.year += 1
+                if self.after_reference(month, day):
+                    self.year -= 1
+        elif self.order is None and (hour, minute) != self.last_time:
+            # Later times on one day can only mean oldest first
+            self.order = 'oldest' if (hour, minute) > self.last_time else 'newest'
+        self.last_month_day = month_day
+        self.last_time = (hour, minute)
+
+        try:
+            return datetime(self.year, month, day, hour, minute)
+        except ValueError:
+            if month == 2 and day == 29:
+                # Feb 29 only exists in leap years, so it is older than it looks
+                year = self.year - 1
+                while not calendar.isleap(year):
+                    year -= 1
+                if self.order != 'oldest':
+                    # Rows below it are older still
+                    self.year = year
+                return datetime(year, month, day, hour, minute)
+            raise
+
+    def in_future(self, month, day, hour, minute):
+        """Whether the time of year lies after the reference (plus a day of slack)"""
+        limit = self.reference + timedelta(days=1)
+        if limit.year != self.reference.year:
+            return False
+        return (month, day, hour, minute) > (limit.month, limit.day, limit.hour, limit.minute)
+
+    def after_reference(self, month, day):
+        """Whether the date in the current year lies after the reference (plus a day of slack)"""
+        limit = self.reference + timedelta(days=1)
+        return (self.year, month, day) > (limit.year, limit.month, limit.day)
@@ -0,0 +1,21 @@
+import os
+import pytest
+from src.config import Config
+from src.database.database import Database
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    """Point Config (database, logs, archive, settings) at an empty directory"""
+    monkeypatch.setattr(Config, 'APP_DIR', str(tmp_path))
+    monkeypatch.setattr(Config, 'LOG_DIR', str(tmp_path / 'logs'))
+    monkeypatch.setattr(Config, 'IMPORT_DIR', str(tmp_path / 'DB_Import_Files'))
+    monkeypatch.setattr(Config, 'BACKUP_DIR', str(tmp_path / 'backups'))
+    monkeypatch.setattr(Config, 'CONFIG_FILE', str(tmp_path / 'config.json'))
+    monkeypatch.setattr(Config, '_settings', {})
+    Config.ensure_directories()
+    yield str(tmp_path)
+    Database.set_memory_mirror(False)
+
+@pytest.fixture
+def fixtures_dir():
+    return os.path.join(os.path.dirname(__file__), 'fixtures')
@@ -0,0 +1,41 @@
+"""Synthetic session histories shared by the tests and the benchmarks"""
+import random
+from datetime import datetime, timedelta
+from src.scraping.session_parser import SessionRecord
+
+def synthetic_sessions(count, seed=0, newest=None):
+    """SessionRecords newest first, spaced like a real history"""
+    rng = random.Random(seed)
+    start = (newest or datetime(2024, 12, 31, 23, 0))
+    sessions = []
+    for _ in range(count):
+        start -= timedelta(minutes=rng.randint(20, 60 * 20))
+        seconds = rng.randint(60, 6 * 3600)
+        small_blind = rng.choice(['0.1', '0.25', '0.5', '1'])
+        big_blind = {'0.1': '0.2', '0.25': '0.5', '0.5': '1', '1': '2'}[small_blind]
+        sessions.append(SessionRecord(
+            start_time=start,
+            duration=f"{seconds // 3600}h {seconds % 3600 // 60}m {seconds % 60}s",
+            game_format=rng.choice(["Hold'em", 'Omaha']),
+            stakes=f"{small_blind} SC / {big_blind} SC",
+            hands_played=rng.randint(1, 400),
+            result=round(rng.uniform(-200, 200), 2) + 0.0  # No -0.0, which pages never show
+        ))
+    return sessions
+
+def dump_text(sessions):
+    """Sessions as the history page's innerText, formatted independently of the parser"""
+    lines = []
+    for session in sessions:
+        start = session.start_time
+        hour = start.hour % 12 or 12
+        sign = '+' if session.result >= 0 else ''
+        lines += [
+            f"{start:%b} {start.day}, {hour}:{start.minute:02d} {'PM' if start.hour >= 12 else 'AM'}",
+            session.duration,
+            session.game_format,
+            session.stakes,
+            str(session.hands_played),
+            f"{sign}{session.result!r} SC",
+        ]
+    return "\n".join(lines) + "\n"
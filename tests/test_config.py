@@ -0,0 +1,19 @@
+import json
+import threading
+from src.config import Config
+
+def test_settings_saved_from_several_threads(app_dir):
+    def save(thread):
+        for i in range(50):
+            Config.set_setting(f"key_{thread}_{i}", {'thread': thread, 'i': i})
+
+    threads = [threading.Thread(target=save, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(Config.CONFIG_FILE, 'r') as f:
+        saved = json.load(f)
+    assert len(saved) == 200
+    assert saved['key_3_49'] == {'thread': 3, 'i': 49}
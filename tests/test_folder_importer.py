@@ -0,0 +1,33 @@
+import os
+from datetime import datetime
+from src.scraping.folder_importer import FolderImporter
+from synthetic import synthetic_sessions, dump_text
+
+def write_dumps(folder, count):
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f'dump_{i}.txt')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(dump_text(synthetic_sessions(20, seed=i, newest=datetime(2024, 12, 31 - i))))
+        os.utime(path, (datetime(2025, 1, 1).timestamp(),) * 2)
+        paths.append(path)
+    return paths
+
+def run(importer):
+    importer.run()
+    return list(iter(importer.events.get, None))
+
+def test_imports_each_file_once(app_dir, tmp_path):
+    paths = write_dumps(str(tmp_path), 3)
+    events = run(FolderImporter(paths, max_workers=2))
+    assert sorted((e.path, e.status, e.sessions) for e in events) == [(p, 'imported', 20) for p in paths]
+    events = run(FolderImporter(paths, max_workers=2))
+    assert [e.status for e in events] == ['skipped'] * 3
+
+def test_cancel_drops_queued_files(app_dir, tmp_path):
+    paths = write_dumps(str(tmp_path), 6)
+    importer = FolderImporter(paths, max_workers=1)
+    importer.cancel()
+    events = run(importer)
+    assert len(events) < len(paths)
+    assert all(e.path for e in events)
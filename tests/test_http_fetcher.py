@@ -0,0 +1,69 @@
+import threading
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pytest
+from src.database.models import ImportWatermark
+from src.scraping.http_fetcher import HistoryFetcher, LoginRequired
+from src.scraping.network_capture import paging_from_urls
+from src.scraping.replay import ReplayServer, ReplayAdapter, generate, expected_sessions
+
+@pytest.fixture
+def server(tmp_path):
+    generate(str(tmp_path), sessions=230, per_page=20, newest=datetime(2025, 1, 3, 10, 0))
+    server = ReplayServer(str(tmp_path)).start()
+    yield server
+    server.stop()
+
+def test_fetches_every_page(server):
+    fetcher = HistoryFetcher(ReplayAdapter(), server.login(), concurrency=3, rate=0)
+    assert fetcher.fetch_all() == expected_sessions(server)
+    assert fetcher.pool.opened <= 3
+
+def test_stops_at_the_watermark(server):
+    expected = expected_sessions(server)
+    newest_imported = expected[45]
+    watermark = ImportWatermark(start_time=newest_imported.start_time, fingerprint=newest_imported.fingerprint())
+    batches = []
+    fetcher = HistoryFetcher(ReplayAdapter(), server.login(), concurrency=2, rate=0)
+    assert fetcher.fetch_all(watermark, batches.append) == expected[:45]
+    assert [len(batch) for batch in batches] == [20, 20, 5]
+    assert fetcher.reached_watermark
+    assert server.requests <= 5
+
+def test_without_recorded_paging_only_the_recorded_url_is_fetched(server):
+    login = server.login()
+    login['paging'] = None
+    assert HistoryFetcher(ReplayAdapter(), login, rate=0).fetch_all() == expected_sessions(server)[:20]
+    assert server.requests == 1
+
+def test_needs_a_recorded_endpoint():
+    with pytest.raises(ValueError):
+        HistoryFetcher(ReplayAdapter(), {'cookies': []})
+
+def test_refused_login():
+    class Refuse(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(401)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Refuse)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    try:
+        login = {'api_url': f"http://127.0.0.1:{httpd.server_address[1]}/api/games?page=1", 'cookies': []}
+        with pytest.raises(LoginRequired):
+            HistoryFetcher(ReplayAdapter(), login, rate=0).fetch_all()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+def test_paging_from_captured_urls():
+    assert paging_from_urls([
+        'https://site/api/games?limit=50&offset=0', 'https://site/api/games?limit=50&offset=50',
+        'https://site/api/games?limit=50&offset=100',
+    ]) == {'param': 'offset', 'first': 0, 'step': 50}
+    assert paging_from_urls(['https://site/api/games?page=1']) is None
+    assert paging_from_urls(['https://site/api/games?page=1', 'https://site/api/other?page=2']) is None
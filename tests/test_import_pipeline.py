@@ -0,0 +1,88 @@
+import pytest
+from src.config import Config
+from src.database.database import Database
+from src.database.models import Session
+from src.database.session_importer import SessionImporter
+from src.scraping import import_pipeline
+from src.scraping.import_pipeline import ImportPipeline, PipelineResult
+from synthetic import synthetic_sessions, dump_text
+from test_session_parser import SCRAPED_AT
+
+ROOM = "Clubs Poker"
+SESSIONS = synthetic_sessions(1000, newest=SCRAPED_AT)
+
+@pytest.fixture
+def dump(app_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, 'PIPELINE_BATCH_ROWS', 100)
+    monkeypatch.setattr(Config, 'PIPELINE_COMMIT_ROWS', 300)
+    path = tmp_path / 'history.txt'
+    path.write_text(dump_text(SESSIONS), encoding='utf-8')
+    return str(path)
+
+def run(pipeline):
+    pipeline.start()
+    pipeline.thread.join()
+    events = []
+    while not pipeline.events.empty():
+        events.append(pipeline.events.get())
+    assert isinstance(events[-1], PipelineResult)
+    return events[-1]
+
+def stored():
+    session = Database().get_session()
+    try:
+        return session.query(Session).count()
+    finally:
+        session.close()
+
+def stop_in_batch(monkeypatch, number, stop):
+    """Make write_batch call stop() once it has written batch `number`"""
+    write_batch = SessionImporter.write_batch
+    calls = []
+
+    def patched(self, session, batch, room=None):
+        result = write_batch(self, session, batch, room)
+        calls.append(1)
+        if len(calls) == number:
+            stop()
+        return result
+
+    monkeypatch.setattr(SessionImporter, 'write_batch', patched)
+
+@pytest.mark.parametrize('parallel', [False, True])
+def test_complete_run(dump, monkeypatch, parallel):
+    if parallel:
+        monkeypatch.setattr(import_pipeline, 'PARALLEL_MIN_BYTES', 0)
+    pipeline = ImportPipeline(dump, room=ROOM, reference=SCRAPED_AT)
+    assert pipeline.parallel() == parallel
+    result = run(pipeline)
+    assert result.status == 'done'
+    assert result.imported == stored() == 1000
+    assert SessionImporter().get_watermark(ROOM).start_time == SESSIONS[0].start_time
+    assert pipeline.bytes_read == pipeline.total_bytes
+
+def test_cancel_rolls_back_the_open_group(dump, monkeypatch):
+    pipeline = ImportPipeline(dump, room=ROOM, reference=SCRAPED_AT)
+    # Batches 4 and 5 are written but not committed when the run is cancelled
+    stop_in_batch(monkeypatch, 5, pipeline.cancel)
+    result = run(pipeline)
+    assert result.status == 'cancelled'
+    assert result.imported == stored() == 300
+    assert SessionImporter().get_watermark(ROOM) is None
+
+def test_error_rolls_back_the_open_group(dump, monkeypatch):
+    pipeline = ImportPipeline(dump, room=ROOM, reference=SCRAPED_AT)
+
+    def fail():
+        raise RuntimeError("disk full")
+
+    stop_in_batch(monkeypatch, 5, fail)
+    result = run(pipeline)
+    assert result.status == 'error'
+    assert result.imported == stored() == 300
+    assert SessionImporter().get_watermark(ROOM) is None
+
+    # A rerun adds the rest
+    result = run(ImportPipeline(dump, room=ROOM, reference=SCRAPED_AT))
+    assert result.status == 'done'
+    assert stored() == 1000
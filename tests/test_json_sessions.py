@@ -0,0 +1,45 @@
+import io
+import os
+from datetime import datetime
+from src.config import Config
+from src.scraping.json_sessions import format_amount, parse_stakes
+from src.scraping.session_parser import SessionRecord, iter_sessions
+from src.scraping.site_adapters import get_adapter
+
+SCRAPED_AT = datetime(2025, 1, 3, 10, 0)
+
+# The fixture's rows, except the one without a start time
+EXPECTED = [
+    SessionRecord(datetime(2025, 1, 2, 0, 5), '45m 3s', "Hold'em", '0.5 SC / 1 SC', 61, 12.34),
+    SessionRecord(datetime(2024, 12, 31, 23, 59), '2h 0m 0s', 'Omaha', '1 SC / 2 SC', 150, -80.125),
+    SessionRecord(datetime(2024, 12, 30, 12, 30), '1h 5m 9s', "Hold'em", '0.1 SC / 0.2 SC', 7, 0.004),
+    SessionRecord(datetime(2024, 12, 29, 20, 0), '12m 0s', 'Short Deck', '1000 SC / 2000 SC', 3, 0.00001),
+    SessionRecord(datetime(2024, 2, 29, 9, 15), '10m 0s', "Hold'em", '0.25 SC / 0.5 SC', 12, -1.5),
+]
+
+def recorded_payload(fixtures_dir):
+    with open(os.path.join(fixtures_dir, 'clubs_history_api.json'), 'r', encoding='utf-8') as f:
+        return f.read()
+
+def test_recorded_payload_decodes(fixtures_dir):
+    assert get_adapter().decode_api(recorded_payload(fixtures_dir)) == EXPECTED
+
+def test_cells_round_trip_through_the_text_parser(fixtures_dir):
+    adapter = get_adapter()
+    sessions = adapter.decode_api(recorded_payload(fixtures_dir))
+    rows = [adapter.session_cells(session) for session in sessions]
+    assert rows[3] == ['Dec 29, 8:00 PM', '12m 0s', 'Short Deck', '1000 SC / 2000 SC', '3', '+0.00001 SC']
+    text = adapter.rows_to_text(rows)
+    assert list(iter_sessions(io.StringIO(text), reference=SCRAPED_AT, adapter=adapter)) == sessions
+    assert list(adapter.decode_cells(rows, adapter.decoder(SCRAPED_AT))) == sessions
+
+def test_amounts_keep_every_digit():
+    assert [format_amount(value) for value in (12.34, -80.125, 1.0, 1e-05, 123456789.125, -0.0)] == \
+        ['12.34', '-80.125', '1', '0.00001', '123456789.125', '-0']
+    assert parse_stakes('$0.50 / $1') == '0.5 SC / 1 SC'
+
+def test_history_api_pattern_setting(app_dir):
+    adapter = get_adapter()
+    assert adapter.api_pattern() is adapter.api_url_re
+    Config.set_setting('history_api_patterns', {adapter.name: r'/v2/player/sessions\b'})
+    assert adapter.api_pattern().search('https://play.clubspoker.com/v2/player/sessions?page=2')
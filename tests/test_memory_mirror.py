@@ -0,0 +1,89 @@
+import sqlite3
+import threading
+from datetime import datetime
+from src.config import Config
+from src.database.database import Database
+from src.database.memory_mirror import MemoryMirror
+from src.database.models import Session
+from src.database.session_importer import SessionImporter
+from synthetic import synthetic_sessions
+
+def rows(conn):
+    return list(conn.execute("SELECT id, start_time, duration, hands_played, result FROM sessions ORDER BY id"))
+
+def mirrored_db():
+    Config.set_setting('memory_mirror', True)
+    return Database()
+
+def test_commit_is_replayed_without_copying(app_dir, monkeypatch):
+    db = mirrored_db()
+    copies = []
+    original = MemoryMirror.refresh
+    monkeypatch.setattr(MemoryMirror, 'refresh', lambda self: copies.append(1) or original(self))
+
+    success, _ = SessionImporter().import_sessions(synthetic_sessions(500), room="Clubs Poker")
+
+    assert success
+    assert copies == []
+    disk = sqlite3.connect(db.db_path)
+    assert rows(Database.mirror.conn) == rows(disk)
+    assert list(Database.mirror.conn.execute("SELECT * FROM import_watermarks")) == \
+        list(disk.execute("SELECT * FROM import_watermarks"))
+
+def test_savepoint_rollback_is_replayed(app_dir):
+    db = mirrored_db()
+    importer = SessionImporter()
+    first, second = synthetic_sessions(20)[:10], synthetic_sessions(20)[10:]
+    session = db.get_session()
+    try:
+        nested = session.begin_nested()
+        importer.write_batch(session, first)
+        nested.commit()
+        nested = session.begin_nested()
+        importer.write_batch(session, second)
+        nested.rollback()
+        session.commit()
+    finally:
+        session.close()
+
+    disk = sqlite3.connect(db.db_path)
+    assert len(rows(disk)) == 10
+    assert rows(Database.mirror.conn) == rows(disk)
+
+def test_reads_and_writes_from_several_threads(app_dir):
+    db = mirrored_db()
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            session = db.get_session()
+            try:
+                session.query(Session).filter(Session.stakes == '0.5 SC / 1 SC').count()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                session.close()
+
+    readers = [threading.Thread(target=read) for _ in range(3)]
+    for reader in readers:
+        reader.start()
+    try:
+        for seed in range(5):
+            SessionImporter().import_sessions(synthetic_sessions(200, seed=seed, newest=datetime(2025 + seed, 1, 1)))
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert rows(Database.mirror.conn) == rows(sqlite3.connect(db.db_path))
+
+def test_external_change_is_copied(app_dir):
+    db = mirrored_db()
+    disk = sqlite3.connect(db.db_path)
+    disk.execute("INSERT INTO sessions (duration, hands_played, result) VALUES ('1h 0m 0s', 5, 1.5)")
+    disk.commit()
+
+    assert Database.refresh_mirror_if_stale()
+    assert rows(Database.mirror.conn) == rows(disk)
@@ -0,0 +1,39 @@
+from datetime import datetime
+import pytest
+from src.scraping import parallel_parser
+from src.scraping.parallel_parser import parse_large_file
+from src.scraping.site_adapters import detect_file
+from src.scraping.session_parser import iter_sessions
+from synthetic import synthetic_sessions, dump_text
+
+SCRAPED_AT = datetime(2025, 1, 3, 10, 0)
+
+@pytest.fixture
+def parallel(monkeypatch):
+    """Take the parallel path even for small dumps"""
+    monkeypatch.setattr(parallel_parser, 'PARALLEL_MIN_BYTES', 0)
+
+@pytest.mark.parametrize('newline', ['\n', '\r\n'])
+def test_parallel_parse_matches_sessions(parallel, tmp_path, newline):
+    sessions = synthetic_sessions(2000, newest=SCRAPED_AT)
+    path = tmp_path / 'dump.txt'
+    path.write_bytes(dump_text(sessions).replace('\n', newline).encode('utf-8'))
+    assert detect_file(str(path)).name == "Clubs Poker"
+    assert parse_large_file(str(path), reference=SCRAPED_AT, max_workers=2) == sessions
+
+def test_small_dump_is_parsed_in_process(tmp_path):
+    sessions = synthetic_sessions(50, newest=SCRAPED_AT)
+    path = tmp_path / 'dump.txt'
+    path.write_bytes(dump_text(sessions).replace('\n', '\r\n').encode('utf-8'))
+    assert parse_large_file(str(path), reference=SCRAPED_AT, max_workers=2) == sessions
+
+def test_parallel_parse_of_an_oldest_first_dump(parallel, tmp_path):
+    sessions = synthetic_sessions(2000, newest=SCRAPED_AT)[::-1]
+    # Start at two rows on one day, which makes the list read oldest first
+    first = next(i for i in range(len(sessions)) if sessions[i].start_time.date() == sessions[i + 1].start_time.date())
+    path = tmp_path / 'dump.txt'
+    path.write_text(dump_text(sessions[first:]), encoding='utf-8')
+    with open(path, 'r', encoding='utf-8') as f:
+        expected = list(iter_sessions(f, reference=SCRAPED_AT))
+    assert parse_large_file(str(path), reference=SCRAPED_AT, max_workers=2) == expected
+    assert expected[0].start_time < expected[1].start_time
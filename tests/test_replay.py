@@ -0,0 +1,44 @@
+import io
+import os
+import urllib.request
+import pytest
+from src.scraping.http_fetcher import HistoryFetcher
+from src.scraping.session_parser import iter_sessions
+from src.scraping.replay import ReplayServer, ReplayAdapter, generate, expected_sessions
+from test_row_cells import TableRows, DATE
+from test_session_parser import SCRAPED_AT, EXPECTED
+
+@pytest.fixture
+def recorded(fixtures_dir):
+    server = ReplayServer(os.path.join(fixtures_dir, 'clubs_replay')).start()
+    yield server
+    server.stop()
+
+def test_recorded_responses_replay_through_the_fetcher(recorded):
+    adapter = ReplayAdapter()
+    fetcher = HistoryFetcher(adapter, recorded.login(), concurrency=2, rate=0)
+    assert fetcher.fetch_all() == EXPECTED
+    # Pages 1 and 2 are recorded, page 3 is the empty end of history
+    assert recorded.requests == 3
+    # The archived text of the fetched rows parses back to the same records
+    text = fetcher.text()
+    assert list(iter_sessions(io.StringIO(text), reference=SCRAPED_AT, adapter=adapter)) == EXPECTED
+
+def test_recorded_page_is_served(recorded):
+    with urllib.request.urlopen(recorded.page_url) as response:
+        parser = TableRows()
+        parser.feed(response.read().decode('utf-8'))
+    rows = [row[:6] for row in parser.rows if len(row) >= 6 and DATE.match(row[0])]
+    adapter = ReplayAdapter()
+    assert list(adapter.decode_cells(rows, adapter.decoder(SCRAPED_AT))) == EXPECTED
+
+def test_generated_page_cells_match_the_games(tmp_path):
+    generate(str(tmp_path), sessions=300, per_page=40)
+    server = ReplayServer(str(tmp_path))
+    try:
+        expected = expected_sessions(server)
+        adapter = ReplayAdapter()
+        text = adapter.rows_to_text([game['_cells'] for game in server.games])
+        assert list(iter_sessions(io.StringIO(text), reference=expected[0].start_time, adapter=adapter)) == expected
+    finally:
+        server.httpd.server_close()
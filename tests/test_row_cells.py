@@ -0,0 +1,55 @@
+import io
+import os
+import re
+from html.parser import HTMLParser
+from src.scraping.site_adapters import get_adapter
+from src.scraping.session_parser import iter_sessions
+from test_session_parser import SCRAPED_AT, EXPECTED
+
+DATE = re.compile(r'^(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) \d{1,2}, \d{1,2}:\d{2} [AP]M$')
+
+class TableRows(HTMLParser):
+    """Trimmed cell text of each table row, like the adapter's rows_script reads it"""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'tr':
+            self.rows.append([])
+        elif tag in ('td', 'th'):
+            self.cell = []
+
+    def handle_endtag(self, tag):
+        if tag in ('td', 'th') and self.cell is not None:
+            self.rows[-1].append(''.join(self.cell).strip())
+            self.cell = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+def session_rows(path):
+    parser = TableRows()
+    with open(path, 'r', encoding='utf-8') as f:
+        parser.feed(f.read())
+    return [row[:6] for row in parser.rows if len(row) >= 6 and DATE.match(row[0])]
+
+def test_cells_decode_without_the_text_round_trip(fixtures_dir):
+    adapter = get_adapter()
+    rows = session_rows(os.path.join(fixtures_dir, 'clubs_history_table.html'))
+    assert list(adapter.decode_cells(rows, adapter.decoder(SCRAPED_AT))) == EXPECTED
+    # The archived text of the same rows parses back to the same records
+    text = adapter.rows_to_text(rows)
+    assert list(iter_sessions(io.StringIO(text), reference=SCRAPED_AT, adapter=adapter)) == EXPECTED
+
+def test_rows_that_are_not_sessions_are_skipped():
+    adapter = get_adapter()
+    rows = [
+        ['Jan 2, 12:05 AM', '45m 3s', "Hold'em", '0.5 SC / 1 SC', '61', '+12.34 SC'],
+        ['Jan 2, 12:00 AM', '45m 3s', "Hold'em", '0.5 SC / 1 SC', 'n/a', '+1 SC'],
+        ['Total'],
+    ]
+    assert list(adapter.decode_cells(rows, adapter.decoder(SCRAPED_AT))) == EXPECTED[:1]
@@ -0,0 +1,67 @@
+from src.database.database import Database
+from src.database.models import Session
+from src.database.session_importer import SessionImporter
+from src.scraping.dump_archive import DumpArchive
+from src.scraping.session_parser import stop_at_watermark
+from synthetic import synthetic_sessions
+
+ROOM = "Clubs Poker"
+
+def delete(sessions):
+    db = Database()
+    session = db.get_session()
+    try:
+        starts = [s.start_time for s in sessions]
+        ids = [row.id for row in session.query(Session.id).filter(Session.start_time.in_(starts))]
+    finally:
+        session.close()
+    success, message = SessionImporter().delete_sessions(ids)
+    assert success, message
+
+def test_deleted_sessions_are_imported_again(app_dir):
+    sessions = synthetic_sessions(30)
+    importer = SessionImporter()
+    importer.import_sessions(sessions, room=ROOM)
+    assert importer.get_watermark(ROOM).start_time == sessions[0].start_time
+
+    delete(sessions[3:6])
+
+    watermark = importer.get_watermark(ROOM)
+    assert watermark.start_time == sessions[6].start_time
+    assert watermark.fingerprint == sessions[6].fingerprint()
+    rescraped = list(stop_at_watermark(sessions, watermark))
+    assert rescraped == sessions[:6]
+    importer.import_sessions(rescraped, room=ROOM)
+    assert importer.last_imported == 3
+    assert importer.get_watermark(ROOM).start_time == sessions[0].start_time
+
+def test_deleting_the_oldest_sessions_drops_the_watermark(app_dir):
+    sessions = synthetic_sessions(10)
+    importer = SessionImporter()
+    importer.import_sessions(sessions, room=ROOM)
+    delete(sessions[-2:])
+    assert importer.get_watermark(ROOM) is None
+
+def test_other_rooms_keep_their_watermark(app_dir):
+    sessions = synthetic_sessions(20)
+    importer = SessionImporter()
+    importer.import_sessions(sessions[:10], room=ROOM)
+    importer.import_sessions(sessions[10:], room="Other")
+    delete(sessions[2:3])
+    assert importer.get_watermark("Other").start_time == sessions[10].start_time
+    assert importer.get_watermark(ROOM).start_time == sessions[3].start_time
+
+def test_dumps_holding_deleted_sessions_are_no_longer_ingested(app_dir):
+    sessions = synthetic_sessions(30)
+    older, newer = sessions[15:], sessions[:15]
+    archive = DumpArchive()
+    for name, dump in (('older', older), ('newer', newer)):
+        SessionImporter().import_sessions(dump, room=ROOM)
+        archive.mark_ingested(name, len(dump), archive.span(dump))
+    archive.mark_ingested('unknown span', 5)
+
+    delete(sessions[20:21])
+
+    assert archive.is_ingested('newer')
+    assert not archive.is_ingested('older')
+    assert not archive.is_ingested('unknown span')
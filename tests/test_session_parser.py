@@ -0,0 +1,44 @@
+import io
+import os
+from datetime import datetime
+import pytest
+from src.scraping.session_parser import SessionRecord, iter_sessions, stop_at_watermark
+from synthetic import synthetic_sessions, dump_text
+
+SCRAPED_AT = datetime(2025, 1, 3, 10, 0)
+
+EXPECTED = [
+    SessionRecord(datetime(2025, 1, 2, 0, 5), '45m 3s', "Hold'em", '0.5 SC / 1 SC', 61, 12.34),
+    SessionRecord(datetime(2024, 12, 31, 23, 59), '2h 0m 0s', 'Omaha', '1 SC / 2 SC', 150, -80.125),
+    SessionRecord(datetime(2024, 12, 30, 12, 30), '1h 5m 9s', "Hold'em", '0.1 SC / 0.2 SC', 7, 0.004),
+    SessionRecord(datetime(2024, 2, 29, 9, 15), '10m 0s', "Hold'em", '0.25 SC / 0.5 SC', 12, -1.5),
+]
+
+def test_recorded_page_dump(fixtures_dir):
+    with open(os.path.join(fixtures_dir, 'clubs_history.txt'), 'r', encoding='utf-8') as f:
+        assert list(iter_sessions(f, reference=SCRAPED_AT)) == EXPECTED
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 97, 64 * 1024])
+def test_records_cut_by_chunk_boundaries(chunk_size):
+    sessions = synthetic_sessions(300, newest=SCRAPED_AT)
+    parsed = list(iter_sessions(io.StringIO(dump_text(sessions)), chunk_size=chunk_size, reference=SCRAPED_AT))
+    assert parsed == sessions
+
+def test_binary_stream_is_left_open():
+    sessions = synthetic_sessions(50, newest=SCRAPED_AT)
+    stream = io.BytesIO(dump_text(sessions).encode('utf-8'))
+    assert list(iter_sessions(stream, chunk_size=100, reference=SCRAPED_AT)) == sessions
+    assert not stream.closed
+
+def test_iteration_is_lazy():
+    sessions = synthetic_sessions(1000, newest=SCRAPED_AT)
+    stream = io.StringIO(dump_text(sessions))
+    first = next(iter_sessions(stream, chunk_size=1024, reference=SCRAPED_AT))
+    assert first == sessions[0]
+    assert stream.tell() <= 1024
+
+def test_stop_at_watermark():
+    sessions = synthetic_sessions(20, newest=SCRAPED_AT)
+    watermark = type('Watermark', (), {'start_time': sessions[5].start_time,
+                                       'fingerprint': sessions[5].fingerprint()})
+    assert list(stop_at_watermark(iter(sessions), watermark)) == sessions[:5]
@@ -0,0 +1,97 @@
+from datetime import datetime
+import pytest
+from src.utils.time_utils import StartTimeDecoder
+
+REFERENCE = datetime(2025, 1, 3, 10, 0)
+
+def decode_all(texts, reference=REFERENCE):
+    decoder = StartTimeDecoder(reference)
+    return [decoder.decode(text) for text in texts]
+
+def test_newest_first_across_new_year():
+    texts = ['Jan 2, 12:05 AM', 'Jan 1, 3:00 PM', 'Dec 31, 11:59 PM', 'Dec 30, 12:30 PM', 'Jan 5, 9:00 AM']
+    assert decode_all(texts) == [
+        datetime(2025, 1, 2, 0, 5), datetime(2025, 1, 1, 15, 0), datetime(2024, 12, 31, 23, 59),
+        datetime(2024, 12, 30, 12, 30), datetime(2024, 1, 5, 9, 0),
+    ]
+
+def test_newest_first_starting_with_a_wrap():
+    assert decode_all(['Jan 2, 1:00 PM', 'Dec 30, 1:00 PM', 'Nov 1, 1:00 PM']) == [
+        datetime(2025, 1, 2, 13, 0), datetime(2024, 12, 30, 13, 0), datetime(2024, 11, 1, 13, 0),
+    ]
+
+def test_long_breaks_in_a_newest_first_list():
+    # A step back of 6 to 12 months reads as a short step forward
+    assert decode_all(['Jan 2, 1:00 PM', 'Jun 1, 1:00 PM', 'May 1, 1:00 PM', 'Dec 1, 1:00 PM']) == [
+        datetime(2025, 1, 2, 13, 0), datetime(2024, 6, 1, 13, 0), datetime(2024, 5, 1, 13, 0),
+        datetime(2023, 12, 1, 13, 0),
+    ]
+    reference = datetime(2025, 3, 10)
+    assert decode_all(['Mar 1, 1:00 PM', 'Jun 1, 1:00 PM', 'May 1, 1:00 PM'], reference) == [
+        datetime(2025, 3, 1, 13, 0), datetime(2024, 6, 1, 13, 0), datetime(2024, 5, 1, 13, 0),
+    ]
+
+def test_later_times_on_one_day_mean_oldest_first():
+    texts = ['Jan 2, 9:00 PM', 'Jan 2, 10:00 PM', 'Jan 3, 1:00 AM']
+    assert decode_all(texts) == [
+        datetime(2025, 1, 2, 21, 0), datetime(2025, 1, 2, 22, 0), datetime(2025, 1, 3, 1, 0),
+    ]
+
+def test_oldest_first_across_new_year():
+    texts = ['Dec 31, 1:00 PM', 'Dec 31, 11:59 PM', 'Jan 1, 3:00 PM', 'Jan 2, 12:05 AM']
+    assert decode_all(texts) == [
+        datetime(2024, 12, 31, 13, 0), datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 15, 0),
+        datetime(2025, 1, 2, 0, 5),
+    ]
+
+def test_oldest_first_starting_with_a_wrap():
+    reference = datetime(2025, 3, 1)
+    assert decode_all(['Dec 30, 1:00 PM', 'Dec 30, 2:00 PM', 'Jan 2, 1:00 PM', 'Feb 1, 1:00 PM'], reference) == [
+        datetime(2024, 12, 30, 13, 0), datetime(2024, 12, 30, 14, 0), datetime(2025, 1, 2, 13, 0),
+        datetime(2025, 2, 1, 13, 0),
+    ]
+
+def test_oldest_first_never_passes_the_reference():
+    reference = datetime(2025, 3, 10)
+    assert decode_all(['Mar 1, 9:00 AM', 'Mar 1, 10:00 AM', 'Jun 1, 1:00 PM'], reference) == [
+        datetime(2025, 3, 1, 9, 0), datetime(2025, 3, 1, 10, 0), datetime(2024, 6, 1, 13, 0),
+    ]
+
+def test_feb_29_newest_first():
+    reference = datetime(2025, 3, 2)
+    assert decode_all(['Mar 1, 1:00 PM', 'Feb 29, 9:15 AM', 'Feb 28, 9:00 AM'], reference) == [
+        datetime(2025, 3, 1, 13, 0), datetime(2024, 2, 29, 9, 15), datetime(2024, 2, 28, 9, 0),
+    ]
+
+def test_feb_29_oldest_first():
+    reference = datetime(2025, 3, 2)
+    assert decode_all(['Feb 28, 9:00 AM', 'Feb 28, 10:00 AM', 'Feb 29, 9:15 AM', 'Mar 1, 1:00 PM'], reference) == [
+        datetime(2025, 2, 28, 9, 0), datetime(2025, 2, 28, 10, 0), datetime(2024, 2, 29, 9, 15),
+        datetime(2025, 3, 1, 13, 0),
+    ]
+
+def test_feb_29_in_a_leap_reference_year():
+    reference = datetime(2024, 3, 1)
+    assert decode_all(['Feb 29, 9:15 AM'], reference) == [datetime(2024, 2, 29, 9, 15)]
+
+def test_seeded_walk_continues_mid_list():
+    full = StartTimeDecoder(REFERENCE)
+    texts = ['Jan 2, 1:00 PM', 'Dec 30, 1:00 PM', 'Feb 3, 1:00 PM', 'Jan 9, 1:00 PM']
+    expected = [full.decode(text) for text in texts]
+    head = StartTimeDecoder(REFERENCE)
+    for text in texts[:2]:
+        head.decode(text)
+    tail = StartTimeDecoder(REFERENCE)
+    tail.year, tail.last_month_day, tail.last_time, tail.order = (
+        head.year, head.last_month_day, head.last_time, head.order
+    )
+    assert [tail.decode(text) for text in texts[2:]] == expected[2:]
+    assert expected[2:] == [datetime(2024, 2, 3, 13, 0), datetime(2024, 1, 9, 13, 0)]
+
+@pytest.mark.parametrize('text, expected', [
+    ('Jan 2, 12:05 AM', datetime(2025, 1, 2, 0, 5)),
+    ('Jan 2, 12:05 PM', datetime(2025, 1, 2, 12, 5)),
+    ('Jan 2, 1:05 PM', datetime(2025, 1, 2, 13, 5)),
+])
+def test_twelve_hour_clock(text, expected):
+    assert decode_all([text]) == [expected]